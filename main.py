@@ -8,6 +8,12 @@ TextPolish - Gemini文本格式修复工具
 
 import sys
 import os
+
+# 启动性能分析需要在导入应用模块之前开始记录
+if "--profile-startup" in sys.argv:
+    from src.textpolish.utils.startup_profiler import startup_profiler
+    startup_profiler.start()
+
 from src.textpolish.app import main
 
 # 添加src目录到Python路径
@@ -15,5 +21,15 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 src_dir = os.path.join(current_dir, 'src')
 
 if __name__ == "__main__":
+    # 打包后的程序中，转换服务的工作进程也从本入口启动
+    import multiprocessing
+    multiprocessing.freeze_support()
+    
+    # 命令行模式（convert、serve）不创建界面
+    from src.textpolish.cli import CLI_COMMANDS
+    if len(sys.argv) > 1 and sys.argv[1] in CLI_COMMANDS:
+        from src.textpolish.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+    
     sys.exit(main())
 
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+性能基准测试脚本
+用于测量处理流水线各阶段耗时，验证快速格式化的延迟目标
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+# 允许直接从项目根目录运行
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# 典型的Gemini回答片段，按需重复到指定长度
+SAMPLE_BLOCK = """第一章 项目背景
+第一节 发展现状
+一、基本情况
+（一）政策支持。国家出台了相关政策, 支持产业发展.
+一是产业规模不断扩大。截至2024年底, 产业规模达到1,234.5亿元, 同比增长12.5%。
+技术创新能力：企业加大研发投入, 研发强度达到3.2%。
+· 普通正文段落, 包含"引号"和(括号), 以及更多的描述性文字用于填充篇幅。
+• 另一段普通正文, 说明具体的工作安排和后续计划, 共计2025项任务。
+"""
+
+# 快速格式化的延迟目标（毫秒，针对5k字符的典型回答）
+QUICK_POLISH_TARGET_MS = 50
+
+
+def build_sample(size: int) -> str:
+    """生成指定字符数的样例文本"""
+    repeat = size // len(SAMPLE_BLOCK) + 1
+    return (SAMPLE_BLOCK * repeat)[:size]
+
+
+def measure(func, rounds: int) -> float:
+    """多次运行并返回耗时中位数（毫秒）"""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def benchmark_pipeline(sizes, rounds: int, with_clipboard: bool, with_docx: bool = False) -> bool:
+    """测量各阶段耗时，返回5k字符的快速格式化是否达标"""
+    from src.textpolish.core.pipeline import PolishPipeline
+    from src.textpolish.core.docx_writer import DocxWriter
+
+    if with_clipboard:
+        from PyQt6.QtWidgets import QApplication
+        from src.textpolish.utils.clipboard import ClipboardManager
+        app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    pipeline = PolishPipeline()
+    pipeline.warm_up()
+    processor = pipeline.text_processor
+    generator = pipeline.html_generator
+
+    docx_path = Path(tempfile.mkdtemp()) / "benchmark.docx"
+    docx_writer = DocxWriter()
+
+    passed = True
+    print(f"{'字符数':>10} {'清理':>10} {'转换':>10} {'WPS':>10} {'剪贴板':>10} {'合计':>10} {'DOCX':>10}")
+    for size in sizes:
+        text = build_sample(size)
+        cleaned = processor.clean_text(text)
+        body = generator.convert_to_html(cleaned)
+        wps = generator.generate_wps_html(body)
+
+        clean_ms = measure(lambda: processor.clean_text(text), rounds)
+        convert_ms = measure(lambda: generator.convert_to_html(cleaned), rounds)
+        wps_ms = measure(lambda: generator.generate_wps_html(body), rounds)
+        clipboard_ms = 0.0
+        if with_clipboard:
+            clipboard_ms = measure(lambda: ClipboardManager.copy_rich_text(wps, cleaned), rounds)
+        total_ms = clean_ms + convert_ms + wps_ms + clipboard_ms
+        docx_ms = 0.0
+        if with_docx:
+            # DOCX导出单独统计（识别段落级别 + 写入文件），不计入快速格式化合计
+            docx_ms = measure(lambda: docx_writer.write(generator.parse_blocks(cleaned), docx_path), rounds)
+
+        print(f"{size:>10,} {clean_ms:>9.2f}ms {convert_ms:>9.2f}ms {wps_ms:>9.2f}ms "
+              f"{clipboard_ms:>9.2f}ms {total_ms:>9.2f}ms {docx_ms:>9.2f}ms")
+
+        if size == 5000 and total_ms > QUICK_POLISH_TARGET_MS:
+            passed = False
+
+    return passed
+
+
+def benchmark_html_ingest(sizes, rounds: int) -> None:
+    """测量富文本（HTML）导入耗时，验证耗时随HTML大小线性增长"""
+    from src.textpolish.core.html_ingest import ingest_html
+    from src.textpolish.core.pipeline import PolishPipeline
+
+    pipeline = PolishPipeline()
+    pipeline.warm_up()
+
+    print(f"{'HTML字符数':>12} {'导入':>10} {'完整处理':>10} {'每MB导入':>10}")
+    for size in sizes:
+        # 用程序自身生成的WPS HTML作为富文本输入
+        html = pipeline.polish(build_sample(size)).wps_html
+        ingest_ms = measure(lambda: ingest_html(html), rounds)
+        polish_ms = measure(lambda: pipeline.polish_html(html), rounds)
+        per_mb_ms = ingest_ms / (len(html) / 1024 / 1024)
+        print(f"{len(html):>12,} {ingest_ms:>8.2f}ms {polish_ms:>8.2f}ms {per_mb_ms:>8.2f}ms")
+
+
+def benchmark_clipboard_threshold(rounds: int) -> None:
+    """
+    测量写入剪贴板耗时随HTML大小的变化，给出临时文件回退阈值的建议值
+
+    从256K字符开始逐步加倍，找到耗时超过 CLIPBOARD_STALL_MS 的大小。每次写入后立即读回HTML，
+    模拟粘贴时系统剪贴板的格式转换（Windows下为CF_HTML），应在目标系统上运行。
+    """
+    from PyQt6.QtWidgets import QApplication
+    from src.textpolish.config import CLIPBOARD_FILE_FALLBACK_CHARS, CLIPBOARD_STALL_MS
+    from src.textpolish.core.pipeline import PolishPipeline
+    from src.textpolish.utils.clipboard import ClipboardManager
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    pipeline = PolishPipeline()
+    clipboard = app.clipboard()
+    # 按HTML与原文的长度比例估算需要的原文长度
+    ratio = len(pipeline.polish(build_sample(10000)).wps_html) / 10000
+
+    def copy_and_read(result):
+        ClipboardManager.copy_rich_text(result.wps_html, result.cleaned_text, allow_file_fallback=False)
+        clipboard.mimeData().html()
+
+    print(f"{'HTML字符数':>12} {'写入并读回':>12}")
+
+    suggested = None
+    html_chars = 256 * 1024
+    while html_chars <= 32 * 1024 * 1024:
+        result = pipeline.polish(build_sample(int(html_chars / ratio)))
+
+        copy_ms = measure(lambda: copy_and_read(result), rounds)
+        app.processEvents()
+        print(f"{len(result.wps_html):>12,} {copy_ms:>10.2f}ms")
+
+        if copy_ms > CLIPBOARD_STALL_MS:
+            break
+        suggested = len(result.wps_html)
+        html_chars *= 2
+
+    print()
+    print(f"📏 当前阈值 CLIPBOARD_FILE_FALLBACK_CHARS = {CLIPBOARD_FILE_FALLBACK_CHARS:,}")
+    if suggested:
+        print(f"💡 写入耗时在 {CLIPBOARD_STALL_MS}ms 以内的最大HTML约 {suggested:,} 字符，可作为阈值")
+    else:
+        print(f"💡 最小测试大小已超过 {CLIPBOARD_STALL_MS}ms，建议降低阈值")
+
+
+def benchmark_memory(sizes) -> None:
+    """
+    用tracemalloc测量各阶段的内存峰值，以及每MB输入（UTF-8）的整体内存峰值
+
+    只统计Python分配的内存，Qt文档和剪贴板数据不在其中。每个大小只运行一次（tracemalloc下耗时没有参考意义）。
+    """
+    from src.textpolish.core.pipeline import PolishPipeline
+    from src.textpolish.utils.memory_profiler import memory_profiler
+
+    pipeline = PolishPipeline(None)
+    pipeline.warm_up()
+    memory_profiler.start()
+
+    stages = ('clean', 'classify', 'html', 'wps')
+    header = ''.join(f"{name:>10}" for name in stages)
+    print(f"{'字符数':>10} {'输入':>10}{header} {'整体峰值':>10} {'每MB输入':>10}")
+    for size in sizes:
+        memory_profiler.reset()
+        text = build_sample(size)
+        result = pipeline.polish(text)
+        wps_html = result.wps_html
+        report = memory_profiler.build_report(len(text.encode('utf-8')))
+
+        peaks = ''.join(
+            f"{report['stages'].get(name, {}).get('peak_bytes', 0) / 1024 / 1024:>8.2f}MB" for name in stages
+        )
+        print(f"{size:>10,} {report['input_bytes'] / 1024 / 1024:>8.2f}MB{peaks} "
+              f"{report['peak_bytes'] / 1024 / 1024:>8.2f}MB {report['peak_bytes_per_mb'] / 1024 / 1024:>8.2f}MB")
+        del text, result, wps_html
+
+    memory_profiler.stop()
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="TextPolish 性能基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 50000, 500000],
+                        help="测试的文本字符数")
+    parser.add_argument("--rounds", type=int, default=5, help="每项测试的重复次数")
+    parser.add_argument("--clipboard", action="store_true", help="同时测量写入剪贴板的耗时")
+    parser.add_argument("--docx", action="store_true", help="同时测量导出DOCX的耗时")
+    parser.add_argument("--html", action="store_true",
+                        help="测量富文本（HTML）导入耗时，代替默认的流水线测试")
+    parser.add_argument("--memory", action="store_true",
+                        help="测量各阶段的内存峰值和每MB输入的内存峰值，代替默认的流水线测试")
+    parser.add_argument("--clipboard-scan", action="store_true",
+                        help="测量写入剪贴板耗时随HTML大小的变化，用于确定临时文件回退阈值")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("TextPolish 性能基准测试")
+    print("=" * 50)
+
+    if args.clipboard_scan:
+        benchmark_clipboard_threshold(args.rounds)
+        return True
+    if args.html:
+        benchmark_html_ingest(args.sizes, args.rounds)
+        return True
+    if args.memory:
+        benchmark_memory(args.sizes)
+        return True
+
+    passed = benchmark_pipeline(args.sizes, args.rounds, args.clipboard, args.docx)
+
+    print()
+    if passed:
+        print(f"✅ 5k字符快速格式化耗时在 {QUICK_POLISH_TARGET_MS}ms 目标以内")
+    else:
+        print(f"❌ 5k字符快速格式化耗时超过 {QUICK_POLISH_TARGET_MS}ms 目标")
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+启动耗时检查脚本
+以 --profile-startup 模式启动程序，超过启动预算时返回非零退出码
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+# 默认启动预算（毫秒）：从开始记录到主窗口首次绘制完成
+DEFAULT_BUDGET_MS = 2000
+
+
+def parse_phase_budgets(items):
+    """解析 阶段名=毫秒 形式的阶段预算"""
+    budgets = {}
+    for item in items or []:
+        name, _, value = item.partition("=")
+        budgets[name.strip()] = float(value)
+    return budgets
+
+
+def run_profile(exe, output_path: Path, timeout: int) -> bool:
+    """启动程序并等待其在首次绘制后退出"""
+    project_root = Path(__file__).parent.parent
+    if exe:
+        cmd = [exe]
+    else:
+        cmd = [sys.executable, str(project_root / "main.py")]
+    cmd += [
+        "--profile-startup",
+        "--profile-output", str(output_path),
+        "--exit-after-startup",
+        "--new-instance",
+    ]
+
+    try:
+        subprocess.run(cmd, check=True, cwd=project_root, timeout=timeout)
+        return True
+    except subprocess.TimeoutExpired:
+        print(f"❌ 程序在 {timeout} 秒内没有完成启动")
+    except subprocess.CalledProcessError as e:
+        print(f"❌ 程序启动失败，退出代码: {e.returncode}")
+    return False
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="TextPolish 启动耗时检查")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"总启动预算（毫秒），默认 {DEFAULT_BUDGET_MS}")
+    parser.add_argument("--phase-budget", action="append", metavar="阶段=毫秒",
+                        help="单个阶段的预算，如 create_main_window=800，可重复指定")
+    parser.add_argument("--exe", help="检查打包后的exe（默认使用当前Python运行main.py）")
+    parser.add_argument("--report", help="保留报告的路径（默认写入临时目录）")
+    parser.add_argument("--timeout", type=int, default=60, help="等待启动完成的超时秒数")
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("TextPolish 启动耗时检查")
+    print("=" * 50)
+
+    if args.report:
+        report_path = Path(args.report).absolute()
+    else:
+        report_path = Path(tempfile.mkdtemp()) / "startup_profile.json"
+
+    if not run_profile(args.exe, report_path, args.timeout):
+        return False
+
+    with open(report_path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+
+    passed = True
+    total_ms = report["total_ms"]
+    if total_ms > args.budget_ms:
+        print(f"❌ 总启动耗时 {total_ms:.1f}ms 超过预算 {args.budget_ms:.0f}ms")
+        passed = False
+    else:
+        print(f"✅ 总启动耗时 {total_ms:.1f}ms（预算 {args.budget_ms:.0f}ms）")
+
+    phases = {phase["name"]: phase["duration_ms"] for phase in report["phases"]}
+    for name, budget in parse_phase_budgets(args.phase_budget).items():
+        duration = phases.get(name)
+        if duration is None:
+            print(f"⚠️  报告中没有阶段: {name}")
+        elif duration > budget:
+            print(f"❌ 阶段 {name} 耗时 {duration:.1f}ms 超过预算 {budget:.0f}ms")
+            passed = False
+        else:
+            print(f"✅ 阶段 {name} 耗时 {duration:.1f}ms（预算 {budget:.0f}ms）")
+
+    print()
+    print("🐢 导入最慢的模块:")
+    for item in report["slowest_imports"][:10]:
+        print(f"  {item['self_us'] / 1000:>8.1f}ms  {item['module']}")
+    print()
+    print(f"📄 完整报告: {report_path}")
+
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -8,11 +8,24 @@ __version__ = "2.0.0"
 __author__ = "TextPolish Team"
 __description__ = "Gemini文本格式修复工具"
 
-# 导出主要类
-from .core.text_processor import TextProcessor
-from .core.html_generator import HTMLGenerator
-from .ui.main_window import TextPolishWindow
-from .ui.main_interface import TextPolishInterface
+# 导出主要类（按需导入，避免启动时加载全部界面与配置）
+_LAZY_EXPORTS = {
+    'TextProcessor': '.core.text_processor',
+    'HTMLGenerator': '.core.html_generator',
+    'TextPolishWindow': '.ui.main_window',
+    'TextPolishInterface': '.ui.main_interface',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'TextProcessor',
@@ -3,8 +3,12 @@
 应用程序入口模块 - 负责初始化和启动应用程序
 """
 
+import argparse
+import os
 import sys
 
+from .utils.startup_profiler import startup_profiler
+
 
 class TextPolishApp:
     """TextPolish应用程序类"""
@@ -13,11 +17,125 @@ class TextPolishApp:
         """初始化应用程序"""
         self.app = None
         self.window = None
+        self.instance_guard = None
+    
+    def parse_arguments(self, argv: list) -> tuple:
+        """
+        解析命令行参数
+        
+        Args:
+            argv: 完整的命令行参数列表
+            
+        Returns:
+            (解析结果, 交给Qt处理的剩余参数列表)
+        """
+        parser = argparse.ArgumentParser(prog="TextPolish", add_help=True)
+        parser.add_argument("file", nargs="?", help="启动时载入并处理的文本文件")
+        parser.add_argument("--from-clipboard", action="store_true",
+                            help="启动时从剪贴板读取文本并处理")
+        parser.add_argument("--quick-polish", action="store_true",
+                            help="格式化剪贴板内容并写回剪贴板（转发给已运行的实例）")
+        parser.add_argument("--tray", action="store_true",
+                            help="以托盘常驻模式启动，关闭窗口时隐藏到托盘")
+        parser.add_argument("--new-instance", action="store_true",
+                            help="不转发给已运行的窗口，强制启动新实例")
+        parser.add_argument("--profile-startup", action="store_true",
+                            help="记录模块导入和启动各阶段耗时并写入报告")
+        parser.add_argument("--profile-output", default="textpolish_startup_profile.json",
+                            help="启动分析报告的输出路径")
+        parser.add_argument("--profile-memory", action="store_true",
+                            help="启动时开启内存分析，记录各处理阶段的内存峰值（在设置页面导出报告）")
+        parser.add_argument("--exit-after-startup", action="store_true",
+                            help="首次绘制完成后立即退出（配合--profile-startup用于脚本检查）")
+        
+        args, qt_args = parser.parse_known_args(argv[1:])
+        return args, argv[:1] + qt_args
+    
+    def build_instance_request(self, args) -> dict:
+        """
+        根据命令行参数构建转发给运行实例的请求
+        
+        Args:
+            args: 命令行参数解析结果
+            
+        Returns:
+            请求字典
+        """
+        return {
+            'file': os.path.abspath(args.file) if args.file else None,
+            'from_clipboard': args.from_clipboard,
+            'quick_polish': args.quick_polish,
+        }
     
-    def create_application(self):
+    def forward_to_running_instance(self, request: dict) -> bool:
+        """
+        将请求转发给已运行的实例
+        
+        Args:
+            request: 请求字典
+            
+        Returns:
+            是否已转发（已转发时当前进程应直接退出）
+        """
+        try:
+            from .utils.single_instance import SingleInstanceGuard
+            return SingleInstanceGuard.forward_request(request)
+        except Exception as e:
+            print(f"转发到已运行实例失败: {e}")
+            return False
+    
+    def start_instance_guard(self):
+        """启动单实例监听，接收后续启动转发的请求"""
+        from .utils.single_instance import SingleInstanceGuard
+        
+        self.instance_guard = SingleInstanceGuard(self.app)
+        if self.instance_guard.listen():
+            self.instance_guard.request_received.connect(self.window.handle_instance_request)
+    
+    def watch_first_paint(self, args, visible: bool = True):
+        """
+        监听主窗口首次绘制，记录首帧耗时并按需写入报告、退出程序
+        
+        Args:
+            args: 命令行参数解析结果
+            visible: 启动时是否显示窗口；托盘模式下窗口不显示、不会绘制，事件循环开始后即结束计时
+        """
+        from PyQt6.QtCore import QObject, QEvent, QTimer
+        
+        show_start = startup_profiler.elapsed_ms()
+        
+        class FirstPaintWatcher(QObject):
+            def eventFilter(watcher, obj, e):
+                if e.type() == QEvent.Type.Paint:
+                    obj.removeEventFilter(watcher)
+                    # 在本轮绘制完成后再结束计时
+                    QTimer.singleShot(0, on_first_paint)
+                return False
+        
+        def on_first_paint(phase: str = "first_paint"):
+            startup_profiler.add_phase(
+                phase, show_start, startup_profiler.elapsed_ms() - show_start
+            )
+            if args.profile_startup:
+                startup_profiler.write_report(args.profile_output)
+            if args.exit_after_startup:
+                # 与托盘菜单的"退出"相同：托盘模式下直接 quit() 时窗口拒绝关闭，主题监听线程不会停止
+                self.window.quit_application()
+        
+        if not visible:
+            QTimer.singleShot(0, lambda: on_first_paint("tray_ready"))
+            return
+        
+        self.first_paint_watcher = FirstPaintWatcher(self.window)
+        self.window.installEventFilter(self.first_paint_watcher)
+    
+    def create_application(self, argv: list = None):
         """
         创建QApplication实例
         
+        Args:
+            argv: 交给Qt的命令行参数，默认使用sys.argv
+        
         Returns:
             QApplication实例
         """
@@ -26,7 +144,7 @@ class TextPolishApp:
         from .utils.icon import IconManager
         from .config import APP_NAME, APP_VERSION, APP_ORGANIZATION
         
-        app = QApplication(sys.argv)
+        app = QApplication(argv if argv is not None else sys.argv)
         
         # 设置应用信息
         app.setApplicationName(APP_NAME)
@@ -34,7 +152,8 @@ class TextPolishApp:
         app.setOrganizationName(APP_ORGANIZATION)
         
         # 设置应用程序图标
-        IconManager.set_app_icon(app)
+        with startup_profiler.phase("set_app_icon"):
+            IconManager.set_app_icon(app)
         
         # 设置主题
         setTheme(Theme.AUTO)
@@ -59,12 +178,37 @@ class TextPolishApp:
             应用程序退出代码
         """
         try:
+            args, qt_argv = self.parse_arguments(sys.argv)
+            request = self.build_instance_request(args)
+            
+            # 已有实例在运行时，把请求交给它处理后直接退出
+            if not args.new_instance and self.forward_to_running_instance(request):
+                return 0
+            
+            if args.profile_memory:
+                from .utils.memory_profiler import memory_profiler
+                memory_profiler.start()
+            
             # 创建应用实例
-            self.app = self.create_application()
+            with startup_profiler.phase("create_application"):
+                self.app = self.create_application(qt_argv)
+            
+            # 创建主窗口（托盘模式下启动时不显示窗口）
+            with startup_profiler.phase("create_main_window"):
+                self.window = self.create_main_window()
+            visible = not (args.tray and self.window.enable_tray_mode())
+            if args.profile_startup or args.exit_after_startup:
+                self.watch_first_paint(args, visible)
+            if visible:
+                self.window.show()
+            
+            # 监听后续启动的请求
+            if not args.new_instance:
+                self.start_instance_guard()
             
-            # 创建主窗口
-            self.window = self.create_main_window()
-            self.window.show()
+            # 处理本次启动携带的输入
+            if request['file'] or request['from_clipboard'] or request['quick_polish']:
+                self.window.handle_instance_request(request)
             
             # 启动事件循环
             return self.app.exec()
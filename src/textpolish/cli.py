@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+命令行模块 - 无界面运行TextPolish
+
+    python main.py convert 输入.txt -o 输出.html --format wps
+    python main.py serve --port 8765 --workers 4
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+from typing import List, Optional
+
+from .config import (
+    SERVER_BATCH_SIZE, SERVER_DEFAULT_HOST, SERVER_DEFAULT_PORT,
+    SERVER_MAX_BODY_BYTES, SERVER_REQUEST_TIMEOUT
+)
+
+
+# 命令行子命令（main.py据此判断是否以无界面模式运行）
+CLI_COMMANDS = ('convert', 'serve')
+
+# convert 命令支持的输出格式（在 OUTPUT_FORMATS 基础上增加DOCX）
+CONVERT_FORMATS = ('clean', 'html', 'wps', 'docx')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器"""
+    parser = argparse.ArgumentParser(prog="TextPolish", description="Gemini文本格式修复工具（命令行模式）")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = subparsers.add_parser("convert", help="处理文本文件并输出结果")
+    convert_parser.add_argument("input", nargs="?", default="-",
+                                help="输入文件（省略或为 - 时从标准输入读取）")
+    convert_parser.add_argument("-o", "--output", help="输出文件（省略时写到标准输出，docx格式必须指定）")
+    convert_parser.add_argument("-f", "--format", choices=CONVERT_FORMATS, default="wps",
+                                help="输出格式：clean 清理后文本、html HTML body、wps WPS兼容HTML、docx Word文档")
+    convert_parser.add_argument("--from-html", action="store_true",
+                                help="输入为HTML（标题和段首加粗直接决定段落级别）")
+    convert_parser.add_argument("--no-cache", action="store_true",
+                                help="不使用处理结果缓存（不读取也不写入）")
+    convert_parser.add_argument("--profile-memory", nargs="?", const="-", metavar="REPORT",
+                                help="用tracemalloc记录各处理阶段的内存峰值和分配位置，结束时输出报告"
+                                     "（省略路径时输出到标准错误，扩展名为.json时写入JSON）")
+    _add_level_arguments(convert_parser)
+    _add_metrics_argument(convert_parser)
+
+    serve_parser = subparsers.add_parser("serve", help="启动本地HTTP转换服务")
+    serve_parser.add_argument("--host", default=SERVER_DEFAULT_HOST,
+                              help="监听地址（只允许本机回环地址）")
+    serve_parser.add_argument("--port", type=int, default=SERVER_DEFAULT_PORT, help="监听端口")
+    serve_parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1),
+                              help="工作进程数（0表示在服务进程内处理）")
+    serve_parser.add_argument("--max-pending", type=int, default=None,
+                              help="同时排队和处理中的任务数上限，超过后返回503（默认为工作进程数的4倍）")
+    serve_parser.add_argument("--batch-size", type=int, default=SERVER_BATCH_SIZE,
+                              help="批量请求中每个任务包含的文本数")
+    serve_parser.add_argument("--timeout", type=float, default=SERVER_REQUEST_TIMEOUT,
+                              help="单个请求等待结果的超时时间（秒）")
+    serve_parser.add_argument("--max-body", type=int, default=SERVER_MAX_BODY_BYTES,
+                              help="请求体大小上限（字节）")
+    serve_parser.add_argument("--quiet", action="store_true", help="不输出访问日志")
+    _add_metrics_argument(serve_parser)
+
+    return parser
+
+
+def _add_level_arguments(parser: argparse.ArgumentParser) -> None:
+    """添加关闭各级别识别的参数"""
+    parser.add_argument("--no-h1", action="store_true", help="不识别一级标题")
+    parser.add_argument("--no-h2", action="store_true", help="不识别二级标题")
+    parser.add_argument("--no-h3", action="store_true", help="不识别三级标题")
+    parser.add_argument("--no-special", action="store_true", help="不识别特殊格式")
+
+
+def _add_metrics_argument(parser: argparse.ArgumentParser) -> None:
+    """添加输出运行指标的参数"""
+    parser.add_argument("--metrics", action="store_true",
+                        help="结束时向标准错误输出JSON格式的运行指标汇总")
+
+
+def print_metrics_summary() -> None:
+    """向标准错误输出运行指标汇总"""
+    from .utils.metrics import metrics
+
+    print(metrics.summary_json(), file=sys.stderr)
+
+
+def read_input(path: str) -> str:
+    """读取输入文件，路径为 - 时读取标准输入"""
+    if path == "-":
+        return sys.stdin.read()
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def write_memory_report(path: str, input_bytes: int) -> None:
+    """
+    输出内存分析报告
+
+    Args:
+        path: 报告文件路径，为 - 时输出到标准错误
+        input_bytes: 输入文本的大小（UTF-8字节数）
+    """
+    from .utils.memory_profiler import memory_profiler
+
+    if path == "-":
+        print(memory_profiler.format_report(memory_profiler.build_report(input_bytes)), file=sys.stderr)
+        return
+    try:
+        memory_profiler.write_report(path, input_bytes)
+    except OSError as e:
+        print(f"写入内存分析报告失败: {e}", file=sys.stderr)
+
+
+def load_snapshot():
+    """载入用户配置快照（配置加载日志输出到标准错误，不混入标准输出中的结果）"""
+    with contextlib.redirect_stdout(sys.stderr):
+        from .config import user_config_manager
+        return user_config_manager.snapshot()
+
+
+def run_convert(args) -> int:
+    """
+    执行 convert 命令
+
+    Args:
+        args: 命令行参数解析结果
+
+    Returns:
+        退出代码
+    """
+    # 先载入配置：导入处理模块时会创建配置管理器
+    snapshot = load_snapshot()
+    from .config import user_config_manager
+    from .core.pipeline import PolishPipeline
+    from .core.result_cache import result_cache
+    from .utils.memory_profiler import memory_profiler
+
+    # 模块导入完成后再开始记录，报告中只包含读取输入和处理的内存
+    if args.profile_memory:
+        memory_profiler.start()
+
+    try:
+        text = read_input(args.input)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"读取输入失败: {e}", file=sys.stderr)
+        return 1
+
+    # 与界面共用结果缓存和开关，--no-cache 时本次不使用
+    use_cache = not args.no_cache and user_config_manager.load_result_cache_enabled()
+    pipeline = PolishPipeline(result_cache if use_cache else None)
+    enables = (not args.no_h1, not args.no_h2, not args.no_h3, not args.no_special)
+
+    exit_code = convert_text(args, pipeline, text, enables, snapshot)
+    if args.profile_memory:
+        write_memory_report(args.profile_memory, len(text.encode('utf-8', 'surrogatepass')))
+    return exit_code
+
+
+def convert_text(args, pipeline, text: str, enables: tuple, snapshot) -> int:
+    """
+    处理输入文本并写出结果
+
+    Args:
+        args: 命令行参数解析结果
+        pipeline: 处理流水线
+        text: 输入文本
+        enables: 各级别是否启用
+        snapshot: 配置快照
+
+    Returns:
+        退出代码
+    """
+    if args.format == "docx":
+        if not args.output:
+            print("docx格式必须通过 -o 指定输出文件", file=sys.stderr)
+            return 2
+        from .core.docx_writer import DocxWriter
+
+        if args.from_html:
+            result = pipeline.polish_html(text, *enables, snapshot=snapshot)
+        else:
+            result = pipeline.polish(text, *enables, snapshot=snapshot)
+        try:
+            DocxWriter(snapshot).write(result.blocks, args.output)
+        except OSError as e:
+            print(f"写入输出失败: {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    output = pipeline.convert(text, args.format, *enables, snapshot=snapshot, is_html=args.from_html)
+    if not args.output:
+        sys.stdout.write(output)
+        return 0
+    try:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    except OSError as e:
+        print(f"写入输出失败: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def run_serve(args) -> int:
+    """
+    执行 serve 命令
+
+    Args:
+        args: 命令行参数解析结果
+
+    Returns:
+        退出代码
+    """
+    from .server import run_server
+
+    return run_server(
+        host=args.host,
+        port=args.port,
+        workers=max(args.workers, 0),
+        max_pending=args.max_pending,
+        batch_size=args.batch_size,
+        timeout=args.timeout,
+        max_body_bytes=args.max_body,
+        quiet=args.quiet,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口
+
+    Args:
+        argv: 命令行参数（不含程序名），默认使用sys.argv[1:]
+
+    Returns:
+        退出代码
+    """
+    args = build_parser().parse_args(argv)
+    if args.command == "convert":
+        exit_code = run_convert(args)
+    else:
+        exit_code = run_serve(args)
+    if args.metrics:
+        print_metrics_summary()
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
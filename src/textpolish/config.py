@@ -74,11 +74,14 @@ MESSAGES = {
     "success": {
         "process_complete": "处理完成",
         "copy_success": "复制成功",
-        "theme_switched": "主题已切换"
+        "theme_switched": "主题已切换",
+        "quick_polish_complete": "快速格式化完成",
+        "docx_export_success": "导出成功"
     },
     "warning": {
         "no_input": "请先输入要处理的文本！",
-        "no_content": "没有可复制的内容"
+        "no_content": "没有可复制的内容",
+        "empty_clipboard": "剪贴板中没有文本"
     },
     "error": {
         "process_failed": "处理失败",
@@ -86,15 +89,97 @@ MESSAGES = {
         "formatted_copy_failed": "格式化复制失败",
         "icon_load_failed": "设置窗口图标失败",
         "app_icon_failed": "设置应用程序图标失败",
-        "startup_failed": "程序启动失败"
+        "startup_failed": "程序启动失败",
+        "file_load_failed": "读取文件失败",
+        "clipboard_read_failed": "读取剪贴板失败",
+        "docx_export_failed": "导出DOCX失败",
+        "history_failed": "读取处理历史失败"
     },
     "info": {
         "cleared": "已清空",
         "processing": "正在处理...",
-        "ready": "就绪"
+        "ready": "就绪",
+        "clipboard_file_notice": "格式化结果较大，已保存为文件（剪贴板中为文件链接，可直接粘贴到WPS/Word）：{path}"
     }
 }
 
+# 快速格式化快捷键（读取剪贴板 → 处理 → 写回格式化结果）
+QUICK_POLISH_SHORTCUT = "Ctrl+Shift+V"
+
+# 剪贴板大内容回退：HTML超过该字符数时不再直接写入剪贴板，而是保存为临时文件并复制文件链接。
+# 该值取自 scripts/benchmark.py --clipboard-scan 的结果：写入并读回剪贴板耗时不超过 CLIPBOARD_STALL_MS 的最大HTML
+# 约2,061,741字符，4.1M字符时已超过（不同机器上的结果波动较大，取较保守的测量值）；更换系统后应在目标系统上重新测量
+CLIPBOARD_FILE_FALLBACK_CHARS = 2_000_000
+CLIPBOARD_STALL_MS = 100
+# 临时文件保留时间（秒），超过后在下次创建临时文件时清理
+CLIPBOARD_TEMP_MAX_AGE = 24 * 60 * 60
+
+# DOCX导出默认文件名
+DOCX_DEFAULT_FILENAME = "处理后的文档.docx"
+
+# 编辑规则后停止输入多久（毫秒）开始在后台校验正则表达式
+RULE_VALIDATION_DELAY_MS = 300
+
+# 规则测试台的默认样本文本（用户修改后保存在配置目录中）
+RULE_BENCH_DEFAULT_SAMPLE = """第一章 总体要求
+前言
+第一节 发展现状
+一、基本情况
+（一）政策支持。国家出台了一系列支持政策，为产业发展提供了保障。
+一是产业规模不断扩大。截至2024年底，产业规模达到1,234.5亿元，同比增长12.5%。
+二是创新能力持续增强。全年新增发明专利326项。
+技术创新能力：企业加大研发投入，研发强度达到3.2%。
+普通正文段落，说明具体的工作安排和后续计划，共计2025项任务。
+"""
+
+# 本地转换服务（textpolish serve）默认配置：只监听本机回环地址
+SERVER_DEFAULT_HOST = "127.0.0.1"
+SERVER_DEFAULT_PORT = 8765
+# 请求体大小上限（字节）
+SERVER_MAX_BODY_BYTES = 16 * 1024 * 1024
+# 批量请求中每个任务包含的文本数（一个任务交给一个工作进程处理）
+SERVER_BATCH_SIZE = 32
+# 单个请求等待结果的超时时间（秒）
+SERVER_REQUEST_TIMEOUT = 60
+
+# 异步接口（textpolish.core.async_api）共享执行器的默认类型和工作线程/进程数上限
+ASYNC_EXECUTOR_KIND = "thread"
+ASYNC_MAX_WORKERS = 4
+# 流式处理时每个分片的目标字符数（在可以安全拆分的行边界处切分）
+ASYNC_STREAM_CHUNK_CHARS = 64 * 1024
+
+# 逐行清理（TextProcessor.clean_lines）时每个分片的目标字符数
+CLEAN_STREAM_CHUNK_CHARS = 64 * 1024
+
+# 处理结果缓存（SQLite，位于本地缓存目录）：文件名、内容大小上限（字节）
+RESULT_CACHE_FILENAME = "results.sqlite3"
+RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# 超过上限时淘汰到上限的该比例以下，避免每次写入都触发淘汰
+RESULT_CACHE_EVICT_RATIO = 0.8
+
+# 处理历史（SQLite + FTS5全文索引，与用户配置文件位于同一目录）：文件名、保留条数、保留天数、内容大小上限（字节）
+HISTORY_FILENAME = "history.sqlite3"
+HISTORY_MAX_ENTRIES = 500
+HISTORY_MAX_AGE_DAYS = 90
+HISTORY_MAX_BYTES = 32 * 1024 * 1024
+# 历史面板一次列出的条数、标题的最大字符数
+HISTORY_LIST_LIMIT = 100
+HISTORY_TITLE_CHARS = 40
+# 主界面历史面板的初始宽度
+HISTORY_PANEL_WIDTH = 300
+# 在历史搜索框中停止输入多久（毫秒）开始搜索
+HISTORY_SEARCH_DELAY_MS = 200
+
+# 分批预览：首先显示的段落数（第一屏），之后每次事件循环追加的段落数
+PREVIEW_FIRST_SCREEN_BLOCKS = 60
+PREVIEW_BATCH_BLOCKS = 100
+
+# 单实例通信配置
+SINGLE_INSTANCE_SERVER_NAME = f"{APP_ORGANIZATION}-{APP_NAME}-instance"
+SINGLE_INSTANCE_TIMEOUT_MS = 50
+# 通道已被占用时再次确认是否有实例在运行的连接超时（毫秒），对方忙碌时50毫秒可能连接不上
+SINGLE_INSTANCE_PROBE_TIMEOUT_MS = 1000
+
 # 图标文件路径配置
 ICON_PATHS = {
     "ico": "icon.ico"
@@ -108,13 +193,27 @@ HTML_NAMESPACE = 'xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:w="urn
 # 新的用户可配置系统
 # =============================================
 
+import hashlib
 import json
 import os
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional
+import pickle
+import threading
+from dataclasses import dataclass, asdict, astuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 from PyQt6.QtCore import QSettings
 
 
+# 可配置的文本级别
+CONFIG_LEVELS = ('h1', 'h2', 'h3', 'normal', 'special_format')
+
+# 样式片段中需要包含字重的级别
+STYLE_WEIGHT_LEVELS = ('h3', 'special_format')
+
+# 配置快照缓存格式版本（快照结构变化时递增）
+CONFIG_CACHE_VERSION = 3
+
+
 @dataclass
 class StyleConfig:
     """标题样式配置"""
@@ -143,6 +242,170 @@ class TitleConfig:
     patterns: List[RegexPattern]
 
 
+def get_cache_dir() -> str:
+    """获取本地缓存目录（Windows下位于%LOCALAPPDATA%，其他系统位于~/.cache）"""
+    base_dir = (
+        os.environ.get('LOCALAPPDATA')
+        or os.environ.get('XDG_CACHE_HOME')
+        or os.path.join(os.path.expanduser('~'), '.cache')
+    )
+    return os.path.join(base_dir, APP_ORGANIZATION, 'cache')
+
+
+def render_style_fragment(style: StyleConfig, include_weight: bool = False) -> str:
+    """
+    生成span的内联样式片段
+    
+    Args:
+        style: 样式配置
+        include_weight: 是否包含字重
+        
+    Returns:
+        内联样式字符串
+    """
+    fragment = (
+        "mso-spacerun:'yes';"
+        f"mso-fareast-font-family:{style.font_family};"
+        f"mso-ascii-font-family:{style.font_family};"
+        f"mso-hansi-font-family:{style.font_family};"
+        f"mso-bidi-font-family:{style.font_family};"
+        f"font-size:{style.font_size};"
+        f"mso-font-kerning:{style.font_kerning};"
+    )
+    if include_weight:
+        fragment += f"font-weight:{style.font_weight};"
+    return fragment
+
+
+# =============================================
+# 不可变配置快照：渲染任务开始时取一份快照并全程使用，
+# 后台线程渲染期间用户编辑规则也不会出现新旧规则混用
+# =============================================
+
+@dataclass(frozen=True, slots=True)
+class StyleSnapshot:
+    """样式配置快照"""
+    font_family: str
+    font_size: str
+    font_kerning: str
+    font_weight: str
+    alignment: str
+    text_indent: str
+
+
+@dataclass(frozen=True, slots=True)
+class PatternSnapshot:
+    """正则表达式模式快照"""
+    pattern: str
+    name: str
+    enabled: bool
+
+
+@dataclass(frozen=True, slots=True)
+class LevelSnapshot:
+    """单个级别的配置快照"""
+    style: StyleSnapshot
+    patterns: Tuple[PatternSnapshot, ...]
+    enabled_patterns: Tuple[str, ...]
+    style_fragment: str
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigSnapshot:
+    """完整配置快照 - 创建后不可修改，可在线程间直接共享"""
+    version: int
+    levels: Mapping[str, LevelSnapshot]
+    
+    def __post_init__(self):
+        # 使用只读映射，防止通过levels修改快照内容
+        object.__setattr__(self, 'levels', MappingProxyType(dict(self.levels)))
+    
+    def __reduce__(self):
+        # MappingProxyType不能直接pickle，按普通字典保存
+        return (ConfigSnapshot, (self.version, dict(self.levels)))
+    
+    @classmethod
+    def build(cls, version: int, config: Dict[str, TitleConfig]) -> 'ConfigSnapshot':
+        """
+        从可变配置复制生成快照
+        
+        Args:
+            version: 快照版本号
+            config: 级别 -> 标题配置
+            
+        Returns:
+            配置快照
+        """
+        levels = {}
+        for level, title_config in config.items():
+            style = title_config.style
+            patterns = tuple(
+                PatternSnapshot(pattern=p.pattern, name=p.name, enabled=p.enabled)
+                for p in title_config.patterns
+            )
+            levels[level] = LevelSnapshot(
+                style=StyleSnapshot(
+                    font_family=style.font_family,
+                    font_size=style.font_size,
+                    font_kerning=style.font_kerning,
+                    font_weight=style.font_weight,
+                    alignment=style.alignment,
+                    text_indent=style.text_indent,
+                ),
+                patterns=patterns,
+                enabled_patterns=tuple(p.pattern for p in patterns if p.enabled),
+                style_fragment=render_style_fragment(style, level in STYLE_WEIGHT_LEVELS),
+            )
+        return cls(version=version, levels=levels)
+    
+    def to_plain(self) -> Tuple:
+        """
+        转换为只包含内置类型的元组（用于快照缓存，与模块的导入路径无关）
+        
+        Returns:
+            (版本号, 级别 -> (样式字段, 各模式字段, 启用的正则表达式, 样式片段))
+        """
+        return self.version, {level: astuple(level_snapshot) for level, level_snapshot in self.levels.items()}
+    
+    @classmethod
+    def from_plain(cls, plain: Tuple) -> 'ConfigSnapshot':
+        """
+        由 to_plain() 的结果重建快照
+        
+        Args:
+            plain: to_plain() 的结果
+            
+        Returns:
+            配置快照
+        """
+        version, levels = plain
+        return cls(version=version, levels={
+            level: LevelSnapshot(
+                style=StyleSnapshot(*style),
+                patterns=tuple(PatternSnapshot(*pattern) for pattern in patterns),
+                enabled_patterns=tuple(enabled_patterns),
+                style_fragment=style_fragment,
+            )
+            for level, (style, patterns, enabled_patterns, style_fragment) in levels.items()
+        })
+    
+    def get_level(self, level: str) -> Optional[LevelSnapshot]:
+        """获取指定级别的快照"""
+        return self.levels.get(level)
+    
+    def get_enabled_patterns(self, level: str) -> Tuple[str, ...]:
+        """获取指定级别启用的正则表达式"""
+        level_snapshot = self.levels.get(level)
+        return level_snapshot.enabled_patterns if level_snapshot else ()
+    
+    def get_style_fragment(self, level: str) -> str:
+        """获取指定级别span的内联样式片段"""
+        level_snapshot = self.levels.get(level)
+        if level_snapshot is None:
+            return render_style_fragment(StyleConfig(), level in STYLE_WEIGHT_LEVELS)
+        return level_snapshot.style_fragment
+
+
 class UserConfigManager:
     """用户配置管理器"""
     
@@ -150,14 +413,126 @@ class UserConfigManager:
         # 设置QSettings的组织名称和应用名称，确保配置文件有合适的路径
         self.settings = QSettings(APP_ORGANIZATION, APP_NAME)
         self._config: Dict[str, TitleConfig] = {}
+        # 当前发布的不可变快照（配置变化时整体替换，不在原对象上修改）
+        self._snapshot = ConfigSnapshot(version=0, levels={})
+        self._publish_lock = threading.Lock()
+        
+        # 热启动：配置文件和用户配置都没有变化时，直接读取上次保存的快照
+        if self._load_snapshot_cache():
+            return
+        
         self._load_default_config()
         self.load_config()
+        self._publish()
+    
+    @staticmethod
+    def get_app_config_path() -> str:
+        """获取应用配置文件路径"""
+        app_config_path = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'app_config.json')
+        return os.path.abspath(app_config_path)
+    
+    def get_snapshot_cache_path(self) -> str:
+        """获取配置快照缓存文件路径"""
+        return os.path.join(get_cache_dir(), 'config_snapshot.pickle')
+    
+    def _build_cache_key(self) -> Tuple:
+        """
+        生成快照缓存键：应用版本 + 快照格式版本 + 应用配置文件状态 + 用户配置内容摘要
+        
+        用户配置可能保存在注册表中，无法通过文件修改时间判断，因此对原始字符串取摘要。
+        """
+        try:
+            stat = os.stat(self.get_app_config_path())
+            app_config_state = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            app_config_state = None
+        
+        user_config = self.settings.value("user_config", "") or ""
+        user_config_digest = hashlib.sha1(user_config.encode('utf-8')).hexdigest()
+        return (APP_VERSION, CONFIG_CACHE_VERSION, app_config_state, user_config_digest)
+    
+    def _load_snapshot_cache(self) -> bool:
+        """
+        读取配置快照缓存
+        
+        Returns:
+            缓存是否有效并已加载
+        """
+        try:
+            with open(self.get_snapshot_cache_path(), 'rb') as f:
+                snapshot = pickle.load(f)
+            
+            if snapshot.get('key') != self._build_cache_key():
+                return False
+            
+            self._config = {
+                level: TitleConfig(
+                    style=StyleConfig(**data['style']),
+                    patterns=[RegexPattern(**pattern_data) for pattern_data in data['patterns']],
+                )
+                for level, data in snapshot['config'].items()
+            }
+            self._snapshot = ConfigSnapshot.from_plain(snapshot['snapshot'])
+            return True
+            
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"读取配置快照失败，重新加载配置: {e}")
+            return False
+    
+    def _write_snapshot_cache(self):
+        """写入配置快照缓存（失败不影响正常使用）"""
+        try:
+            cache_path = self.get_snapshot_cache_path()
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            
+            # 只保存内置类型，读取时再重建各数据类：以 src.textpolish 或 textpolish 导入时都能读取
+            snapshot = {
+                'key': self._build_cache_key(),
+                'config': {
+                    level: {
+                        'style': asdict(title_config.style),
+                        'patterns': [asdict(pattern) for pattern in title_config.patterns],
+                    }
+                    for level, title_config in self._config.items()
+                },
+                'snapshot': self._snapshot.to_plain(),
+            }
+            # 先写临时文件再替换，避免其他实例读到写了一半的快照
+            temp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+            
+        except Exception as e:
+            print(f"写入配置快照失败: {e}")
+    
+    def _compile(self):
+        """根据当前配置生成新的不可变快照并发布（版本号递增）"""
+        with self._publish_lock:
+            self._snapshot = ConfigSnapshot.build(self._snapshot.version + 1, self._config)
+    
+    def snapshot(self) -> ConfigSnapshot:
+        """
+        获取当前配置快照
+        
+        渲染任务应在开始时调用一次，并在整个任务中使用同一份快照。
+        
+        Returns:
+            不可变的配置快照
+        """
+        return self._snapshot
+    
+    def _publish(self):
+        """配置变化后重新预计算并更新快照缓存"""
+        self._compile()
+        self._write_snapshot_cache()
     
     def _load_default_config(self):
         """加载默认配置"""
         # 尝试从应用配置文件加载
-        app_config_path = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'app_config.json')
-        app_config_path = os.path.abspath(app_config_path)
+        app_config_path = self.get_app_config_path()
         
         if self.load_from_app_config(app_config_path):
             print("成功从应用配置文件加载默认设置")
@@ -349,6 +724,8 @@ class UserConfigManager:
             self.settings.sync()
             print(f"配置已保存到: {config_file_path}")
             
+            self._publish()
+            
         except Exception as e:
             print(f"保存配置失败: {e}")
     
@@ -388,12 +765,13 @@ class UserConfigManager:
         self._load_default_config()
         self.save_config()
     
-    def get_enabled_patterns(self, level: str) -> List[str]:
-        """获取指定级别的启用正则表达式"""
-        if level not in self._config:
-            return []
-        
-        return [pattern.pattern for pattern in self._config[level].patterns if pattern.enabled]
+    def get_enabled_patterns(self, level: str) -> Tuple[str, ...]:
+        """获取指定级别的启用正则表达式（来自当前快照，配置保存时更新）"""
+        return self._snapshot.get_enabled_patterns(level)
+    
+    def get_style_fragment(self, level: str) -> str:
+        """获取指定级别span的内联样式片段（来自当前快照，配置保存时更新）"""
+        return self._snapshot.get_style_fragment(level)
     
     def get_style_dict(self, level: str) -> Dict:
         """获取指定级别的样式字典（兼容原有格式）"""
@@ -412,6 +790,26 @@ class UserConfigManager:
         except Exception as e:
             print(f"保存界面设置失败: {e}")
     
+    def load_result_cache_enabled(self) -> bool:
+        """读取是否启用处理结果缓存（默认启用）"""
+        value = self.settings.value("result_cache_enabled", True)
+        return value if isinstance(value, bool) else str(value).lower() == 'true'
+    
+    def save_result_cache_enabled(self, enabled: bool):
+        """保存是否启用处理结果缓存"""
+        self.settings.setValue("result_cache_enabled", enabled)
+        self.settings.sync()
+    
+    def load_history_enabled(self) -> bool:
+        """读取是否保存处理历史（默认保存）"""
+        value = self.settings.value("history_enabled", True)
+        return value if isinstance(value, bool) else str(value).lower() == 'true'
+    
+    def save_history_enabled(self, enabled: bool):
+        """保存是否保存处理历史"""
+        self.settings.setValue("history_enabled", enabled)
+        self.settings.sync()
+    
     def load_ui_settings(self) -> Dict:
         """加载界面设置"""
         try:
@@ -515,7 +913,7 @@ class UserConfigManager:
                     print(f"从应用配置加载默认设置: {app_config_path}")
                     
                     for level, data in default_user_config.items():
-                        if level in self._config:
+                        if level in CONFIG_LEVELS:
                             # 加载样式配置
                             style_data = data.get('style', {})
                             style = StyleConfig(**style_data)
@@ -534,5 +932,14 @@ class UserConfigManager:
         return False
 
 
-# 全局配置管理器实例
-user_config_manager = UserConfigManager()
+# 全局配置管理器实例（首次访问时创建，使只读取常量的模块无需加载用户配置）
+_user_config_manager: Optional[UserConfigManager] = None
+
+
+def __getattr__(name):
+    global _user_config_manager
+    if name == 'user_config_manager':
+        if _user_config_manager is None:
+            _user_config_manager = UserConfigManager()
+        return _user_config_manager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
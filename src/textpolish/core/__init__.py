@@ -5,5 +5,15 @@
 
 from .text_processor import TextProcessor
 from .html_generator import HTMLGenerator
+from .blocks import LevelHint, TextBlock
+from .docx_writer import DocxWriter
+from .pipeline import PolishPipeline, PolishResult, clean_many, convert_many
+from .async_api import (
+    clean_text_async, configure_async_executor, convert_async, convert_stream_async,
+    convert_to_html_async, shutdown_async_executor
+)
 
-__all__ = ['TextProcessor', 'HTMLGenerator']
+__all__ = ['TextProcessor', 'HTMLGenerator', 'LevelHint', 'TextBlock', 'DocxWriter', 'PolishPipeline', 'PolishResult',
+           'clean_many', 'convert_many',
+           'clean_text_async', 'convert_to_html_async', 'convert_async', 'convert_stream_async',
+           'configure_async_executor', 'shutdown_async_executor']
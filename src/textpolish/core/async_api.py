@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+异步接口模块 - 供asyncio程序调用的文本清理和格式转换
+
+所有处理都交给一个共享的有界执行器（线程池或进程池）完成，事件循环只等待结果。
+正则匹配在执行期间持有GIL，处理大文档时线程池仍会拖慢事件循环，此时应选择进程池。
+
+取消等待中的协程会抛出 asyncio.CancelledError：尚未开始的任务直接从执行器中撤销，
+已经开始的任务在后台完成后丢弃结果；流式处理在分片之间检查取消，不再提交后续分片。
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from ..config import (
+    ASYNC_EXECUTOR_KIND, ASYNC_MAX_WORKERS, ASYNC_STREAM_CHUNK_CHARS,
+    ConfigSnapshot, user_config_manager
+)
+from ..utils.metrics import metrics
+from .blocks import LevelHint
+from .pipeline import OUTPUT_FORMATS, PolishPipeline
+from .text_processor import TextProcessor
+
+
+# 可选的执行器类型
+EXECUTOR_KINDS = ('thread', 'process')
+
+# 流式处理支持的输出格式（WPS文档需要完整的body，不能分片输出）
+STREAM_FORMATS = ('clean', 'html')
+
+# 共享执行器及其类型（首次调用时按默认配置创建）
+_executor: Optional[Executor] = None
+_executor_kind: Optional[str] = None
+_executor_lock = threading.Lock()
+
+# 执行器各线程（或各工作进程）自己的处理流水线
+_local = threading.local()
+
+
+def configure_async_executor(kind: str = ASYNC_EXECUTOR_KIND, max_workers: Optional[int] = None) -> None:
+    """
+    设置异步接口使用的共享执行器（替换已有的执行器，已提交的任务继续完成）
+
+    Args:
+        kind: 'thread' 线程池，或 'process' 进程池（不受GIL影响，适合大文档）
+        max_workers: 工作线程/进程数上限（默认为 ASYNC_MAX_WORKERS 与CPU核数中的较小值）
+
+    Raises:
+        ValueError: 不支持的执行器类型
+    """
+    global _executor, _executor_kind
+    executor = _create_executor(kind, max_workers)
+    with _executor_lock:
+        previous, _executor, _executor_kind = _executor, executor, kind
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+def _create_executor(kind: str, max_workers: Optional[int]) -> Executor:
+    if kind not in EXECUTOR_KINDS:
+        raise ValueError(f"不支持的执行器类型: {kind}")
+    workers = max_workers or min(ASYNC_MAX_WORKERS, os.cpu_count() or 1)
+    if kind == 'process':
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='textpolish-async')
+
+
+def get_async_executor() -> Tuple[Executor, str]:
+    """获取共享执行器及其类型（尚未设置时按默认配置创建）"""
+    global _executor, _executor_kind
+    with _executor_lock:
+        if _executor is None:
+            _executor, _executor_kind = _create_executor(ASYNC_EXECUTOR_KIND, None), ASYNC_EXECUTOR_KIND
+        return _executor, _executor_kind
+
+
+def shutdown_async_executor(wait: bool = True) -> None:
+    """关闭共享执行器（之后的调用会重新创建）"""
+    global _executor, _executor_kind
+    with _executor_lock:
+        executor, _executor, _executor_kind = _executor, None, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _get_pipeline() -> PolishPipeline:
+    pipeline = getattr(_local, 'pipeline', None)
+    if pipeline is None:
+        pipeline = _local.pipeline = PolishPipeline()
+    return pipeline
+
+
+def _run_task(operation: str, text: str, options: Dict, drain_metrics: bool):
+    """
+    在执行器中执行一项处理
+
+    Returns:
+        (结果, 本次记录的指标增量（线程池中为None，指标直接记录在同一个注册表中）)
+    """
+    pipeline = _get_pipeline()
+    if operation == 'clean':
+        result = pipeline.text_processor.clean_text(text)
+    elif operation == 'html_body':
+        result = pipeline.html_generator.convert_to_html(text, **options)
+    elif operation == 'stream_html':
+        result = pipeline.html_generator.convert_to_html(pipeline.text_processor.clean_text(text), **options)
+    else:
+        result = pipeline.convert(text, operation, **options)
+    return result, metrics.drain() if drain_metrics else None
+
+
+async def _submit(operation: str, text: str, options: Dict) -> str:
+    """提交到共享执行器并等待结果（取消时撤销尚未开始的任务）"""
+    executor, kind = get_async_executor()
+    loop = asyncio.get_running_loop()
+    result, worker_metrics = await loop.run_in_executor(
+        executor, _run_task, operation, text, options, kind == 'process'
+    )
+    if worker_metrics:
+        metrics.merge(worker_metrics)
+    return result
+
+
+def _resolve_snapshot(snapshot: Optional[ConfigSnapshot]) -> ConfigSnapshot:
+    # 在调用方所在线程中取快照，整个调用（包括进程池中的处理）使用同一份配置
+    return snapshot if snapshot is not None else user_config_manager.snapshot()
+
+
+async def clean_text_async(text: str) -> str:
+    """
+    异步清理文本（与 TextProcessor.clean_text 结果相同）
+
+    Args:
+        text: 原始输入文本
+
+    Returns:
+        清理后的文本
+    """
+    return await _submit('clean', text, {})
+
+
+async def convert_to_html_async(text: str, enable_h1: bool = True, enable_h2: bool = True,
+                                enable_h3: bool = True, enable_special: bool = True,
+                                snapshot: Optional[ConfigSnapshot] = None,
+                                level_hints: Optional[Sequence[Optional[LevelHint]]] = None) -> str:
+    """
+    异步转换为HTML body（与 HTMLGenerator.convert_to_html 结果相同）
+
+    Args:
+        text: 清理后的文本
+        enable_h1: 是否启用一级标题格式
+        enable_h2: 是否启用二级标题格式
+        enable_h3: 是否启用三级标题格式
+        enable_special: 是否启用特殊格式识别
+        snapshot: 配置快照（默认使用调用时的当前快照）
+        level_hints: 与非空行一一对应的级别提示
+
+    Returns:
+        HTML body内容
+    """
+    options = {
+        'enable_h1': enable_h1, 'enable_h2': enable_h2, 'enable_h3': enable_h3,
+        'enable_special': enable_special, 'snapshot': _resolve_snapshot(snapshot),
+        'level_hints': tuple(level_hints) if level_hints is not None else None,
+    }
+    return await _submit('html_body', text, options)
+
+
+async def convert_async(text: str, output_format: str = 'wps', enable_h1: bool = True,
+                        enable_h2: bool = True, enable_h3: bool = True, enable_special: bool = True,
+                        snapshot: Optional[ConfigSnapshot] = None, is_html: bool = False) -> str:
+    """
+    异步完整处理并按指定格式输出（与 PolishPipeline.convert 结果相同）
+
+    Args:
+        text: 原始输入文本或HTML
+        output_format: 输出格式（'clean'、'html' 或 'wps'）
+        enable_h1: 是否启用一级标题格式
+        enable_h2: 是否启用二级标题格式
+        enable_h3: 是否启用三级标题格式
+        enable_special: 是否启用特殊格式识别
+        snapshot: 配置快照（默认使用调用时的当前快照）
+        is_html: 输入是否为HTML
+
+    Returns:
+        指定格式的结果
+
+    Raises:
+        ValueError: 不支持的输出格式
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"不支持的输出格式: {output_format}")
+    options = {
+        'enable_h1': enable_h1, 'enable_h2': enable_h2, 'enable_h3': enable_h3,
+        'enable_special': enable_special, 'snapshot': _resolve_snapshot(snapshot), 'is_html': is_html,
+    }
+    return await _submit(output_format, text, options)
+
+
+async def convert_stream_async(chunks: Union[AsyncIterable[str], Iterable[str]], output_format: str = 'html',
+                               enable_h1: bool = True, enable_h2: bool = True, enable_h3: bool = True,
+                               enable_special: bool = True, snapshot: Optional[ConfigSnapshot] = None,
+                               chunk_chars: int = ASYNC_STREAM_CHUNK_CHARS) -> AsyncIterator[str]:
+    """
+    流式处理：边读取输入边按分片处理并输出
+
+    输入在可以安全拆分的行边界处（见 TextProcessor.is_safe_boundary）切分为约 chunk_chars
+    字符的分片，逐片交给执行器处理，每片完成后交还事件循环。各输出片段以换行连接，
+    即与整体处理的结果相同。
+
+    Args:
+        chunks: 输入文本片段（同步或异步可迭代对象，片段边界可以在行中间）
+        output_format: 输出格式（'clean' 或 'html'）
+        enable_h1: 是否启用一级标题格式
+        enable_h2: 是否启用二级标题格式
+        enable_h3: 是否启用三级标题格式
+        enable_special: 是否启用特殊格式识别
+        snapshot: 配置快照（默认使用开始时的当前快照）
+        chunk_chars: 分片的目标字符数
+
+    Yields:
+        各分片的处理结果（空分片不输出）
+
+    Raises:
+        ValueError: 不支持的输出格式
+    """
+    if output_format not in STREAM_FORMATS:
+        raise ValueError(f"流式处理不支持的输出格式: {output_format}")
+    if output_format == 'clean':
+        operation, options = 'clean', {}
+    else:
+        operation = 'stream_html'
+        options = {
+            'enable_h1': enable_h1, 'enable_h2': enable_h2, 'enable_h3': enable_h3,
+            'enable_special': enable_special, 'snapshot': _resolve_snapshot(snapshot),
+        }
+
+    async def process(lines: List[str]) -> Optional[str]:
+        result = await _submit(operation, '\n'.join(lines), options)
+        return result if result.strip() else None
+
+    pending: List[str] = []   # 尚未处理的完整行
+    pending_chars = 0
+    partial = ''              # 最后一个尚未读到换行符的行
+    async for piece in _iterate(chunks):
+        lines = (partial + piece).split('\n')
+        partial = lines.pop()
+        pending.extend(lines)
+        pending_chars += sum(len(line) + 1 for line in lines)
+        if pending_chars < chunk_chars:
+            continue
+        split = _find_split(pending)
+        if split:
+            result = await process(pending[:split])
+            pending = pending[split:]
+            pending_chars = sum(len(line) + 1 for line in pending)
+            if result is not None:
+                yield result
+
+    pending.append(partial)
+    if any(line.strip() for line in pending):
+        result = await process(pending)
+        if result is not None:
+            yield result
+
+
+def _find_split(lines: List[str]) -> int:
+    """从后向前查找可以安全拆分的位置，返回前一部分的行数（找不到时为0）"""
+    for index in range(len(lines) - 1, 0, -1):
+        if TextProcessor.is_safe_boundary(lines[index - 1], lines[index]):
+            return index
+    return 0
+
+
+async def _iterate(chunks: Union[AsyncIterable[str], Iterable[str]]) -> AsyncIterator[str]:
+    """统一遍历同步和异步可迭代对象（同步输入每个片段后交还一次事件循环）"""
+    if hasattr(chunks, '__aiter__'):
+        async for chunk in chunks:
+            yield chunk
+        return
+    for chunk in chunks:
+        yield chunk
+        await asyncio.sleep(0)
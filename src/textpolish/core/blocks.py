@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+文档块模块 - 描述识别级别后的段落，供HTML、DOCX等不同输出格式共用
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence, Tuple
+
+
+# 块级别
+BLOCK_LEVELS = ('h1', 'h2', 'h3', 'special_format', 'normal')
+
+
+@dataclass(frozen=True, slots=True)
+class TextBlock:
+    """
+    文档块 - 一个已识别级别的段落
+
+    Attributes:
+        level: 级别 ('h1'、'h2'、'h3'、'special_format'、'normal')
+        text: 段落文本；特殊格式段落中为加粗的特殊部分
+        tail: 特殊格式段落中特殊部分之后的正文（其他级别为空）
+    """
+    level: str
+    text: str
+    tail: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class LevelHint:
+    """
+    段落级别提示 - 来自富文本结构（如HTML标题标签），识别时跳过正则匹配
+
+    Attributes:
+        level: 级别 ('h1'、'h2'、'h3'、'special_format')
+        lead_length: 特殊格式段落中加粗部分的字符数（其他级别为0）
+    """
+    level: str
+    lead_length: int = 0
+
+
+def pack_blocks(blocks: Sequence[TextBlock]) -> Tuple[Tuple[str, str, str], ...]:
+    """把段落块转换为只包含内置类型的元组（用于缓存，与模块的导入路径无关）"""
+    return tuple((block.level, block.text, block.tail) for block in blocks)
+
+
+def unpack_blocks(packed: Iterable[Sequence]) -> Tuple[TextBlock, ...]:
+    """由 pack_blocks() 的结果重建段落块"""
+    return tuple(TextBlock(*block) for block in packed)
+
+
+def pack_level_hints(level_hints: Optional[Sequence[Optional[LevelHint]]]) -> Optional[Tuple]:
+    """把级别提示转换为只包含内置类型的元组（没有提示的段落为None）"""
+    if level_hints is None:
+        return None
+    return tuple(None if hint is None else (hint.level, hint.lead_length) for hint in level_hints)
+
+
+def unpack_level_hints(packed: Optional[Iterable]) -> Optional[Tuple[Optional[LevelHint], ...]]:
+    """由 pack_level_hints() 的结果重建级别提示"""
+    if packed is None:
+        return None
+    return tuple(None if hint is None else LevelHint(*hint) for hint in packed)
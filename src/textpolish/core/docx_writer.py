@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+DOCX导出模块 - 将文档块直接写为Word文档（.docx）
+
+仅使用标准库：用zipfile打包，document.xml按段落流式写入压缩包，不在内存中拼接整篇文档。
+各级别的字体、字号、对齐和缩进来自配置快照，在styles.xml中定义为Word段落样式，
+每个段落只引用样式名称，打开时无需经过HTML导入。
+"""
+
+import re
+import zipfile
+from typing import Iterable, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+from ..config import ConfigSnapshot, StyleSnapshot, user_config_manager
+from .blocks import TextBlock
+
+
+# 数字、英文使用的西文字体（与HTML输出中数字使用Times New Roman一致）
+WESTERN_FONT = "Times New Roman"
+
+# 级别 -> (样式ID, 样式名称, 大纲级别)
+PARAGRAPH_STYLES = {
+    'normal': ('Normal', 'Normal', None),
+    'h1': ('Heading1', 'heading 1', 0),
+    'h2': ('Heading2', 'heading 2', 1),
+    'h3': ('Heading3', 'heading 3', 2),
+}
+
+# 特殊格式段落中特殊部分使用的字符样式
+SPECIAL_CHAR_STYLE = 'SpecialLead'
+
+# 对齐方式 -> w:jc取值
+ALIGNMENT_MAP = {
+    'left': 'left',
+    'center': 'center',
+    'right': 'right',
+    'justify': 'both',
+}
+
+# 每批写入压缩包的段落数
+WRITE_BATCH_SIZE = 256
+
+# XML 1.0不允许的字符：控制字符、单独的代理项（无法编码为UTF-8）和非字符U+FFFE、U+FFFF
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+_W_NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+_CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+_DOCUMENT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# A4纸张，页边距与公文常用设置一致（单位：缇）
+_SECTION_XML = (
+    '<w:sectPr>'
+    '<w:pgSz w:w="11906" w:h="16838"/>'
+    '<w:pgMar w:top="2098" w:right="1474" w:bottom="1984" w:left="1588" '
+    'w:header="851" w:footer="992" w:gutter="0"/>'
+    '</w:sectPr>'
+)
+
+
+def points_to_half_points(value: str, default: int = 32) -> int:
+    """将 '16.0000pt' 形式的字号转换为半磅（w:sz的单位）"""
+    try:
+        return round(float(value.strip().lower().rstrip('pt')) * 2)
+    except (AttributeError, ValueError):
+        return default
+
+
+def points_to_twips(value: str) -> int:
+    """将 '36.0000pt' 形式的长度转换为缇（1磅 = 20缇）"""
+    try:
+        return round(float(value.strip().lower().rstrip('pt')) * 20)
+    except (AttributeError, ValueError):
+        return 0
+
+
+def clean_xml_text(text: str) -> str:
+    """去除XML不允许的字符并转义特殊字符"""
+    return escape(_INVALID_XML_CHARS.sub('', text))
+
+
+class DocxWriter:
+    """DOCX写入器 - 按配置快照中的样式将文档块写为Word文档"""
+
+    def __init__(self, snapshot: Optional[ConfigSnapshot] = None):
+        """
+        初始化DOCX写入器
+
+        Args:
+            snapshot: 配置快照（默认使用当前快照）
+        """
+        self.snapshot = snapshot if snapshot is not None else user_config_manager.snapshot()
+
+    def write(self, blocks: Iterable[TextBlock], path: str) -> int:
+        """
+        写入DOCX文件
+
+        Args:
+            blocks: 文档块（可以是生成器，逐块写入）
+            path: 输出文件路径
+
+        Returns:
+            写入的段落数
+        """
+        count = 0
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as docx:
+            docx.writestr('[Content_Types].xml', _CONTENT_TYPES_XML)
+            docx.writestr('_rels/.rels', _ROOT_RELS_XML)
+            docx.writestr('word/_rels/document.xml.rels', _DOCUMENT_RELS_XML)
+            docx.writestr('word/styles.xml', self.build_styles_xml())
+
+            with docx.open('word/document.xml', 'w') as stream:
+                stream.write((
+                    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    f'<w:document xmlns:w="{_W_NAMESPACE}"><w:body>'
+                ).encode('utf-8'))
+
+                batch = []
+                for block in blocks:
+                    batch.append(self._paragraph_xml(block))
+                    count += 1
+                    if len(batch) >= WRITE_BATCH_SIZE:
+                        stream.write(''.join(batch).encode('utf-8'))
+                        batch.clear()
+                if batch:
+                    stream.write(''.join(batch).encode('utf-8'))
+
+                stream.write(f'{_SECTION_XML}</w:body></w:document>'.encode('utf-8'))
+        return count
+
+    def build_styles_xml(self) -> str:
+        """
+        生成styles.xml：每个级别定义一次段落样式，特殊格式定义一个字符样式
+
+        Returns:
+            styles.xml内容
+        """
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n',
+            f'<w:styles xmlns:w="{_W_NAMESPACE}">',
+            '<w:docDefaults><w:rPrDefault><w:rPr>',
+            f'<w:rFonts w:ascii="{WESTERN_FONT}" w:hAnsi="{WESTERN_FONT}" w:cs="{WESTERN_FONT}"/>',
+            '<w:lang w:val="en-US" w:eastAsia="zh-CN"/>',
+            '</w:rPr></w:rPrDefault>',
+            '<w:pPrDefault><w:pPr><w:spacing w:before="0" w:after="0" w:line="240" w:lineRule="auto"/>'
+            '</w:pPr></w:pPrDefault></w:docDefaults>',
+        ]
+
+        for level, (style_id, name, outline_level) in PARAGRAPH_STYLES.items():
+            style = self._get_style(level)
+            default_attr = ' w:default="1"' if level == 'normal' else ''
+            parts.append(f'<w:style w:type="paragraph"{default_attr} w:styleId="{style_id}">')
+            parts.append(f'<w:name w:val="{name}"/>')
+            if outline_level is not None:
+                parts.append('<w:basedOn w:val="Normal"/><w:next w:val="Normal"/><w:qFormat/>')
+            else:
+                parts.append('<w:qFormat/>')
+            parts.append(self._paragraph_properties_xml(style, outline_level))
+            parts.append(self._run_properties_xml(style))
+            parts.append('</w:style>')
+
+        special_style = self._get_style('special_format')
+        parts.append(f'<w:style w:type="character" w:customStyle="1" w:styleId="{SPECIAL_CHAR_STYLE}">')
+        parts.append('<w:name w:val="Special Lead"/>')
+        parts.append(self._run_properties_xml(special_style))
+        parts.append('</w:style>')
+
+        parts.append('</w:styles>')
+        return ''.join(parts)
+
+    def _get_style(self, level: str) -> Optional[StyleSnapshot]:
+        level_snapshot = self.snapshot.get_level(level)
+        return level_snapshot.style if level_snapshot else None
+
+    def _paragraph_properties_xml(self, style: Optional[StyleSnapshot], outline_level: Optional[int]) -> str:
+        """生成段落属性（对齐、首行缩进、大纲级别）"""
+        props = []
+        if outline_level is not None:
+            props.append('<w:keepNext/><w:keepLines/>')
+        if style is not None:
+            # 标题样式继承自正文，需要显式写出缩进以覆盖正文的首行缩进
+            props.append(f'<w:ind w:firstLine="{points_to_twips(style.text_indent)}"/>')
+            props.append(f'<w:jc w:val="{ALIGNMENT_MAP.get(style.alignment, "both")}"/>')
+        if outline_level is not None:
+            props.append(f'<w:outlineLvl w:val="{outline_level}"/>')
+        return f'<w:pPr>{"".join(props)}</w:pPr>'
+
+    def _run_properties_xml(self, style: Optional[StyleSnapshot]) -> str:
+        """生成字符属性（中文字体、字号、字重、字距调整）"""
+        if style is None:
+            return ''
+        font = quoteattr(style.font_family)
+        size = points_to_half_points(style.font_size)
+        props = [
+            f'<w:rFonts w:ascii="{WESTERN_FONT}" w:eastAsia={font} '
+            f'w:hAnsi="{WESTERN_FONT}" w:cs="{WESTERN_FONT}"/>'
+        ]
+        if style.font_weight == 'bold':
+            props.append('<w:b/><w:bCs/>')
+        props.append(f'<w:kern w:val="{points_to_half_points(style.font_kerning, 0)}"/>')
+        props.append(f'<w:sz w:val="{size}"/><w:szCs w:val="{size}"/>')
+        return f'<w:rPr>{"".join(props)}</w:rPr>'
+
+    def _paragraph_xml(self, block: TextBlock) -> str:
+        """生成单个段落的XML"""
+        if block.level == 'special_format':
+            # 特殊格式段落使用正文样式，特殊部分套用字符样式
+            xml = (
+                '<w:p><w:pPr><w:jc w:val="both"/></w:pPr>'
+                f'<w:r><w:rPr><w:rStyle w:val="{SPECIAL_CHAR_STYLE}"/></w:rPr>'
+                f'<w:t xml:space="preserve">{clean_xml_text(block.text)}</w:t></w:r>'
+            )
+            if block.tail:
+                xml += f'<w:r><w:t xml:space="preserve">{clean_xml_text(block.tail)}</w:t></w:r>'
+            return xml + '</w:p>'
+
+        style_id = PARAGRAPH_STYLES.get(block.level, PARAGRAPH_STYLES['normal'])[0]
+        style_xml = '' if style_id == 'Normal' else f'<w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>'
+        return f'<w:p>{style_xml}<w:r><w:t xml:space="preserve">{clean_xml_text(block.text)}</w:t></w:r></w:p>'
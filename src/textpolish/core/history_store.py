@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+处理历史模块 - 把每次处理的结果保存在本地SQLite数据库中，供以后搜索和重新复制
+
+每条历史保存清理后文本和段落块，重新复制时由段落块直接生成WPS格式，无需再次清理和识别级别。
+清理后文本建有FTS5全文索引（trigram分词，中文按任意连续字符匹配）；SQLite不支持FTS5
+或trigram分词时改为逐条LIKE匹配。
+
+超过保留条数、保留天数或内容大小上限的旧记录在每次写入后删除，数据库空间随之回收。
+数据库出错时只在控制台提示一次，处理照常进行。
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..config import (
+    HISTORY_FILENAME, HISTORY_LIST_LIMIT, HISTORY_MAX_AGE_DAYS, HISTORY_MAX_BYTES,
+    HISTORY_MAX_ENTRIES, HISTORY_TITLE_CHARS, user_config_manager
+)
+from .blocks import LevelHint, TextBlock
+
+
+# 等待其他进程释放数据库锁的时间（秒）
+HISTORY_LOCK_TIMEOUT = 5
+
+# trigram分词只能匹配不少于3个字符的关键词，更短的关键词改用LIKE匹配
+FTS_MIN_TERM_CHARS = 3
+
+# 搜索结果摘要中关键词前后保留的字符数
+SNIPPET_CONTEXT_CHARS = 12
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryEntry:
+    """
+    历史记录摘要 - 用于列表显示
+
+    Attributes:
+        id: 记录编号
+        created: 处理时间（时间戳）
+        title: 标题（清理后文本的第一个非空行）
+        char_count: 清理后文本的字符数
+        snippet: 搜索时关键词所在的片段（列出最近记录时为空）
+    """
+    id: int
+    created: float
+    title: str
+    char_count: int
+    snippet: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryRecord:
+    """
+    完整的历史记录 - 重新复制或载入时使用
+
+    Attributes:
+        id: 记录编号
+        created: 处理时间（时间戳）
+        cleaned_text: 清理后文本
+        blocks: 段落块
+        level_hints: 富文本导入时的级别提示（来自纯文本时为None）
+    """
+    id: int
+    created: float
+    cleaned_text: str
+    blocks: Tuple[TextBlock, ...]
+    level_hints: Optional[Tuple[Optional[LevelHint], ...]] = None
+
+
+def make_title(cleaned_text: str) -> str:
+    """取第一个非空行作为标题（过长时截断）"""
+    for line in cleaned_text.split('\n'):
+        line = line.strip()
+        if line:
+            return line if len(line) <= HISTORY_TITLE_CHARS else line[:HISTORY_TITLE_CHARS] + '…'
+    return ''
+
+
+def _encode_structure(blocks: Sequence[TextBlock],
+                      level_hints: Optional[Sequence[Optional[LevelHint]]]) -> bytes:
+    """把段落块和级别提示编码为压缩的JSON"""
+    data = {
+        'blocks': [[block.level, block.text, block.tail] for block in blocks],
+        'hints': None if level_hints is None else [
+            None if hint is None else [hint.level, hint.lead_length] for hint in level_hints
+        ],
+    }
+    return zlib.compress(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+
+def _decode_structure(data: bytes) -> Tuple[Tuple[TextBlock, ...], Optional[Tuple[Optional[LevelHint], ...]]]:
+    """解码段落块和级别提示"""
+    data = json.loads(zlib.decompress(data).decode('utf-8'))
+    blocks = tuple(TextBlock(*block) for block in data['blocks'])
+    hints = data['hints']
+    if hints is not None:
+        hints = tuple(None if hint is None else LevelHint(*hint) for hint in hints)
+    return blocks, hints
+
+
+def _like_pattern(term: str) -> str:
+    """转义LIKE通配符"""
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+class HistoryStore:
+    """处理历史 - 首次使用时才打开数据库"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = HISTORY_MAX_ENTRIES,
+                 max_age_days: float = HISTORY_MAX_AGE_DAYS, max_bytes: int = HISTORY_MAX_BYTES):
+        """
+        初始化处理历史
+
+        Args:
+            path: 数据库文件路径（默认与用户配置文件位于同一目录）
+            max_entries: 保留的记录条数上限
+            max_age_days: 记录保留天数
+            max_bytes: 内容总大小上限（字节）
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self._connection: Optional[sqlite3.Connection] = None
+        self._failed = False
+        self._lock = threading.Lock()
+        # 是否建有FTS5全文索引
+        self._fts = False
+
+    def set_enabled(self, enabled: bool) -> None:
+        """开启或关闭保存历史（关闭后不再写入，已有记录仍可搜索）"""
+        self.enabled = enabled
+
+    def get_path(self) -> str:
+        """获取数据库文件路径"""
+        if self.path is None:
+            config_dir = os.path.dirname(user_config_manager.settings.fileName())
+            self.path = os.path.join(config_dir, HISTORY_FILENAME)
+        return self.path
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """打开数据库（失败后不再重试）"""
+        if self._connection is not None or self._failed:
+            return self._connection
+        try:
+            path = self.get_path()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            connection = sqlite3.connect(path, timeout=HISTORY_LOCK_TIMEOUT,
+                                         check_same_thread=False, isolation_level=None)
+            # 必须在建表之前设置，删除旧记录后才能回收文件空间
+            connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS history ("
+                "id INTEGER PRIMARY KEY, created REAL NOT NULL, digest TEXT NOT NULL UNIQUE, "
+                "title TEXT NOT NULL, char_count INTEGER NOT NULL, cleaned_text TEXT NOT NULL, "
+                "structure BLOB NOT NULL, size INTEGER NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS history_created ON history (created)")
+            self._fts = self._create_fts(connection)
+            self._connection = connection
+        except sqlite3.Error as e:
+            self._fail(e)
+        return self._connection
+
+    @staticmethod
+    def _create_fts(connection: sqlite3.Connection) -> bool:
+        """
+        创建全文索引及同步触发器
+
+        Returns:
+            是否可以使用全文索引
+        """
+        try:
+            connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5("
+                "cleaned_text, content='history', content_rowid='id', tokenize='trigram')"
+            )
+        except sqlite3.OperationalError:
+            # SQLite版本过低（不支持FTS5或trigram分词）
+            return False
+        connection.execute(
+            "CREATE TRIGGER IF NOT EXISTS history_fts_insert AFTER INSERT ON history BEGIN "
+            "INSERT INTO history_fts (rowid, cleaned_text) VALUES (new.id, new.cleaned_text); END"
+        )
+        connection.execute(
+            "CREATE TRIGGER IF NOT EXISTS history_fts_delete AFTER DELETE ON history BEGIN "
+            "INSERT INTO history_fts (history_fts, rowid, cleaned_text) "
+            "VALUES ('delete', old.id, old.cleaned_text); END"
+        )
+        return True
+
+    def _fail(self, error: Exception) -> None:
+        """数据库出错：提示一次并停用，不影响处理"""
+        if not self._failed:
+            print(f"处理历史不可用，已停用: {error}")
+        self._failed = True
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def add(self, cleaned_text: str, blocks: Sequence[TextBlock],
+            level_hints: Optional[Sequence[Optional[LevelHint]]] = None) -> Optional[int]:
+        """
+        保存一次处理结果（内容相同的记录只更新处理时间），然后按保留限制删除旧记录
+
+        Args:
+            cleaned_text: 清理后文本
+            blocks: 段落块
+            level_hints: 富文本导入时的级别提示
+
+        Returns:
+            记录编号；未启用、内容为空或出错时返回None
+        """
+        if not self.enabled or not cleaned_text.strip():
+            return None
+        structure = _encode_structure(blocks, level_hints)
+        digest = hashlib.sha256(cleaned_text.encode('utf-8', 'surrogatepass') + structure).hexdigest()
+        size = len(cleaned_text.encode('utf-8', 'surrogatepass')) + len(structure)
+        if size > self.max_bytes:
+            return None
+        now = time.time()
+
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return None
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    row = connection.execute("SELECT id FROM history WHERE digest = ?", (digest,)).fetchone()
+                    if row is not None:
+                        entry_id = row[0]
+                        connection.execute("UPDATE history SET created = ? WHERE id = ?", (now, entry_id))
+                    else:
+                        entry_id = connection.execute(
+                            "INSERT INTO history (created, digest, title, char_count, cleaned_text, "
+                            "structure, size) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (now, digest, make_title(cleaned_text), len(cleaned_text), cleaned_text,
+                             structure, size)
+                        ).lastrowid
+                    removed = self._enforce_retention(connection, now)
+                    connection.execute("COMMIT")
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+                if removed:
+                    connection.execute("PRAGMA incremental_vacuum")
+            except sqlite3.Error as e:
+                self._fail(e)
+                return None
+        return entry_id
+
+    def _enforce_retention(self, connection: sqlite3.Connection, now: float) -> int:
+        """
+        按保留天数、条数和内容大小删除最旧的记录
+
+        Returns:
+            删除的记录数
+        """
+        removed = connection.execute(
+            "DELETE FROM history WHERE created < ?", (now - self.max_age_days * 24 * 60 * 60,)
+        ).rowcount
+        removed += connection.execute(
+            "DELETE FROM history WHERE id NOT IN "
+            "(SELECT id FROM history ORDER BY created DESC LIMIT ?)", (self.max_entries,)
+        ).rowcount
+
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM history").fetchone()[0]
+        if total > self.max_bytes:
+            expired = []
+            for entry_id, size in connection.execute("SELECT id, size FROM history ORDER BY created"):
+                if total <= self.max_bytes:
+                    break
+                expired.append((entry_id,))
+                total -= size
+            connection.executemany("DELETE FROM history WHERE id = ?", expired)
+            removed += len(expired)
+        return removed
+
+    def recent(self, limit: int = HISTORY_LIST_LIMIT) -> List[HistoryEntry]:
+        """
+        列出最近的记录
+
+        Args:
+            limit: 最多返回的条数
+
+        Returns:
+            按处理时间从新到旧排列的记录摘要
+        """
+        return self._query(
+            "SELECT id, created, title, char_count, '' FROM history ORDER BY created DESC LIMIT ?",
+            (limit,)
+        )
+
+    def search(self, query: str, limit: int = HISTORY_LIST_LIMIT) -> List[HistoryEntry]:
+        """
+        搜索清理后文本中包含全部关键词的记录
+
+        Args:
+            query: 关键词（以空白分隔，需全部出现）
+            limit: 最多返回的条数
+
+        Returns:
+            按处理时间从新到旧排列的记录摘要（带关键词所在的片段）
+        """
+        terms = query.split()
+        if not terms:
+            return self.recent(limit)
+
+        with self._lock:
+            # 先打开数据库，才能知道是否建有全文索引
+            use_fts = self._connect() is not None and self._fts
+        if use_fts and all(len(term) >= FTS_MIN_TERM_CHARS for term in terms):
+            # 每个关键词作为一个短语，双引号转义后以空格连接（全部匹配）
+            match = ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+            # 全文索引只用来找出记录：snippet() 要重新分词整篇文本，长文档一次要数秒
+            condition = "id IN (SELECT rowid FROM history_fts WHERE history_fts MATCH ?)"
+            parameters = (match,)
+        else:
+            condition = ' AND '.join("cleaned_text LIKE ? ESCAPE '\\'" for _ in terms)
+            parameters = tuple(_like_pattern(term) for term in terms)
+
+        # 先按时间取出最多limit条记录，只对这些记录截取第一个关键词前后的片段
+        # （与LIKE和全文索引一样不区分ASCII字母大小写）
+        return self._query(
+            "SELECT id, created, title, char_count, "
+            "substr(cleaned_text, max(instr(lower(cleaned_text), lower(?)) - ?, 1), ?) "
+            "FROM history WHERE id IN "
+            f"(SELECT id FROM history WHERE {condition} ORDER BY created DESC LIMIT ?) "
+            "ORDER BY created DESC",
+            (terms[0], SNIPPET_CONTEXT_CHARS, SNIPPET_CONTEXT_CHARS * 2 + len(terms[0]),
+             *parameters, limit)
+        )
+
+    def _query(self, sql: str, parameters: Tuple) -> List[HistoryEntry]:
+        """执行列表查询"""
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return []
+            try:
+                rows = connection.execute(sql, parameters).fetchall()
+            except sqlite3.Error as e:
+                self._fail(e)
+                return []
+        return [
+            HistoryEntry(entry_id, created, title, char_count, ' '.join((snippet or '').split()))
+            for entry_id, created, title, char_count, snippet in rows
+        ]
+
+    def load(self, entry_id: int) -> Optional[HistoryRecord]:
+        """
+        读取完整记录
+
+        Args:
+            entry_id: 记录编号
+
+        Returns:
+            完整记录；不存在或出错时返回None
+        """
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return None
+            try:
+                row = connection.execute(
+                    "SELECT created, cleaned_text, structure FROM history WHERE id = ?",
+                    (entry_id,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                self._fail(e)
+                return None
+        if row is None:
+            return None
+        created, cleaned_text, structure = row
+        try:
+            blocks, level_hints = _decode_structure(structure)
+        except (zlib.error, ValueError, KeyError, TypeError):
+            # 内容损坏的记录视为不存在
+            return None
+        return HistoryRecord(entry_id, created, cleaned_text, blocks, level_hints)
+
+    def delete(self, entry_id: int) -> None:
+        """删除一条记录"""
+        self._execute("DELETE FROM history WHERE id = ?", (entry_id,))
+
+    def clear(self) -> None:
+        """清空全部历史"""
+        self._execute("DELETE FROM history", ())
+        self._execute("VACUUM", ())
+
+    def _execute(self, sql: str, parameters: Tuple) -> None:
+        """执行修改语句"""
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return
+            try:
+                connection.execute(sql, parameters)
+            except sqlite3.Error as e:
+                self._fail(e)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        历史统计
+
+        Returns:
+            {'entries': 记录数, 'bytes': 内容总大小}
+        """
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return {'entries': 0, 'bytes': 0}
+            try:
+                entries, total = connection.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM history"
+                ).fetchone()
+            except sqlite3.Error as e:
+                self._fail(e)
+                return {'entries': 0, 'bytes': 0}
+        return {'entries': entries, 'bytes': total}
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+# 全局处理历史（界面使用）
+history_store = HistoryStore()
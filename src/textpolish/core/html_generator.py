@@ -3,10 +3,32 @@
 HTML生成模块 - 负责将文本转换为格式化的HTML
 """
 
+import html
 import re
-from typing import Dict, List, Tuple, Optional
+import time
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Tuple, Optional, Sequence
 
-from ..config import THEME_COLORS, HTML_NAMESPACE, user_config_manager
+from ..config import THEME_COLORS, HTML_NAMESPACE, ConfigSnapshot, StyleConfig, user_config_manager
+from .blocks import LevelHint, TextBlock
+from .rule_matcher import get_rule_matcher
+from .rule_optimizer import rule_optimizer
+from .rule_profiler import rule_profiler
+from .rule_validator import SPECIAL_GROUP_COUNTS, compile_rule
+from ..utils.memory_profiler import memory_profiler
+from ..utils.metrics import record_stage
+
+
+# 生成WPS文档框架时body内容位置的占位符
+_BODY_MARKER = '\x00'
+
+# 数字序列（与 _wrap_numbers_with_western_font 相同）
+_NUMBER_PATTERN = re.compile(r"(?<![A-Za-z])(?:\d[\d,\.]*%?)")
+
+
+def _preview_text(text: str) -> str:
+    """转义预览文本中的HTML特殊字符，数字序列标记为西文字体"""
+    return _NUMBER_PATTERN.sub(r'<span class="num">\g<0></span>', html.escape(text, quote=False))
 
 
 class HTMLGenerator:
@@ -15,10 +37,14 @@ class HTMLGenerator:
     def __init__(self):
         """初始化HTML生成器"""
         self.theme_colors = THEME_COLORS
+        # 最近一次使用的行级别识别函数：(配置快照, 启用状态, 统计/优化开关, 识别函数)
+        self._classifier_cache = None
     
     def convert_to_html(self, text: str, enable_h1: bool = True, 
                        enable_h2: bool = True, enable_h3: bool = True, 
-                       enable_special: bool = True) -> str:
+                       enable_special: bool = True,
+                       snapshot: Optional[ConfigSnapshot] = None,
+                       level_hints: Optional[Sequence[Optional[LevelHint]]] = None) -> str:
         """
         将文本转换为HTML格式，根据标题规则识别标题层级
         
@@ -28,6 +54,8 @@ class HTMLGenerator:
             enable_h2: 是否启用二级标题格式 
             enable_h3: 是否启用三级标题格式
             enable_special: 是否启用特殊格式识别
+            snapshot: 配置快照（默认在开始时获取当前快照，整个转换过程使用同一份配置）
+            level_hints: 与非空行一一对应的级别提示（来自富文本导入），有提示的行不再进行正则匹配
             
         Returns:
             HTML body内容（不包含完整HTML文档结构）
@@ -35,19 +63,236 @@ class HTMLGenerator:
         if not text.strip():
             return ""
         
-        lines = text.split('\n')
-        html_lines = []
+        if snapshot is None:
+            snapshot = user_config_manager.snapshot()
+        blocks = self.classify(text, enable_h1, enable_h2, enable_h3, enable_special, snapshot, level_hints)
+        return self.render_blocks(blocks, snapshot)
+    
+    def classify(self, text: str, enable_h1: bool = True,
+                 enable_h2: bool = True, enable_h3: bool = True,
+                 enable_special: bool = True,
+                 snapshot: Optional[ConfigSnapshot] = None,
+                 level_hints: Optional[Sequence[Optional[LevelHint]]] = None) -> Tuple[TextBlock, ...]:
+        """
+        识别各段落的级别（记录处理阶段耗时），结果可分别渲染为预览HTML、WPS HTML或DOCX
+        
+        参数同 convert_to_html
+        
+        Returns:
+            文档块（空行被忽略）
+        """
+        if not text.strip():
+            return ()
+        
+        start = time.perf_counter()
+        with memory_profiler.stage('classify'):
+            blocks = tuple(self.parse_blocks(text, enable_h1, enable_h2, enable_h3, enable_special,
+                                             snapshot, level_hints))
+        record_stage('classify', time.perf_counter() - start, len(text))
+        return blocks
+    
+    def parse_blocks(self, text: str, enable_h1: bool = True,
+                     enable_h2: bool = True, enable_h3: bool = True,
+                     enable_special: bool = True,
+                     snapshot: Optional[ConfigSnapshot] = None,
+                     level_hints: Optional[Sequence[Optional[LevelHint]]] = None) -> List[TextBlock]:
+        """
+        将文本拆分为文档块，根据标题规则识别每一段的级别
+        
+        Args:
+            text: 输入文本
+            enable_h1: 是否启用一级标题格式
+            enable_h2: 是否启用二级标题格式
+            enable_h3: 是否启用三级标题格式
+            enable_special: 是否启用特殊格式识别
+            snapshot: 配置快照（默认使用当前快照）
+            level_hints: 与非空行一一对应的级别提示，有提示的行不再进行正则匹配
+            
+        Returns:
+            文档块列表（空行被忽略）
+        """
+        if snapshot is None:
+            snapshot = user_config_manager.snapshot()
+        
+        enabled = {
+            'h1': enable_h1,
+            'h2': enable_h2,
+            'h3': enable_h3,
+            'special_format': enable_special,
+        }
+        hints = iter(level_hints) if level_hints is not None else None
+        classify = self.get_line_classifier(enable_h1, enable_h2, enable_h3, enable_special, snapshot)
         
-        for line in lines:
+        blocks = []
+        for line in text.split('\n'):
             line = line.strip()
             if not line:
                 continue
             
-            # 识别并处理各级标题
-            html_line = self._process_line(line, enable_h1, enable_h2, enable_h3, enable_special)
-            html_lines.append(html_line)
+            # 富文本中已知级别的行直接生成文档块
+            hint = next(hints, None) if hints is not None else None
+            if hint is not None and enabled.get(hint.level):
+                blocks.append(self._block_from_hint(line, hint))
+                continue
+            
+            # 识别各级标题
+            blocks.append(classify(line))
+        
+        return blocks
+    
+    def get_line_classifier(self, enable_h1: bool, enable_h2: bool, enable_h3: bool,
+                            enable_special: bool, snapshot: ConfigSnapshot) -> Callable[[str], TextBlock]:
+        """
+        获取行级别识别函数
+        
+        各级别的合并匹配器在这里一次取好，识别每行时不再查找规则列表和匹配器缓存。
+        识别函数按配置快照和启用状态缓存，连续处理多篇文档时只准备一次。
+        开启规则性能统计或规则顺序优化时逐行按当前统计结果匹配。
+        
+        Args:
+            enable_h1: 是否启用一级标题
+            enable_h2: 是否启用二级标题
+            enable_h3: 是否启用三级标题
+            enable_special: 是否启用特殊格式
+            snapshot: 配置快照
+            
+        Returns:
+            识别函数（输入去除首尾空白的非空行，返回文档块）
+        """
+        enables = (enable_h1, enable_h2, enable_h3, enable_special)
+        modes = (rule_profiler.enabled, rule_optimizer.enabled)
+        cached = self._classifier_cache
+        if cached is not None and cached[0] is snapshot and cached[1] == enables and cached[2] == modes:
+            return cached[3]
+        
+        if any(modes):
+            def classify(line: str) -> TextBlock:
+                return self._classify_line(line, enable_h1, enable_h2, enable_h3, enable_special, snapshot)
+        else:
+            classify = self._build_fast_classifier(enables, snapshot)
+        
+        self._classifier_cache = (snapshot, enables, modes, classify)
+        return classify
+    
+    def _build_fast_classifier(self, enables: Tuple[bool, bool, bool, bool],
+                               snapshot: ConfigSnapshot) -> Callable[[str], TextBlock]:
+        """按识别顺序预先取好各级别的合并匹配器，生成与 _classify_line 结果相同的识别函数"""
+        title_matchers = []
+        for level, enabled in zip(('h1', 'h2', 'h3'), enables):
+            patterns = snapshot.get_enabled_patterns(level)
+            if enabled and patterns:
+                title_matchers.append((level, get_rule_matcher(patterns).match))
+        
+        special_patterns = snapshot.get_enabled_patterns('special_format')
+        special_match = (
+            get_rule_matcher(special_patterns, SPECIAL_GROUP_COUNTS).match
+            if enables[3] and special_patterns else None
+        )
+        
+        def classify(line: str) -> TextBlock:
+            for level, match in title_matchers:
+                if match(line) is not None:
+                    return TextBlock(level, line)
+            if special_match is not None:
+                result = special_match(line)
+                if result is not None:
+                    return self._special_block(result[1])
+            return TextBlock('normal', line)
         
-        return '\n'.join(html_lines)
+        return classify
+    
+    def _block_from_hint(self, line: str, hint: LevelHint) -> TextBlock:
+        """
+        按级别提示生成文档块
+        
+        Args:
+            line: 文本行
+            hint: 级别提示
+            
+        Returns:
+            文档块
+        """
+        if hint.level == 'special_format':
+            return TextBlock('special_format', line[:hint.lead_length], line[hint.lead_length:].strip())
+        return TextBlock(hint.level, line)
+    
+    def render_blocks(self, blocks: List[TextBlock], snapshot: Optional[ConfigSnapshot] = None) -> str:
+        """
+        将文档块渲染为HTML
+        
+        Args:
+            blocks: 文档块列表
+            snapshot: 配置快照（默认使用当前快照，应与识别时使用的快照一致）
+            
+        Returns:
+            HTML body内容（不包含完整HTML文档结构）
+        """
+        if snapshot is None:
+            snapshot = user_config_manager.snapshot()
+        start = time.perf_counter()
+        with memory_profiler.stage('html'):
+            body = '\n'.join(self._render_block(block, snapshot) for block in blocks)
+        record_stage('html', time.perf_counter() - start, sum(len(block.text) + len(block.tail) for block in blocks))
+        return body
+    
+    def render_wps_html(self, blocks: Sequence[TextBlock], max_chars: Optional[int] = None,
+                        snapshot: Optional[ConfigSnapshot] = None) -> Optional[str]:
+        """
+        将文档块直接渲染为WPS兼容HTML，可限制长度
+        
+        逐段渲染并累计长度，超过 max_chars 时立即停止：过大的文档改为复制文件时，
+        不必先生成完整的HTML再判断大小。
+        
+        Args:
+            blocks: 文档块
+            max_chars: HTML长度上限（None表示不限制）
+            snapshot: 配置快照（默认使用当前快照，应与识别时使用的快照一致）
+            
+        Returns:
+            完整的WPS兼容HTML文档；超过长度上限时返回None
+        """
+        if snapshot is None:
+            snapshot = user_config_manager.snapshot()
+        prefix, suffix = _wps_html_frame()
+        budget = None if max_chars is None else max_chars - len(prefix) - len(suffix)
+        
+        start = time.perf_counter()
+        parts = []
+        length = -1     # 各段之间的换行比段数少一个
+        with memory_profiler.stage('html'):
+            for block in blocks:
+                part = self._render_block(block, snapshot)
+                length += len(part) + 1
+                if budget is not None and length > budget:
+                    return None
+                parts.append(part)
+            body = '\n'.join(parts)
+        record_stage('html', time.perf_counter() - start, sum(len(block.text) + len(block.tail) for block in blocks))
+        return self.generate_wps_html(body)
+    
+    def render_preview_blocks(self, blocks: Sequence[TextBlock]) -> str:
+        """
+        将文档块渲染为预览用的精简HTML
+        
+        只使用标签和class，字体、字号、颜色由预览样式表（generate_preview_stylesheet）统一决定，
+        不包含WPS所需的mso-*内联样式；每个段落一行。
+        
+        Args:
+            blocks: 文档块
+            
+        Returns:
+            预览HTML body内容
+        """
+        lines = []
+        for block in blocks:
+            content = _preview_text(block.text)
+            if block.level == 'special_format':
+                lines.append(f'<p><span class="special-bold">{content}</span>{_preview_text(block.tail)}</p>')
+            elif block.level == 'normal':
+                lines.append(f'<p>{content}</p>')
+            else:
+                lines.append(f'<{block.level}>{content}</{block.level}>')
+        return '\n'.join(lines)
     
     def _wrap_numbers_with_western_font(self, text: str) -> str:
         """将数字序列包裹为 Times New Roman 字体，保留其余文本字体不变"""
@@ -65,10 +310,11 @@ class HTMLGenerator:
         pattern = r"(?<![A-Za-z])(?:\d[\d,\.]*%?)"
         return re.sub(pattern, repl, text)
     
-    def _process_line(self, line: str, enable_h1: bool, 
-                     enable_h2: bool, enable_h3: bool, enable_special: bool) -> str:
+    def _classify_line(self, line: str, enable_h1: bool, 
+                       enable_h2: bool, enable_h3: bool, enable_special: bool,
+                       snapshot: ConfigSnapshot) -> TextBlock:
         """
-        处理单行文本，识别标题级别并生成相应HTML
+        识别单行文本的级别
         
         Args:
             line: 单行文本
@@ -76,141 +322,192 @@ class HTMLGenerator:
             enable_h2: 是否启用二级标题
             enable_h3: 是否启用三级标题
             enable_special: 是否启用特殊格式
+            snapshot: 配置快照
             
         Returns:
-            格式化的HTML行
+            文档块
         """
         # 检查一级标题
-        if enable_h1 and self._is_title_level(line, 'h1'):
-            return self._generate_title_html(line, 'h1')
+        if enable_h1 and self._is_title_level(line, 'h1', snapshot):
+            return TextBlock('h1', line)
         
         # 检查二级标题
-        if enable_h2 and self._is_title_level(line, 'h2'):
-            return self._generate_title_html(line, 'h2')
+        if enable_h2 and self._is_title_level(line, 'h2', snapshot):
+            return TextBlock('h2', line)
         
         # 检查三级标题
-        if enable_h3 and self._is_title_level(line, 'h3'):
-            return self._generate_title_html(line, 'h3')
+        if enable_h3 and self._is_title_level(line, 'h3', snapshot):
+            return TextBlock('h3', line)
         
         # 检查特殊格式段落
         if enable_special:
-            special_html = self._process_special_format(line)
-            if special_html:
-                return special_html
+            special_block = self._match_special_format(line, snapshot)
+            if special_block:
+                return special_block
         
         # 普通正文
-        return self._generate_normal_paragraph(line)
+        return TextBlock('normal', line)
     
-    def _is_title_level(self, line: str, level: str) -> bool:
+    def _render_block(self, block: TextBlock, snapshot: ConfigSnapshot) -> str:
+        """
+        生成单个文档块的HTML
+        
+        Args:
+            block: 文档块
+            snapshot: 配置快照
+            
+        Returns:
+            格式化的HTML行
+        """
+        if block.level == 'special_format':
+            return self._generate_special_format_html(block.text, block.tail, snapshot)
+        if block.level == 'normal':
+            return self._generate_normal_paragraph(block.text, snapshot)
+        return self._generate_title_html(block.text, block.level, snapshot)
+    
+    def _is_title_level(self, line: str, level: str, snapshot: ConfigSnapshot) -> bool:
         """
         检查行是否匹配指定级别的标题模式
         
         Args:
             line: 文本行
             level: 标题级别 ('h1', 'h2', 'h3')
+            snapshot: 配置快照
             
         Returns:
             是否匹配
         """
-        patterns = user_config_manager.get_enabled_patterns(level)
-        return any(re.match(pattern, line) for pattern in patterns)
+        return self._match_level(level, line, snapshot) is not None
+    
+    def _match_level(self, level: str, line: str, snapshot: ConfigSnapshot,
+                     group_counts: Optional[FrozenSet[int]] = None) -> Optional[Tuple[str, Tuple[Optional[str], ...]]]:
+        """
+        按顺序匹配指定级别的规则
+        
+        同一级别的规则合并为一个分支表达式一次匹配；开启规则性能统计时逐条匹配以记录每条规则的耗时。
+        
+        Args:
+            level: 级别
+            line: 文本行
+            snapshot: 配置快照
+            group_counts: 可用的捕获组数量（其他数量的规则即使匹配也跳过），None表示不限
+            
+        Returns:
+            (第一条匹配的规则, 该规则的捕获组)；都不匹配时返回None
+        """
+        patterns = self._get_patterns(level, line, snapshot)
+        if not patterns:
+            return None
+        
+        if rule_profiler.enabled:
+            for pattern in patterns:
+                match = self._match_rule_tracked(level, pattern, line)
+                if match and (group_counts is None or len(match.groups()) in group_counts):
+                    return pattern, match.groups()
+            return None
+        
+        result = get_rule_matcher(patterns, group_counts).match(line)
+        if result is not None and rule_optimizer.enabled:
+            rule_optimizer.record_hit(level, result[0])
+        return result
     
-    def _generate_title_html(self, line: str, level: str) -> str:
+    def _get_patterns(self, level: str, line: str, snapshot: ConfigSnapshot) -> Sequence[str]:
+        """
+        获取指定级别需要依次尝试的规则
+        
+        开启规则顺序优化时按命中频率排列，首字符不可能匹配任何规则的行直接返回空列表。
+        """
+        if not rule_optimizer.enabled:
+            return snapshot.get_enabled_patterns(level)
+        plan = rule_optimizer.get_plan(snapshot, level)
+        return plan.patterns if plan.may_match(line) else ()
+    
+    def _match_rule_tracked(self, level: str, pattern: str, line: str) -> Optional[re.Match]:
+        """匹配单条规则并记录尝试次数、命中次数和耗时（仅在开启规则性能统计时使用，跳过无效规则）"""
+        regex = compile_rule(pattern).regex
+        if regex is None:
+            return None
+        start = time.perf_counter_ns()
+        match = regex.match(line)
+        rule_profiler.record(level, pattern, match is not None, time.perf_counter_ns() - start)
+        if match is not None and rule_optimizer.enabled:
+            rule_optimizer.record_hit(level, pattern)
+        return match
+    
+    def _generate_title_html(self, line: str, level: str, snapshot: ConfigSnapshot) -> str:
         """
         生成标题HTML
         
         Args:
             line: 标题文本
             level: 标题级别
+            snapshot: 配置快照
             
         Returns:
             标题HTML
         """
-        format_info = user_config_manager.get_style_dict(level)
-        
-        span_style = (
-            f"mso-spacerun:'yes';"
-            f"mso-fareast-font-family:{format_info['font_family']};"
-            f"mso-ascii-font-family:{format_info['font_family']};"
-            f"mso-hansi-font-family:{format_info['font_family']};"
-            f"mso-bidi-font-family:{format_info['font_family']};"
-            f"font-size:{format_info['font_size']};"
-            f"mso-font-kerning:{format_info['font_kerning']};"
-        )
-        
-        if level == 'h3' and 'font_weight' in format_info:
-            span_style += f"font-weight:{format_info['font_weight']};"
+        # 样式片段在配置加载/保存时已预先生成（h3包含字重）
+        span_style = snapshot.get_style_fragment(level)
         
         content = self._wrap_numbers_with_western_font(line)
         return f'<{level}><span style="{span_style}">{content}</span></{level}>'
     
-    def _process_special_format(self, line: str) -> Optional[str]:
+    def _match_special_format(self, line: str, snapshot: ConfigSnapshot) -> Optional[TextBlock]:
         """
-        处理特殊格式段落（第一句到句号、开头到冒号）
+        识别特殊格式段落（第一句到句号、开头到冒号）
         
         Args:
             line: 文本行
+            snapshot: 配置快照
             
         Returns:
-            特殊格式HTML或None
-        """
-        # 获取特殊格式的正则表达式
-        special_patterns = user_config_manager.get_enabled_patterns('special_format')
-        
-        # 检查每个启用的特殊格式模式
-        for pattern in special_patterns:
-            match = re.match(pattern, line)
-            if match:
-                groups = match.groups()
-                if len(groups) == 2:
-                    # 普通格式：特殊部分 + 剩余文本
-                    special_part = groups[0]
-                    remaining_text = groups[1].strip() if groups[1] else ""
-                    return self._generate_special_format_html(special_part, remaining_text)
-                elif len(groups) == 3:
-                    # 括号格式：序号 + 标题 + 剩余文本
-                    number = groups[0]
-                    title = groups[1]
-                    remaining_text = groups[2].strip() if groups[2] else ""
-                    special_part = f"（{number}）{title}"
-                    return self._generate_special_format_html(special_part, remaining_text)
+            特殊格式文档块或None
+        """
+        # 第一条匹配的特殊格式规则及其捕获组
+        result = self._match_level('special_format', line, snapshot, SPECIAL_GROUP_COUNTS)
+        if result:
+            return self._special_block(result[1])
         
         return None
     
-    def _generate_special_format_html(self, special_part: str, remaining_text: str) -> str:
-        """生成特殊格式HTML"""
-        # 获取特殊格式样式配置
-        special_style_config = user_config_manager.get_style_dict('special_format')
-        normal_style_config = user_config_manager.get_style_dict('normal')
+    def _special_block(self, groups: Tuple[Optional[str], ...]) -> Optional[TextBlock]:
+        """
+        由特殊格式规则的捕获组生成文档块
         
+        Args:
+            groups: 捕获组（2组或3组）
+            
+        Returns:
+            特殊格式文档块；捕获组数量不符时返回None
+        """
+        if len(groups) == 2:
+            # 普通格式：特殊部分 + 剩余文本
+            special_part = groups[0]
+            remaining_text = groups[1].strip() if groups[1] else ""
+            return TextBlock('special_format', special_part, remaining_text)
+        elif len(groups) == 3:
+            # 括号格式：序号 + 标题 + 剩余文本
+            number = groups[0]
+            title = groups[1]
+            remaining_text = groups[2].strip() if groups[2] else ""
+            special_part = f"（{number}）{title}"
+            return TextBlock('special_format', special_part, remaining_text)
+        return None
+    
+    def _generate_special_format_html(self, special_part: str, remaining_text: str,
+                                      snapshot: ConfigSnapshot) -> str:
+        """生成特殊格式HTML"""
         # 构建特殊格式HTML
         html_content = '<p class="MsoNormal" style="text-align:justify;text-justify:inter-ideograph;">'
         
-        # 特殊部分样式
-        special_style = (
-            "mso-spacerun:'yes';"
-            f"mso-fareast-font-family:{special_style_config.get('font_family', '方正楷体_GBK')};"
-            f"mso-ascii-font-family:{special_style_config.get('font_family', '方正楷体_GBK')};"
-            f"mso-hansi-font-family:{special_style_config.get('font_family', '方正楷体_GBK')};"
-            f"mso-bidi-font-family:{special_style_config.get('font_family', '方正楷体_GBK')};"
-            f"font-size:{special_style_config.get('font_size', '16.0000pt')};"
-            f"mso-font-kerning:{special_style_config.get('font_kerning', '1.0000pt')};"
-            f"font-weight:{special_style_config.get('font_weight', 'bold')};"
-        )
+        # 特殊部分样式（包含字重）
+        special_style = snapshot.get_style_fragment('special_format')
         
         html_content += f'<span style="{special_style}">{self._wrap_numbers_with_western_font(special_part)}</span>'
         
         # 如果有剩余文本
         if remaining_text:
-            normal_style = (
-                "mso-spacerun:'yes';"
-                f"mso-fareast-font-family:{normal_style_config.get('font_family', '方正仿宋_GBK')};"
-                f"mso-ascii-font-family:{normal_style_config.get('font_family', '方正仿宋_GBK')};"
-                f"mso-hansi-font-family:{normal_style_config.get('font_family', '方正仿宋_GBK')};"
-                f"mso-bidi-font-family:{normal_style_config.get('font_family', '方正仿宋_GBK')};"
-                f"font-size:{normal_style_config.get('font_size', '16.0000pt')};"
-                f"mso-font-kerning:{normal_style_config.get('font_kerning', '1.0000pt')};"
-            )
+            normal_style = snapshot.get_style_fragment('normal')
             html_content += f'<span style="{normal_style}">{self._wrap_numbers_with_western_font(remaining_text)}</span>'
         
         html_content += '</p>'
@@ -265,28 +562,19 @@ class HTMLGenerator:
         
         return None
     
-    def _generate_normal_paragraph(self, line: str) -> str:
+    def _generate_normal_paragraph(self, line: str, snapshot: ConfigSnapshot) -> str:
         """
         生成普通正文段落HTML
         
         Args:
             line: 文本行
+            snapshot: 配置快照
             
         Returns:
             段落HTML
         """
-        # 获取正文样式配置
-        normal_config = user_config_manager.get_style_dict('normal')
-        
-        normal_style = (
-            "mso-spacerun:'yes';"
-            f"mso-fareast-font-family:{normal_config.get('font_family', '方正仿宋_GBK')};"
-            f"mso-ascii-font-family:{normal_config.get('font_family', '方正仿宋_GBK')};"
-            f"mso-hansi-font-family:{normal_config.get('font_family', '方正仿宋_GBK')};"
-            f"mso-bidi-font-family:{normal_config.get('font_family', '方正仿宋_GBK')};"
-            f"font-size:{normal_config.get('font_size', '16.0000pt')};"
-            f"mso-font-kerning:{normal_config.get('font_kerning', '1.0000pt')};"
-        )
+        # 获取正文样式片段
+        normal_style = snapshot.get_style_fragment('normal')
         
         content = self._wrap_numbers_with_western_font(line)
         return f'<p class="MsoNormal"><span style="{normal_style}">{content}</span></p>'
@@ -302,16 +590,59 @@ class HTMLGenerator:
         Returns:
             完整的预览HTML文档
         """
-        theme_key = "dark" if is_dark_theme else "light"
-        colors = self.theme_colors[theme_key]
-        
         html_template = f"""<!DOCTYPE html>
 <html>
 <head>
 <meta charset="UTF-8">
 <title>格式预览</title>
 <style>
-/* 简化样式，确保TextBrowser兼容性，支持暗色模式 */
+{self.generate_preview_stylesheet(is_dark_theme)}</style>
+</head>
+<body>
+{body_content}
+</body>
+</html>"""
+        return html_template
+    
+    def generate_preview_stylesheet(self, is_dark_theme: bool = False,
+                                    snapshot: Optional[ConfigSnapshot] = None) -> str:
+        """
+        生成预览使用的样式表（带主题颜色，各级别字号和字重来自样式配置）
+        
+        分批填充预览时设置为文档的默认样式表，之后插入的段落同样适用。
+        
+        Args:
+            is_dark_theme: 是否为深色主题
+            snapshot: 配置快照（默认使用当前快照）
+            
+        Returns:
+            CSS样式表
+        """
+        theme_key = "dark" if is_dark_theme else "light"
+        colors = self.theme_colors[theme_key]
+        if snapshot is None:
+            snapshot = user_config_manager.snapshot()
+        
+        return _base_preview_stylesheet(colors) + _level_preview_stylesheet(snapshot)
+    
+    def generate_wps_html(self, body_content: str) -> str:
+        """
+        生成用于复制到WPS的HTML（严格按照要求.md）
+        
+        Args:
+            body_content: HTML body内容
+            
+        Returns:
+            完整的WPS兼容HTML文档
+        """
+        prefix, suffix = _wps_html_frame()
+        with memory_profiler.stage('wps'):
+            return prefix + body_content + suffix
+
+
+def _base_preview_stylesheet(colors: Dict[str, str]) -> str:
+    """预览样式表中与样式配置无关的部分（布局和主题颜色）"""
+    return f"""/* 简化样式，确保TextBrowser兼容性，支持暗色模式 */
 body {{
     font-family: "Microsoft YaHei", "SimSun", serif;
     font-size: 14px;
@@ -348,7 +679,7 @@ h3 {{
 }}
 
 /* 正文段落 */
-p.MsoNormal {{
+p {{
     margin: 5px 0;
     text-indent: 2em;
     text-align: justify;
@@ -367,25 +698,36 @@ p.MsoNormal {{
     font-weight: normal;
     color: {colors['normal']};
 }}
-</style>
-</head>
-<body>
-{body_content}
-</body>
-</html>"""
-        return html_template
-    
-    def generate_wps_html(self, body_content: str) -> str:
-        """
-        生成用于复制到WPS的HTML（严格按照要求.md）
-        
-        Args:
-            body_content: HTML body内容
-            
-        Returns:
-            完整的WPS兼容HTML文档
-        """
-        html_template = f"""<html {HTML_NAMESPACE}>
+
+/* 数字使用西文字体 */
+.num {{
+    font-family: "Times New Roman";
+}}
+"""
+
+
+def _level_preview_stylesheet(snapshot: ConfigSnapshot) -> str:
+    """预览样式表中各级别的字号和字重（与WPS HTML中的内联样式一致）"""
+    styles = {}
+    for level in ('h1', 'h2', 'h3', 'special_format', 'normal'):
+        level_snapshot = snapshot.levels.get(level)
+        styles[level] = level_snapshot.style if level_snapshot is not None else StyleConfig()
+    return (
+        "\n/* 各级别字号和字重（来自样式配置） */\n"
+        f"h1 {{ font-size: {styles['h1'].font_size}; }}\n"
+        f"h2 {{ font-size: {styles['h2'].font_size}; }}\n"
+        f"h3 {{ font-size: {styles['h3'].font_size}; font-weight: {styles['h3'].font_weight}; }}\n"
+        f"p {{ font-size: {styles['normal'].font_size}; }}\n"
+        f".special-bold {{ font-size: {styles['special_format'].font_size}; "
+        f"font-weight: {styles['special_format'].font_weight}; }}\n"
+    )
+
+
+@lru_cache(maxsize=1)
+def _wps_html_frame() -> Tuple[str, str]:
+    """WPS兼容HTML文档中body内容前后的部分（只格式化一次）"""
+    body_content = _BODY_MARKER
+    html_template = f"""<html {HTML_NAMESPACE}>
 <head>
 <meta http-equiv="Content-Type" content="text/html; charset=utf-8">
 <meta name="ProgId" content="Word.Document">
@@ -505,4 +847,5 @@ div.Section0 {{
 <!--EndFragment-->
 </body>
 </html>"""
-        return html_template
+    prefix, suffix = html_template.split(_BODY_MARKER)
+    return prefix, suffix
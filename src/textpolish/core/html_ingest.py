@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+HTML导入模块 - 将剪贴板中的富文本（如Gemini网页版复制的内容）转换为带级别提示的纯文本
+
+基于标准库html.parser逐块解析，不构建DOM树，耗时与HTML大小成线性关系。
+标题标签直接给出段落级别，段首加粗的段落标记为特殊格式，其余段落仍按正则规则识别。
+列表和表格按复制为纯文本时的样子展开：有序列表项加上“N. ”编号，表格每行一段、单元格以制表符分隔，
+因此富文本粘贴与纯文本粘贴得到相同的段落。
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+from .blocks import LevelHint
+
+
+# 特殊格式段落中加粗部分与剩余正文之间的分隔符（私用区字符，不会出现在正常文本中，
+# 且不会被文本清理规则修改），在清理完成后由 resolve_level_hints 移除
+LEAD_SEPARATOR = '\ue000'
+
+# 标题标签 -> 段落级别（四级及以下标题按三级标题处理）
+HEADING_TAGS = {
+    'h1': 'h1',
+    'h2': 'h2',
+    'h3': 'h3',
+    'h4': 'h3',
+    'h5': 'h3',
+    'h6': 'h3',
+}
+
+# 块级标签：开始和结束时都会结束当前段落（表格单元格不在其中，同一行的单元格属于同一段落）
+BLOCK_TAGS = frozenset({
+    'p', 'div', 'li', 'ul', 'ol', 'table', 'tr', 'blockquote', 'pre',
+    'section', 'article', 'header', 'footer', 'dl', 'dt', 'dd', 'hr', 'body',
+    *HEADING_TAGS,
+})
+
+# 列表标签
+LIST_TAGS = frozenset({'ol', 'ul'})
+
+# 表格单元格标签
+CELL_TAGS = frozenset({'td', 'th'})
+
+# 加粗标签
+BOLD_TAGS = frozenset({'b', 'strong'})
+
+# 内容需要忽略的标签
+SKIP_TAGS = frozenset({'head', 'title', 'script', 'style', 'template', 'noscript'})
+
+# 每次送入解析器的字符数
+FEED_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class HTMLIngestor(HTMLParser):
+    """HTML导入解析器 - 按块级标签切分段落，并记录每个段落的级别提示"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines: List[str] = []
+        self.levels: List[Optional[str]] = []
+        self._parts: List[str] = []
+        self._level: Optional[str] = None
+        self._bold_depth = 0
+        self._skip_depth = 0
+        self._pre_depth = 0
+        # 正在解析的列表：[标签, 已出现的列表项数]；列表项编号在该项的第一段文字前加上
+        self._lists: List[list] = []
+        self._item_prefix = ''
+        # 当前表格行中已出现的单元格数
+        self._cell_count = 0
+        # 段首加粗：段落的第一段文字是否加粗，以及加粗结束时的位置
+        self._lead_open = False
+        self._lead_end: Optional[int] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == 'br':
+            self._flush()
+        elif tag in BLOCK_TAGS:
+            self._flush()
+            if tag in HEADING_TAGS:
+                self._level = HEADING_TAGS[tag]
+            elif tag == 'pre':
+                self._pre_depth += 1
+            elif tag in LIST_TAGS:
+                self._lists.append([tag, _list_start(attrs) - 1 if tag == 'ol' else 0])
+            elif tag == 'li':
+                self._start_item()
+            elif tag == 'tr':
+                self._cell_count = 0
+        elif tag in CELL_TAGS:
+            # 与复制为纯文本时相同，同一行的单元格以制表符分隔
+            if self._cell_count:
+                self._append('\t')
+            self._cell_count += 1
+        elif tag in BOLD_TAGS:
+            self._bold_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self._flush()
+            if tag == 'pre':
+                self._pre_depth = max(0, self._pre_depth - 1)
+            elif tag in LIST_TAGS and self._lists:
+                self._lists.pop()
+        elif tag in BOLD_TAGS:
+            self._bold_depth = max(0, self._bold_depth - 1)
+            if self._bold_depth == 0 and self._lead_open and self._lead_end is None:
+                self._lead_end = len(self._parts)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == 'br' or tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+
+        if self._pre_depth:
+            # 预格式文本保留换行
+            lines = data.split('\n')
+            for index, line in enumerate(lines):
+                if index:
+                    self._flush()
+                self._append(line)
+            return
+
+        self._append(_WHITESPACE.sub(' ', data))
+
+    def _start_item(self) -> None:
+        """开始一个列表项：有序列表记下编号（无序列表的项目符号在清理时会被删除，不再添加）"""
+        if not self._lists or self._lists[-1][0] != 'ol':
+            return
+        self._lists[-1][1] += 1
+        self._item_prefix = f"{self._lists[-1][1]}. "
+
+    def _append(self, text: str) -> None:
+        if not text:
+            return
+        if not self._parts and not text.strip():
+            return
+        if not self._parts:
+            # 段落的第一段文字，记录是否以加粗开头
+            self._lead_open = self._bold_depth > 0
+            if self._item_prefix:
+                self._parts.append(self._item_prefix)
+                self._item_prefix = ''
+        self._parts.append(text)
+
+    def _flush(self) -> None:
+        """结束当前段落"""
+        level = self._level
+        if self._lead_end is not None and level is None:
+            lead = ''.join(self._parts[:self._lead_end]).strip()
+            tail = ''.join(self._parts[self._lead_end:]).strip()
+            if lead and tail:
+                self._parts = [lead, LEAD_SEPARATOR, tail]
+                level = 'special_format'
+
+        line = ''.join(self._parts).strip()
+        if line:
+            self.lines.append(line)
+            self.levels.append(level)
+
+        self._parts = []
+        self._level = None
+        self._lead_open = False
+        self._lead_end = None
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _list_start(attrs) -> int:
+    """有序列表的起始编号（start属性，默认为1）"""
+    for name, value in attrs:
+        if name == 'start' and value:
+            try:
+                return int(value)
+            except ValueError:
+                break
+    return 1
+
+
+def ingest_html(html: str) -> Tuple[str, Tuple[Optional[str], ...]]:
+    """
+    将HTML转换为每段一行的纯文本，并给出每行的级别提示
+
+    Args:
+        html: HTML文本
+
+    Returns:
+        (纯文本, 级别提示)；级别提示与纯文本的行一一对应，未知级别为None。
+        特殊格式行中加粗部分与剩余正文之间以 LEAD_SEPARATOR 分隔
+    """
+    parser = HTMLIngestor()
+    for start in range(0, len(html), FEED_CHUNK_SIZE):
+        parser.feed(html[start:start + FEED_CHUNK_SIZE])
+    parser.close()
+    return '\n'.join(parser.lines), tuple(parser.levels)
+
+
+def resolve_level_hints(cleaned_text: str,
+                        levels: Tuple[Optional[str], ...]) -> Tuple[str, Optional[Tuple[Optional[LevelHint], ...]]]:
+    """
+    将导入时的级别与清理后的文本对齐，并移除分隔符
+
+    文本清理不会合并行，但可能清空只含项目符号的行；此时行数对不上，放弃级别提示，
+    全部按正则规则识别。
+
+    Args:
+        cleaned_text: 清理后的文本（仍包含 LEAD_SEPARATOR）
+        levels: ingest_html 返回的级别提示
+
+    Returns:
+        (移除分隔符后的文本, 与非空行一一对应的级别提示或None)
+    """
+    lines = [line for line in cleaned_text.split('\n') if line.strip()]
+    text = cleaned_text.replace(LEAD_SEPARATOR, '')
+    if len(lines) != len(levels):
+        return text, None
+
+    hints = []
+    for line, level in zip(lines, levels):
+        if level is None:
+            hints.append(None)
+        elif level == 'special_format':
+            lead_length = len(line.strip().partition(LEAD_SEPARATOR)[0])
+            hints.append(LevelHint(level, lead_length) if lead_length else None)
+        else:
+            hints.append(LevelHint(level))
+    return text, tuple(hints)
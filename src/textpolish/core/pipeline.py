@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+处理流水线模块 - 串联文本清理、HTML转换和WPS文档生成
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple, Union
+
+from ..config import ConfigSnapshot, user_config_manager
+from .blocks import pack_blocks, pack_level_hints, unpack_blocks, unpack_level_hints
+from .text_processor import TextProcessor, normalize_input, strip_lines
+from .html_generator import HTMLGenerator
+from .html_ingest import ingest_html, resolve_level_hints
+from .result_cache import ResultCache
+from .rule_profiler import rule_profiler
+from ..utils.memory_profiler import memory_profiler
+
+
+# 预热用的样例文本，覆盖各级标题、特殊格式和普通正文
+WARM_UP_SAMPLE = """第一章 项目背景
+第一节 发展现状
+一、基本情况
+（一）政策支持。国家出台了相关政策, 支持产业发展.
+一是产业规模不断扩大。截至2024年底, 产业规模达到1,234.5亿元。
+技术创新能力：企业加大研发投入。
+· 普通正文段落, 包含"引号"和(括号)。"""
+
+# 无界面模式（命令行、本地服务）支持的输出格式
+OUTPUT_FORMATS = ('clean', 'html', 'wps')
+
+
+@dataclass
+class PolishResult:
+    """
+    一次完整处理的结果
+
+    处理只做到识别段落级别为止；HTML body和WPS兼容HTML在第一次读取时才由段落块生成，
+    界面预览使用单独的精简HTML，只有格式复制时才需要生成WPS格式。
+    """
+    cleaned_text: str
+    # 识别级别后的段落块（预览、导出DOCX、保存处理历史直接使用，无需重新识别）
+    blocks: Tuple = ()
+    # 富文本导入时与清理后文本非空行对应的级别提示
+    level_hints: Optional[Tuple] = None
+    # 识别使用的配置快照（生成HTML时使用同一份样式）
+    snapshot: Optional[ConfigSnapshot] = None
+    html_generator: Optional[HTMLGenerator] = field(default=None, repr=False, compare=False)
+    _body_html: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def body_html(self) -> str:
+        """HTML body（第一次读取时生成）"""
+        if self._body_html is None:
+            generator = self.html_generator or HTMLGenerator()
+            self._body_html = generator.render_blocks(self.blocks, self.snapshot) if self.blocks else ""
+        return self._body_html
+
+    @property
+    def wps_html(self) -> str:
+        """WPS兼容HTML文档"""
+        return (self.html_generator or HTMLGenerator()).generate_wps_html(self.body_html)
+
+
+class PolishPipeline:
+    """处理流水线 - 复用同一组处理器完成从原始文本到WPS HTML的全部步骤"""
+
+    def __init__(self, result_cache: Optional[ResultCache] = None):
+        """
+        初始化处理流水线
+
+        Args:
+            result_cache: 处理结果缓存（None表示不使用缓存）
+        """
+        self.text_processor = TextProcessor()
+        self.html_generator = HTMLGenerator()
+        self.result_cache = result_cache
+        self.is_warm = False
+
+    def warm_up(self) -> None:
+        """
+        预热流水线
+
+        用样例文本完整运行一次，提前加载用户配置并编译所有正则表达式，
+        使第一次真正的处理不再承担这些开销。
+        """
+        if self.is_warm:
+            return
+        # 绕过结果缓存，确保真正执行一次处理（同时生成各种HTML）
+        result = self._polish_text(WARM_UP_SAMPLE, (True, True, True, True), None)
+        self.html_generator.generate_wps_html(result.body_html)
+        self.html_generator.render_preview_blocks(result.blocks)
+        self.is_warm = True
+
+    def polish(self, text: str, enable_h1: bool = True, enable_h2: bool = True,
+               enable_h3: bool = True, enable_special: bool = True,
+               snapshot: Optional[ConfigSnapshot] = None) -> PolishResult:
+        """
+        完整处理一段文本
+
+        Args:
+            text: 原始输入文本（先统一换行符并去除首尾空白，见 normalize_input）
+            enable_h1: 是否启用一级标题格式
+            enable_h2: 是否启用二级标题格式
+            enable_h3: 是否启用三级标题格式
+            enable_special: 是否启用特殊格式识别
+            snapshot: 配置快照（默认使用调用时的当前快照，可在后台线程中安全使用）
+
+        Returns:
+            处理结果（清理后文本、段落块，HTML在读取时生成）
+        """
+        enables = (enable_h1, enable_h2, enable_h3, enable_special)
+        return self._polish_cached('text', normalize_input(text), enables, snapshot, self._polish_text)
+
+    def _polish_text(self, text: str, enables: Tuple[bool, ...],
+                     snapshot: Optional[ConfigSnapshot]) -> PolishResult:
+        """完整处理一段文本（不使用缓存）"""
+        if snapshot is None:
+            snapshot = user_config_manager.snapshot()
+        cleaned_text = self.text_processor.clean_text(text)
+        blocks = self.html_generator.classify(cleaned_text, *enables, snapshot)
+        return PolishResult(cleaned_text=cleaned_text, blocks=blocks, snapshot=snapshot,
+                            html_generator=self.html_generator)
+
+    def polish_lines(self, lines: Iterable[str], enable_h1: bool = True, enable_h2: bool = True,
+                     enable_h3: bool = True, enable_special: bool = True,
+                     snapshot: Optional[ConfigSnapshot] = None) -> PolishResult:
+        """
+        逐行读取输入并完整处理（结果与 polish('\n'.join(lines)) 相同）
+        
+        输入不需要先拼接成完整文本：清理按分片进行（见 TextProcessor.clean_lines），
+        适合直接遍历编辑器文档中的段落。已去除首尾空白的行（如 DocumentLines）与
+        polish() 处理同一篇文本时使用相同的缓存键。
+
+        Args:
+            lines: 文本行（不含换行符，首尾的空白会被去除）；使用结果缓存时需要可以重复遍历，
+                   先遍历一次计算缓存键，未命中时再遍历一次进行处理
+            enable_h1: 是否启用一级标题格式
+            enable_h2: 是否启用二级标题格式
+            enable_h3: 是否启用三级标题格式
+            enable_special: 是否启用特殊格式识别
+            snapshot: 配置快照（默认使用调用时的当前快照）
+
+        Returns:
+            处理结果
+        """
+        enables = (enable_h1, enable_h2, enable_h3, enable_special)
+        if iter(lines) is lines:
+            # 只能遍历一次的迭代器无法先计算缓存键，直接处理
+            return self._polish_lines(lines, enables, snapshot)
+        return self._polish_cached('text', lines, enables, snapshot, self._polish_lines)
+
+    def _polish_lines(self, lines: Iterable[str], enables: Tuple[bool, ...],
+                      snapshot: Optional[ConfigSnapshot]) -> PolishResult:
+        """逐行完整处理（不使用缓存）"""
+        if snapshot is None:
+            snapshot = user_config_manager.snapshot()
+        cleaned_text = '\n'.join(self.text_processor.clean_lines(strip_lines(lines)))
+        blocks = self.html_generator.classify(cleaned_text, *enables, snapshot)
+        return PolishResult(cleaned_text=cleaned_text, blocks=blocks, snapshot=snapshot,
+                            html_generator=self.html_generator)
+
+    def polish_html(self, html: str, enable_h1: bool = True, enable_h2: bool = True,
+                    enable_h3: bool = True, enable_special: bool = True,
+                    snapshot: Optional[ConfigSnapshot] = None) -> PolishResult:
+        """
+        完整处理一段富文本（HTML）
+
+        HTML中的标题和段首加粗直接决定段落级别，这些段落不再进行正则匹配。
+
+        Args:
+            html: 剪贴板中的HTML
+            enable_h1: 是否启用一级标题格式
+            enable_h2: 是否启用二级标题格式
+            enable_h3: 是否启用三级标题格式
+            enable_special: 是否启用特殊格式识别
+            snapshot: 配置快照（默认使用调用时的当前快照）
+
+        Returns:
+            处理结果（包含级别提示）
+        """
+        enables = (enable_h1, enable_h2, enable_h3, enable_special)
+        return self._polish_cached('html', html, enables, snapshot, self._polish_html)
+
+    def _polish_html(self, html: str, enables: Tuple[bool, ...],
+                     snapshot: Optional[ConfigSnapshot]) -> PolishResult:
+        """完整处理一段富文本（不使用缓存）"""
+        if snapshot is None:
+            snapshot = user_config_manager.snapshot()
+        raw_text, levels = ingest_html(html)
+        cleaned_text, level_hints = resolve_level_hints(
+            self.text_processor.clean_text(raw_text), levels
+        )
+        blocks = self.html_generator.classify(cleaned_text, *enables, snapshot, level_hints)
+        return PolishResult(cleaned_text=cleaned_text, blocks=blocks, level_hints=level_hints,
+                            snapshot=snapshot, html_generator=self.html_generator)
+
+    def _polish_cached(self, mode: str, source: Union[str, Iterable[str]], enables: Tuple[bool, ...],
+                       snapshot: Optional[ConfigSnapshot],
+                       polish: Callable[[Any, Tuple[bool, ...], Optional[ConfigSnapshot]], PolishResult]) -> PolishResult:
+        """
+        先查结果缓存，未命中时处理并写入缓存
+
+        缓存中保存清理后文本、段落块和级别提示（识别级别是处理中最耗时的部分），HTML读取时再由段落块生成。
+        段落块和级别提示按内置类型的元组保存，以 src.textpolish 或 textpolish 导入时读写同一条缓存。
+        开启规则性能统计时不使用缓存，保证每次处理都计入统计。
+        """
+        if snapshot is None:
+            snapshot = user_config_manager.snapshot()
+
+        def compute(resolved: ConfigSnapshot) -> Tuple:
+            result = polish(source, enables, resolved)
+            return result.cleaned_text, pack_blocks(result.blocks), pack_level_hints(result.level_hints)
+
+        cached = self._lookup(mode, source, enables, snapshot, compute)
+        if cached is None:
+            return polish(source, enables, snapshot)
+        cleaned_text, blocks, level_hints = cached
+        return PolishResult(cleaned_text=cleaned_text, blocks=unpack_blocks(blocks),
+                            level_hints=unpack_level_hints(level_hints),
+                            snapshot=snapshot, html_generator=self.html_generator)
+
+    def _lookup(self, mode: str, source: Union[str, Iterable[str]], options: Tuple[bool, ...], snapshot: Optional[ConfigSnapshot],
+                compute: Callable[[ConfigSnapshot], Any]) -> Optional[Any]:
+        """
+        按缓存键读取结果，未命中时调用compute计算并写入
+
+        Returns:
+            结果；不使用缓存时返回None（由调用方直接处理）
+        """
+        cache = self.result_cache
+        # 统计规则或分析内存时每次都完整处理
+        if cache is None or not cache.enabled or rule_profiler.enabled or memory_profiler.enabled:
+            return None
+        if snapshot is None:
+            snapshot = user_config_manager.snapshot()
+        key = cache.make_key(mode, source, snapshot, options)
+        value = cache.get(key)
+        if value is None:
+            value = compute(snapshot)
+            cache.put(key, value)
+        return value
+
+    def convert(self, text: str, output_format: str = 'wps', enable_h1: bool = True,
+                enable_h2: bool = True, enable_h3: bool = True, enable_special: bool = True,
+                snapshot: Optional[ConfigSnapshot] = None, is_html: bool = False) -> str:
+        """
+        按指定格式输出处理结果（供命令行和本地服务使用）
+
+        Args:
+            text: 原始输入文本或HTML
+            output_format: 输出格式（'clean' 清理后文本、'html' HTML body、'wps' WPS兼容HTML）
+            enable_h1: 是否启用一级标题格式
+            enable_h2: 是否启用二级标题格式
+            enable_h3: 是否启用三级标题格式
+            enable_special: 是否启用特殊格式识别
+            snapshot: 配置快照（默认使用调用时的当前快照）
+            is_html: 输入是否为HTML
+
+        Returns:
+            指定格式的结果
+
+        Raises:
+            ValueError: 不支持的输出格式
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"不支持的输出格式: {output_format}")
+
+        if output_format == 'clean' and not is_html:
+            text = normalize_input(text)
+            cleaned = self._lookup('clean', text, (), snapshot, lambda _snapshot: self.text_processor.clean_text(text))
+            return cleaned if cleaned is not None else self.text_processor.clean_text(text)
+
+        polish = self.polish_html if is_html else self.polish
+        result = polish(text, enable_h1, enable_h2, enable_h3, enable_special, snapshot)
+        if output_format == 'clean':
+            return result.cleaned_text
+        if output_format == 'html':
+            return result.body_html
+        return result.wps_html
+
+    def clean_many(self, texts: Iterable[str]) -> Iterator[str]:
+        """
+        逐篇清理多篇文档（按需生成结果）
+
+        Args:
+            texts: 原始输入文本
+
+        Returns:
+            与输入顺序一致的清理结果迭代器
+        """
+        clean_text = self.text_processor.clean_text
+        return (clean_text(text) for text in texts)
+
+    def convert_many(self, texts: Iterable[str], output_format: str = 'wps', enable_h1: bool = True,
+                     enable_h2: bool = True, enable_h3: bool = True, enable_special: bool = True,
+                     snapshot: Optional[ConfigSnapshot] = None, is_html: bool = False) -> Iterator[str]:
+        """
+        用同一份配置快照逐篇处理多篇文档（按需生成结果）
+
+        快照在调用时取一次；各级别的合并匹配器、行级别识别函数和WPS文档框架在处理第一篇时准备好，
+        之后的文档直接复用，适合批量转换大量短文本。
+
+        Args:
+            texts: 原始输入文本或HTML
+            output_format: 输出格式（'clean'、'html' 或 'wps'）
+            enable_h1: 是否启用一级标题格式
+            enable_h2: 是否启用二级标题格式
+            enable_h3: 是否启用三级标题格式
+            enable_special: 是否启用特殊格式识别
+            snapshot: 配置快照（默认使用调用时的当前快照）
+            is_html: 输入是否为HTML
+
+        Returns:
+            与输入顺序一致的结果迭代器
+
+        Raises:
+            ValueError: 不支持的输出格式（调用时立即检查）
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"不支持的输出格式: {output_format}")
+        if snapshot is None:
+            snapshot = user_config_manager.snapshot()
+        return (
+            self.convert(text, output_format, enable_h1, enable_h2, enable_h3, enable_special, snapshot, is_html)
+            for text in texts
+        )
+
+
+def clean_many(texts: Iterable[str]) -> Iterator[str]:
+    """
+    逐篇清理多篇文档（见 PolishPipeline.clean_many）
+
+    Args:
+        texts: 原始输入文本
+
+    Returns:
+        清理结果迭代器
+    """
+    return PolishPipeline().clean_many(texts)
+
+
+def convert_many(texts: Iterable[str], output_format: str = 'wps', enable_h1: bool = True,
+                 enable_h2: bool = True, enable_h3: bool = True, enable_special: bool = True,
+                 snapshot: Optional[ConfigSnapshot] = None, is_html: bool = False) -> Iterator[str]:
+    """
+    用同一份配置快照逐篇处理多篇文档（见 PolishPipeline.convert_many）
+
+    Args:
+        texts: 原始输入文本或HTML
+        output_format: 输出格式（'clean'、'html' 或 'wps'）
+        enable_h1: 是否启用一级标题格式
+        enable_h2: 是否启用二级标题格式
+        enable_h3: 是否启用三级标题格式
+        enable_special: 是否启用特殊格式识别
+        snapshot: 配置快照（默认使用调用时的当前快照）
+        is_html: 输入是否为HTML
+
+    Returns:
+        结果迭代器
+    """
+    return PolishPipeline().convert_many(texts, output_format, enable_h1, enable_h2, enable_h3,
+                                         enable_special, snapshot, is_html)
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+处理结果缓存模块 - 把处理结果保存在本地SQLite数据库中，再次处理相同文档时直接读取
+
+缓存键由 处理方式 + 启用的级别 + 配置指纹 + 文档内容哈希 组成：规则、样式或程序版本变化后
+配置指纹随之变化，旧结果自然不再命中。数据库超过大小上限时按最近使用时间淘汰。
+
+界面和命令行共用同一个数据库（位于本地缓存目录），多个进程可以同时读写。
+缓存出错时只在控制台提示一次，处理照常进行。
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from ..config import (
+    APP_VERSION, PUNCTUATION_MAP, RESULT_CACHE_EVICT_RATIO, RESULT_CACHE_FILENAME,
+    RESULT_CACHE_MAX_BYTES, ConfigSnapshot, get_cache_dir
+)
+from ..utils.metrics import metrics
+
+
+# 缓存格式版本（处理逻辑或缓存内容的结构变化时递增，使旧结果全部失效）
+RESULT_CACHE_FORMAT_VERSION = 4
+
+# 等待其他进程释放数据库锁的时间（秒）
+RESULT_CACHE_LOCK_TIMEOUT = 5
+
+
+def snapshot_fingerprint(snapshot: ConfigSnapshot) -> str:
+    """
+    计算配置指纹（与快照版本号无关，只取决于配置内容和程序版本）
+
+    Args:
+        snapshot: 配置快照
+
+    Returns:
+        十六进制摘要
+    """
+    content = repr((
+        APP_VERSION, RESULT_CACHE_FORMAT_VERSION, sorted(PUNCTUATION_MAP.items()),
+        sorted(snapshot.levels.items()),
+    ))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """处理结果缓存 - 首次使用时才打开数据库"""
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        """
+        初始化结果缓存
+
+        Args:
+            path: 数据库文件路径（默认位于本地缓存目录）
+            max_bytes: 缓存内容大小上限（字节）
+        """
+        self.path = path or os.path.join(get_cache_dir(), RESULT_CACHE_FILENAME)
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self._connection: Optional[sqlite3.Connection] = None
+        self._failed = False
+        self._lock = threading.Lock()
+        # 估算的内容总大小（超过上限时才查询准确值并淘汰）
+        self._approx_bytes = 0
+        # 最近一次计算指纹的快照及其指纹
+        self._fingerprint: Optional[Tuple[ConfigSnapshot, str]] = None
+
+    def set_enabled(self, enabled: bool) -> None:
+        """开启或关闭缓存（关闭时不读也不写，已有内容保留）"""
+        self.enabled = enabled
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """打开数据库（失败后不再重试）"""
+        if self._connection is not None or self._failed:
+            return self._connection
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=RESULT_CACHE_LOCK_TIMEOUT,
+                                         check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+            self._approx_bytes = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            self._connection = connection
+        except sqlite3.Error as e:
+            self._fail(e)
+        return self._connection
+
+    def _fail(self, error: Exception) -> None:
+        """缓存出错：提示一次并停用，不影响处理"""
+        if not self._failed:
+            print(f"处理结果缓存不可用，已停用: {error}")
+        self._failed = True
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def make_key(self, mode: str, source: Union[str, Iterable[str]], snapshot: ConfigSnapshot,
+                 options: Tuple) -> str:
+        """
+        生成缓存键
+
+        Args:
+            mode: 处理方式（如 'text'、'html'、'clean'）
+            source: 输入文本或HTML；也可以是文本行，与以换行连接后的文本生成相同的键
+            snapshot: 处理使用的配置快照
+            options: 影响结果的其他选项（如各级别是否启用）
+
+        Returns:
+            缓存键
+        """
+        cached = self._fingerprint
+        if cached is None or cached[0] is not snapshot:
+            cached = self._fingerprint = (snapshot, snapshot_fingerprint(snapshot))
+        if isinstance(source, str):
+            digest = hashlib.sha256(source.encode('utf-8', 'surrogatepass')).hexdigest()
+        else:
+            hasher = hashlib.sha256()
+            separator = b''
+            for line in source:
+                hasher.update(separator)
+                hasher.update(line.encode('utf-8', 'surrogatepass'))
+                separator = b'\n'
+            digest = hasher.hexdigest()
+        flags = ''.join('1' if option else '0' for option in options)
+        return f"{mode}:{flags}:{cached[1]}:{digest}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        读取缓存结果（同时更新最近使用时间）
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存的结果；未命中或出错时返回None
+        """
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return None
+            try:
+                row = connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+            except sqlite3.Error as e:
+                self._fail(e)
+                return None
+        if row is None:
+            metrics.counter('cache_misses_total', '缓存未命中次数').inc(cache='result')
+            return None
+        try:
+            value = pickle.loads(row[0])
+        except Exception:
+            # 内容损坏时视为未命中，之后写入的结果会覆盖它
+            metrics.counter('cache_misses_total', '缓存未命中次数').inc(cache='result')
+            return None
+        metrics.counter('cache_hits_total', '缓存命中次数').inc(cache='result')
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        写入缓存结果，超过大小上限时淘汰最久未使用的结果
+
+        Args:
+            key: 缓存键
+            value: 结果（只应包含内置类型：自定义类按导入路径保存，换一种方式导入后无法读取）
+        """
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        size = len(data) + len(key)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                    (key, data, size, time.time())
+                )
+                self._approx_bytes += size
+                if self._approx_bytes > self.max_bytes:
+                    self._evict(connection)
+            except sqlite3.Error as e:
+                self._fail(e)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """按最近使用时间淘汰，直到总大小降到上限的 RESULT_CACHE_EVICT_RATIO 以下"""
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total > self.max_bytes:
+            target = self.max_bytes * RESULT_CACHE_EVICT_RATIO
+            removed = []
+            for key, size in connection.execute("SELECT key, size FROM results ORDER BY accessed"):
+                if total <= target:
+                    break
+                removed.append((key,))
+                total -= size
+            connection.executemany("DELETE FROM results WHERE key = ?", removed)
+            metrics.counter('cache_evictions_total', '缓存淘汰的条目数').inc(len(removed), cache='result')
+        self._approx_bytes = total
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return
+            try:
+                connection.execute("DELETE FROM results")
+                connection.execute("VACUUM")
+                self._approx_bytes = 0
+            except sqlite3.Error as e:
+                self._fail(e)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        缓存统计
+
+        Returns:
+            {'entries': 条目数, 'bytes': 内容总大小}
+        """
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return {'entries': 0, 'bytes': 0}
+            try:
+                entries, total = connection.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+                ).fetchone()
+            except sqlite3.Error as e:
+                self._fail(e)
+                return {'entries': 0, 'bytes': 0}
+        return {'entries': entries, 'bytes': total}
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+# 全局结果缓存（界面和命令行共用）
+result_cache = ResultCache()
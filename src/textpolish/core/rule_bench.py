@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+规则测试模块 - 用样本文本逐条测试规则，统计命中行和匹配耗时，并检测耗时随行长超线性增长的规则
+
+测试在设置页面的后台线程中运行，只读取配置快照，不修改任何状态。
+"""
+
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ..config import RULE_BENCH_DEFAULT_SAMPLE, ConfigSnapshot, user_config_manager
+from .rule_validator import SPECIAL_GROUP_COUNTS, compile_rule, validate_rule
+from .text_processor import TextProcessor
+
+
+# 参与测试的级别（按识别顺序）
+BENCH_LEVELS = ('h1', 'h2', 'h3', 'special_format')
+
+# 样本文本文件名（保存在配置目录中）
+SAMPLE_FILENAME = 'rule_bench_sample.txt'
+
+# 增长测试：探测行的起始长度、增长倍数和最大长度
+PROBE_START_LENGTH = 8
+PROBE_GROWTH = 1.5
+PROBE_MAX_LENGTH = 8192
+
+# 每个长度至少累计测量的时间（纳秒），时间过短时重复匹配以降低误差
+PROBE_MIN_SAMPLE_NS = 200_000
+
+# 单次匹配超过该耗时（纳秒）即停止加长，视为超线性
+PROBE_BUDGET_NS = 20_000_000
+
+# 低于该耗时（纳秒）的测量值主要是调用开销，不参与增长指数拟合
+PROBE_NOISE_FLOOR_NS = 1_000
+
+# 耗时与行长的幂次超过该值视为超线性
+SUPERLINEAR_EXPONENT = 1.5
+
+
+@dataclass(slots=True)
+class RuleBenchResult:
+    """单条规则的测试结果"""
+    level: str
+    name: str
+    pattern: str
+    matched_lines: List[int] = field(default_factory=list)
+    total_ns: int = 0
+    error: Optional[str] = None
+    growth_exponent: Optional[float] = None
+    superlinear: bool = False
+
+    @property
+    def total_ms(self) -> float:
+        """在全部样本行上的累计匹配耗时（毫秒）"""
+        return self.total_ns / 1_000_000
+
+
+@dataclass(slots=True)
+class RuleBenchReport:
+    """
+    测试报告
+
+    Attributes:
+        lines: 清理后的样本行（不含空行）
+        line_levels: 每行最终识别的级别
+        line_rules: 每行由哪条规则决定（规则在 rules 中的下标，正文为None）
+        rules: 各规则的测试结果（按级别和配置顺序排列）
+        elapsed_ms: 测试总耗时（毫秒）
+    """
+    lines: List[str]
+    line_levels: List[str]
+    line_rules: List[Optional[int]]
+    rules: List[RuleBenchResult]
+    elapsed_ms: float = 0.0
+
+
+def get_sample_path() -> str:
+    """获取样本文本文件路径（与用户配置文件位于同一目录）"""
+    config_dir = os.path.dirname(user_config_manager.settings.fileName())
+    return os.path.join(config_dir, SAMPLE_FILENAME)
+
+
+def load_sample() -> str:
+    """读取保存的样本文本，尚未保存时返回默认样本"""
+    try:
+        with open(get_sample_path(), 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return RULE_BENCH_DEFAULT_SAMPLE
+
+
+def save_sample(text: str) -> None:
+    """保存样本文本"""
+    path = get_sample_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def _time_match(regex, line: str) -> int:
+    """测量单次匹配的平均耗时（纳秒），耗时很短时重复多次"""
+    repeats = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(repeats):
+            regex.match(line)
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= PROBE_MIN_SAMPLE_NS or elapsed >= PROBE_BUDGET_NS:
+            return elapsed // repeats
+        repeats *= 4
+
+
+def measure_growth(regex, seed: str) -> Tuple[Optional[float], bool]:
+    """
+    测量匹配耗时随行长的增长情况
+
+    将种子文本重复拼接为逐渐加长的行，测量每个长度的匹配耗时，用对数坐标下的最小二乘拟合
+    估计耗时与行长的幂次。单次匹配超过 PROBE_BUDGET_NS 时立即停止（避免灾难性回溯卡住线程）。
+
+    Args:
+        regex: 编译后的正则表达式
+        seed: 种子文本
+
+    Returns:
+        (增长指数（有效测量点不足时为None）, 是否超线性)
+    """
+    if not seed:
+        return None, False
+
+    points = []
+    length = PROBE_START_LENGTH
+    while length <= PROBE_MAX_LENGTH:
+        line = (seed * (length // len(seed) + 1))[:length]
+        elapsed = _time_match(regex, line)
+        if elapsed >= PROBE_NOISE_FLOOR_NS:
+            points.append((math.log(length), math.log(elapsed)))
+        if elapsed >= PROBE_BUDGET_NS:
+            exponent = _fit_exponent(points)
+            return exponent, True
+        length = max(length + 1, int(length * PROBE_GROWTH))
+
+    exponent = _fit_exponent(points)
+    return exponent, exponent is not None and exponent > SUPERLINEAR_EXPONENT
+
+
+def _fit_exponent(points: List[Tuple[float, float]]) -> Optional[float]:
+    """最小二乘拟合 log(耗时) = k * log(行长) + b，返回k"""
+    if len(points) < 3:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    if not denominator:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+
+
+def run_rule_bench(sample: str, snapshot: Optional[ConfigSnapshot] = None,
+                   check_growth: bool = True) -> RuleBenchReport:
+    """
+    用样本文本测试当前规则
+
+    每条启用的规则都在全部样本行上单独匹配一次（不受前面规则是否命中的影响），
+    再按识别顺序得出每行最终的级别和决定该级别的规则。
+
+    Args:
+        sample: 样本文本（与正常处理一样先经过文本清理）
+        snapshot: 配置快照（默认使用当前快照）
+        check_growth: 是否检测超线性增长
+
+    Returns:
+        测试报告
+    """
+    start = time.perf_counter()
+    if snapshot is None:
+        snapshot = user_config_manager.snapshot()
+
+    cleaned = TextProcessor().clean_text(sample)
+    lines = [line.strip() for line in cleaned.split('\n') if line.strip()]
+    longest = max(lines, key=len, default='')
+
+    rules: List[RuleBenchResult] = []
+    for level in BENCH_LEVELS:
+        level_snapshot = snapshot.get_level(level)
+        if level_snapshot is None:
+            continue
+        for pattern in level_snapshot.patterns:
+            if not pattern.enabled or not pattern.pattern:
+                continue
+            result = RuleBenchResult(level, pattern.name, pattern.pattern)
+            result.error = validate_rule(level, pattern.pattern)
+            regex = compile_rule(pattern.pattern).regex
+            if regex is not None:
+                _match_lines(regex, lines, result)
+                if check_growth:
+                    _check_growth(regex, lines, longest, result)
+            rules.append(result)
+
+    line_levels, line_rules = _resolve_levels(lines, rules)
+    return RuleBenchReport(lines, line_levels, line_rules, rules,
+                           (time.perf_counter() - start) * 1000)
+
+
+def _match_lines(regex, lines: List[str], result: RuleBenchResult) -> None:
+    """在全部样本行上匹配规则，记录命中行和累计耗时"""
+    total = 0
+    for index, line in enumerate(lines):
+        begin = time.perf_counter_ns()
+        match = regex.match(line)
+        total += time.perf_counter_ns() - begin
+        if match is not None:
+            result.matched_lines.append(index)
+    result.total_ns = total
+
+
+def _check_growth(regex, lines: List[str], longest: str, result: RuleBenchResult) -> None:
+    """分别以最长样本行和规则命中的第一行为种子检测增长，取较大的增长指数"""
+    seeds = [longest]
+    if result.matched_lines and lines[result.matched_lines[0]] != longest:
+        seeds.append(lines[result.matched_lines[0]])
+
+    for seed in seeds:
+        exponent, superlinear = measure_growth(regex, seed)
+        if exponent is not None and (result.growth_exponent is None or exponent > result.growth_exponent):
+            result.growth_exponent = exponent
+        result.superlinear = result.superlinear or superlinear
+
+
+def _resolve_levels(lines: List[str], rules: List[RuleBenchResult]) -> Tuple[List[str], List[Optional[int]]]:
+    """按识别顺序（级别顺序、同级别内配置顺序）得出每行的级别和决定该级别的规则"""
+    line_levels = ['normal'] * len(lines)
+    line_rules: List[Optional[int]] = [None] * len(lines)
+    for rule_index, result in enumerate(rules):
+        if result.level == 'special_format':
+            regex = compile_rule(result.pattern).regex
+            if regex is None or regex.groups not in SPECIAL_GROUP_COUNTS:
+                continue
+        for line_index in result.matched_lines:
+            if line_rules[line_index] is None:
+                line_levels[line_index] = result.level
+                line_rules[line_index] = rule_index
+    return line_levels, line_rules
+
+
+def summarize_report(report: RuleBenchReport) -> Dict[str, int]:
+    """统计每个级别最终识别的行数"""
+    counts: Dict[str, int] = {}
+    for level in report.line_levels:
+        counts[level] = counts.get(level, 0) + 1
+    return counts
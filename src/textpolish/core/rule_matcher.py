@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+规则合并匹配模块 - 将同一级别启用的正则表达式合并为一个带命名分组的分支表达式
+
+合并后一次 match 即可判断该级别是否匹配以及命中的是哪条规则，不必在Python循环中逐条匹配。
+分支表达式从左到右尝试各个分支、取第一个成功的分支，与按顺序逐条 re.match 的结果一致。
+
+无法安全合并的规则（含反向引用、命名分组、条件分组或全局内联标志）单独匹配，
+其前后的规则分段合并，整体顺序不变。
+"""
+
+import re
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Tuple
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # Python 3.10 及以下
+    import sre_parse
+    import sre_constants
+
+from ..utils.metrics import metrics
+from .rule_validator import compile_rule
+
+
+# 合并表达式中每条规则外层分组的名称前缀
+RULE_GROUP_PREFIX = '_rule'
+
+# 缓存的合并匹配器数量（规则顺序优化会产生不同的规则排列）
+MATCHER_CACHE_SIZE = 64
+
+# 不含内联标志时 re.compile 的默认标志
+_DEFAULT_FLAGS = re.compile('').flags
+
+_GROUP_REFERENCE_OPS = (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS)
+
+
+def _has_group_reference(node) -> bool:
+    """检查解析树中是否有反向引用或条件分组（合并后分组编号会改变）"""
+    if isinstance(node, sre_parse.SubPattern):
+        return any(op in _GROUP_REFERENCE_OPS or _has_group_reference(av) for op, av in node)
+    if isinstance(node, (list, tuple)):
+        return any(_has_group_reference(value) for value in node)
+    return False
+
+
+def can_combine(pattern: str, compiled: re.Pattern) -> bool:
+    """
+    判断规则能否并入合并表达式
+
+    Args:
+        pattern: 正则表达式
+        compiled: 单独编译的结果
+
+    Returns:
+        不含命名分组、反向引用、条件分组和全局内联标志时返回True
+    """
+    if compiled.groupindex or compiled.flags != _DEFAULT_FLAGS:
+        return False
+    return not _has_group_reference(sre_parse.parse(pattern))
+
+
+class _Segment:
+    """一段连续的规则：可合并的规则编译为一个分支表达式，不可合并的规则单独编译"""
+
+    __slots__ = ('regex', 'rules')
+
+    def __init__(self, regex: re.Pattern, rules: Tuple[Tuple[str, int, int], ...]):
+        self.regex = regex
+        # 按分组名称序号排列：(正则表达式, 该规则第一个捕获组在合并表达式中的编号, 捕获组数量)
+        self.rules = rules
+
+
+class RuleMatcher:
+    """规则合并匹配器 - 按配置顺序匹配一个级别的全部规则"""
+
+    def __init__(self, patterns: Tuple[str, ...], group_counts: Optional[FrozenSet[int]] = None):
+        """
+        编译规则
+
+        Args:
+            patterns: 按匹配顺序排列的正则表达式
+            group_counts: 可用的捕获组数量；其他数量的规则匹配结果无法使用，直接排除
+                （与逐条匹配时跳过这些规则等价），None表示不限
+
+        无法编译的规则被跳过（错误已在设置页面校验时提示）。
+        """
+        self.patterns = patterns
+        self._segments: List[_Segment] = []
+
+        pending: List[Tuple[str, re.Pattern]] = []
+        for pattern in patterns:
+            compiled = compile_rule(pattern).regex
+            if compiled is None:
+                continue
+            if group_counts is not None and compiled.groups not in group_counts:
+                continue
+            if can_combine(pattern, compiled):
+                pending.append((pattern, compiled))
+                continue
+            self._flush(pending)
+            self._segments.append(_Segment(compiled, ((pattern, 1, compiled.groups),)))
+        self._flush(pending)
+
+    def _flush(self, pending: List[Tuple[str, re.Pattern]]) -> None:
+        """将累积的可合并规则编译为一段"""
+        if not pending:
+            return
+        branches = []
+        rules = []
+        group = 1
+        for index, (pattern, compiled) in enumerate(pending):
+            branches.append(f'(?P<{RULE_GROUP_PREFIX}{index}>(?:{pattern}))')
+            # 外层命名分组占一个编号，规则自身的捕获组紧随其后
+            rules.append((pattern, group + 1, compiled.groups))
+            group += 1 + compiled.groups
+
+        try:
+            combined = re.compile('|'.join(branches)) if len(pending) > 1 else None
+        except re.error:
+            combined = None
+
+        if combined is None:
+            for pattern, compiled in pending:
+                self._segments.append(_Segment(compiled, ((pattern, 1, compiled.groups),)))
+        else:
+            self._segments.append(_Segment(combined, tuple(rules)))
+        pending.clear()
+
+    def match(self, line: str) -> Optional[Tuple[str, Tuple[Optional[str], ...]]]:
+        """
+        匹配一行文本
+
+        Args:
+            line: 文本行
+
+        Returns:
+            (第一条匹配的规则, 该规则自身的捕获组)；都不匹配时返回None
+        """
+        for segment in self._segments:
+            match = segment.regex.match(line)
+            if match is None:
+                continue
+            if len(segment.rules) == 1:
+                return segment.rules[0][0], match.groups()
+            pattern, first_group, group_count = segment.rules[int(match.lastgroup[len(RULE_GROUP_PREFIX):])]
+            return pattern, match.groups()[first_group - 1:first_group - 1 + group_count]
+        return None
+
+
+@lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def get_rule_matcher(patterns: Tuple[str, ...],
+                     group_counts: Optional[FrozenSet[int]] = None) -> RuleMatcher:
+    """
+    获取规则合并匹配器（按规则顺序缓存，同一份配置只编译一次）
+
+    Args:
+        patterns: 按匹配顺序排列的正则表达式
+        group_counts: 可用的捕获组数量，None表示不限
+
+    Returns:
+        规则合并匹配器
+    """
+    return RuleMatcher(patterns, group_counts)
+
+
+metrics.register_cache('rule_matcher', get_rule_matcher.cache_info)
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+规则顺序优化模块 - 按实际命中频率调整同一级别内规则的匹配顺序
+
+默认关闭。开启后统计每条规则的命中次数，命中越多的规则越早尝试；同时根据每条规则
+可能匹配的首字符集合，对不可能匹配任何规则的行直接跳过整个级别（大部分行是普通正文）。
+
+调整顺序不能改变识别结果：
+- 标题级别只关心是否有规则匹配，任意顺序结果相同；
+- 特殊格式取第一条匹配的规则，只有能证明两条规则不可能匹配同一行（首字符集合不相交）
+  时才交换它们，无法证明的规则保持用户配置中的先后顺序。
+"""
+
+import bisect
+import sys
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # Python 3.10 及以下
+    import sre_parse
+    import sre_constants
+
+from ..config import ConfigSnapshot
+
+
+# 取第一条匹配结果的级别（其余级别只关心是否匹配）
+ORDERED_LEVELS = frozenset({'special_format'})
+
+# 某级别累计新增多少次命中后重新计算匹配顺序
+REORDER_INTERVAL = 512
+
+# 字符集合：按码位排序且互不重叠的闭区间 ((起始码位, 结束码位), ...)
+CharRanges = Tuple[Tuple[int, int], ...]
+
+_REPEAT_OPS = tuple(
+    getattr(sre_constants, name)
+    for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+    if hasattr(sre_constants, name)
+)
+_ZERO_WIDTH_OPS = (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT)
+
+
+class _Unknown(Exception):
+    """无法确定首字符集合"""
+
+
+def _merge_ranges(ranges: List[Tuple[int, int]]) -> CharRanges:
+    """合并区间"""
+    merged: List[Tuple[int, int]] = []
+    for lo, hi in sorted(ranges):
+        if merged and lo <= merged[-1][1] + 1:
+            if hi > merged[-1][1]:
+                merged[-1] = (merged[-1][0], hi)
+        else:
+            merged.append((lo, hi))
+    return tuple(merged)
+
+
+@lru_cache(maxsize=1)
+def _digit_ranges() -> CharRanges:
+    """\\d 可以匹配的所有Unicode十进制数字（首次使用时扫描一遍码位表）"""
+    return _merge_ranges([(code, code) for code in range(sys.maxunicode + 1) if chr(code).isdecimal()])
+
+
+def _first_of_sequence(items) -> Tuple[List[Tuple[int, int]], bool]:
+    """
+    计算一段子模式可能匹配的首字符
+
+    Returns:
+        (首字符区间列表, 该子模式能否匹配空串)
+    """
+    ranges: List[Tuple[int, int]] = []
+    for op, av in items:
+        item_ranges, nullable = _first_of_item(op, av)
+        ranges.extend(item_ranges)
+        if not nullable:
+            return ranges, False
+    return ranges, True
+
+
+def _first_of_item(op, av) -> Tuple[List[Tuple[int, int]], bool]:
+    """计算单个节点可能匹配的首字符；遇到无法分析的节点抛出 _Unknown"""
+    if op == sre_constants.LITERAL:
+        return [(av, av)], False
+    if op == sre_constants.IN:
+        ranges = []
+        for item_op, item_av in av:
+            if item_op == sre_constants.LITERAL:
+                ranges.append((item_av, item_av))
+            elif item_op == sre_constants.RANGE:
+                ranges.append(item_av)
+            elif item_op == sre_constants.CATEGORY and item_av == sre_constants.CATEGORY_DIGIT:
+                ranges.extend(_digit_ranges())
+            else:
+                # 取反集合、\w \s 等类别无法用有限区间表示
+                raise _Unknown
+        return ranges, False
+    if op in _ZERO_WIDTH_OPS:
+        # 锚点和断言不消耗字符，忽略其约束只会使集合变大，结论仍然成立
+        return [], True
+    if op == sre_constants.SUBPATTERN:
+        _group, add_flags, _del_flags, pattern = av
+        if add_flags:
+            raise _Unknown
+        return _first_of_sequence(pattern)
+    if op in _REPEAT_OPS:
+        min_count, _max_count, pattern = av
+        ranges, nullable = _first_of_sequence(pattern)
+        return ranges, nullable or min_count == 0
+    if op == sre_constants.BRANCH:
+        ranges, nullable = [], False
+        for branch in av[1]:
+            branch_ranges, branch_nullable = _first_of_sequence(branch)
+            ranges.extend(branch_ranges)
+            nullable = nullable or branch_nullable
+        return ranges, nullable
+    if op == getattr(sre_constants, 'ATOMIC_GROUP', None):
+        return _first_of_sequence(av)
+    raise _Unknown
+
+
+@lru_cache(maxsize=256)
+def first_char_ranges(pattern: str) -> Optional[CharRanges]:
+    """
+    计算正则表达式（re.match语义）可能匹配的首字符集合
+
+    集合只会偏大不会偏小：不在集合中的字符开头的行一定不能匹配该规则。
+
+    Args:
+        pattern: 正则表达式
+
+    Returns:
+        首字符区间；可能匹配空串、带有忽略大小写等标志、或包含无法分析的结构时返回None
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return None
+
+    state = getattr(parsed, 'state', None) or getattr(parsed, 'pattern', None)
+    if getattr(state, 'flags', 0) & sre_constants.SRE_FLAG_IGNORECASE:
+        return None
+
+    try:
+        ranges, nullable = _first_of_sequence(parsed)
+    except _Unknown:
+        return None
+    if nullable:
+        return None
+    return _merge_ranges(ranges)
+
+
+def ranges_disjoint(a: CharRanges, b: CharRanges) -> bool:
+    """判断两个字符集合是否不相交"""
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i][1] < b[j][0]:
+            i += 1
+        elif b[j][1] < a[i][0]:
+            j += 1
+        else:
+            return False
+    return True
+
+
+def rules_independent(a: str, b: str) -> bool:
+    """
+    判断两条规则是否可以交换顺序（能证明不可能匹配同一行）
+
+    Args:
+        a: 正则表达式
+        b: 正则表达式
+
+    Returns:
+        首字符集合都可确定且不相交时返回True
+    """
+    ranges_a = first_char_ranges(a)
+    ranges_b = first_char_ranges(b)
+    return ranges_a is not None and ranges_b is not None and ranges_disjoint(ranges_a, ranges_b)
+
+
+@dataclass(frozen=True, slots=True)
+class RulePlan:
+    """
+    单个级别的匹配计划
+
+    Attributes:
+        patterns: 调整后的规则匹配顺序
+        starts: 所有规则首字符集合的并集中各区间的起始码位（无法确定时为None）
+        ends: 与 starts 对应的结束码位
+    """
+    patterns: Tuple[str, ...]
+    starts: Optional[Tuple[int, ...]] = None
+    ends: Optional[Tuple[int, ...]] = None
+
+    def may_match(self, line: str) -> bool:
+        """
+        判断该行是否可能匹配本级别的任意规则
+
+        Args:
+            line: 已去除首尾空白的非空文本行
+
+        Returns:
+            首字符不在任何规则的首字符集合中时返回False
+        """
+        if self.starts is None:
+            return True
+        code = ord(line[0])
+        index = bisect.bisect_right(self.starts, code) - 1
+        return index >= 0 and code <= self.ends[index]
+
+
+class RuleOrderOptimizer:
+    """规则顺序优化器 - 按配置快照版本和级别缓存匹配计划"""
+
+    def __init__(self):
+        self.enabled = False
+        self._hits: Dict[Tuple[str, str], int] = {}
+        self._pending: Dict[str, int] = {}
+        self._plans: Dict[Tuple[int, str], RulePlan] = {}
+        self._lock = threading.Lock()
+
+    def set_enabled(self, enabled: bool) -> None:
+        """开启或关闭优化（关闭时保留命中统计）"""
+        self.enabled = enabled
+
+    def reset(self) -> None:
+        """清空命中统计并恢复配置顺序"""
+        with self._lock:
+            self._hits.clear()
+            self._pending.clear()
+            self._plans.clear()
+
+    def record_hit(self, level: str, pattern: str) -> None:
+        """
+        记录一次命中
+
+        Args:
+            level: 规则所属级别
+            pattern: 命中的正则表达式
+        """
+        key = (level, pattern)
+        self._hits[key] = self._hits.get(key, 0) + 1
+        self._pending[level] = self._pending.get(level, 0) + 1
+
+    def get_plan(self, snapshot: ConfigSnapshot, level: str) -> RulePlan:
+        """
+        获取指定级别的匹配计划
+
+        Args:
+            snapshot: 配置快照
+            level: 级别
+
+        Returns:
+            匹配计划（命中次数变化较多时重新计算顺序）
+        """
+        key = (snapshot.version, level)
+        plan = self._plans.get(key)
+        if plan is not None and self._pending.get(level, 0) < REORDER_INTERVAL:
+            return plan
+
+        with self._lock:
+            self._pending[level] = 0
+            patterns = snapshot.get_enabled_patterns(level)
+            if plan is None:
+                # 配置已更新，丢弃旧版本的计划
+                for stale in [k for k in self._plans if k[1] == level and k[0] != snapshot.version]:
+                    del self._plans[stale]
+                plan = self._build_plan(level, patterns)
+            else:
+                plan = RulePlan(self._order_patterns(level, patterns), plan.starts, plan.ends)
+            self._plans[key] = plan
+        return plan
+
+    def _build_plan(self, level: str, patterns: Tuple[str, ...]) -> RulePlan:
+        """计算匹配顺序和首字符过滤区间"""
+        ordered = self._order_patterns(level, patterns)
+
+        all_ranges = []
+        for pattern in patterns:
+            ranges = first_char_ranges(pattern)
+            if ranges is None:
+                return RulePlan(ordered)
+            all_ranges.extend(ranges)
+
+        merged = _merge_ranges(all_ranges)
+        return RulePlan(ordered, tuple(lo for lo, _ in merged), tuple(hi for _, hi in merged))
+
+    def _order_patterns(self, level: str, patterns: Tuple[str, ...]) -> Tuple[str, ...]:
+        """
+        按命中次数从多到少排列规则
+
+        特殊格式级别中，配置顺序靠前的规则只有在与靠后的规则相互独立时才会被后者越过；
+        在满足这一约束的前提下，每一步选择命中次数最多的规则（次数相同时保持配置顺序）。
+        """
+        hits = [self._hits.get((level, pattern), 0) for pattern in patterns]
+
+        if level not in ORDERED_LEVELS:
+            order = sorted(range(len(patterns)), key=lambda i: -hits[i])
+            return tuple(patterns[i] for i in order)
+
+        remaining = list(range(len(patterns)))
+        ordered = []
+        while remaining:
+            best = None
+            for position, index in enumerate(remaining):
+                # 前面尚未排出的规则都必须与它相互独立
+                if all(rules_independent(patterns[earlier], patterns[index])
+                       for earlier in remaining[:position]):
+                    if best is None or hits[index] > hits[best]:
+                        best = index
+            remaining.remove(best)
+            ordered.append(patterns[best])
+        return tuple(ordered)
+
+
+# 全局规则顺序优化器实例
+rule_optimizer = RuleOrderOptimizer()
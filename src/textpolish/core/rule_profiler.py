@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+规则性能统计模块 - 记录每条正则规则的尝试次数、命中次数和匹配耗时
+
+默认关闭，关闭时匹配路径上只多一次布尔判断；开启后可在设置页面查看每条规则的统计，
+并导出为JSON，用于找出从不命中的规则和耗时过长的规则。
+"""
+
+import json
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from ..config import ConfigSnapshot, user_config_manager
+
+
+@dataclass(slots=True)
+class RuleStats:
+    """单条规则的统计数据"""
+    attempts: int = 0
+    hits: int = 0
+    total_ns: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """命中率"""
+        return self.hits / self.attempts if self.attempts else 0.0
+
+    @property
+    def total_ms(self) -> float:
+        """累计匹配耗时（毫秒）"""
+        return self.total_ns / 1_000_000
+
+    @property
+    def average_us(self) -> float:
+        """平均每次匹配耗时（微秒）"""
+        return self.total_ns / self.attempts / 1000 if self.attempts else 0.0
+
+
+class RuleProfiler:
+    """规则性能统计器 - 按（级别, 正则表达式）累计统计数据"""
+
+    def __init__(self):
+        self.enabled = False
+        self._stats: Dict[Tuple[str, str], RuleStats] = {}
+        self._lock = threading.Lock()
+
+    def set_enabled(self, enabled: bool) -> None:
+        """开启或关闭统计（关闭时保留已有数据）"""
+        self.enabled = enabled
+
+    def reset(self) -> None:
+        """清空统计数据"""
+        with self._lock:
+            self._stats.clear()
+
+    def record(self, level: str, pattern: str, hit: bool, elapsed_ns: int) -> None:
+        """
+        记录一次匹配
+
+        Args:
+            level: 规则所属级别
+            pattern: 正则表达式
+            hit: 是否匹配成功
+            elapsed_ns: 匹配耗时（纳秒）
+        """
+        with self._lock:
+            stats = self._stats.get((level, pattern))
+            if stats is None:
+                stats = self._stats[(level, pattern)] = RuleStats()
+            stats.attempts += 1
+            stats.hits += hit
+            stats.total_ns += elapsed_ns
+
+    def get_stats(self, level: str, pattern: str) -> Optional[RuleStats]:
+        """获取指定规则的统计数据，没有记录时返回None"""
+        return self._stats.get((level, pattern))
+
+    def build_report(self, snapshot: Optional[ConfigSnapshot] = None) -> Dict:
+        """
+        生成统计报告
+
+        当前配置中的规则（包括从未尝试过的）按配置顺序列出；已从配置中删除的规则
+        放在对应级别的末尾。
+
+        Args:
+            snapshot: 用于获取规则名称的配置快照（默认使用当前快照）
+
+        Returns:
+            级别 -> 规则统计列表
+        """
+        if snapshot is None:
+            snapshot = user_config_manager.snapshot()
+
+        with self._lock:
+            remaining = dict(self._stats)
+
+        report = {}
+        for level, level_snapshot in snapshot.levels.items():
+            rules = []
+            for pattern in level_snapshot.patterns:
+                stats = remaining.pop((level, pattern.pattern), None) or RuleStats()
+                rules.append(self._rule_entry(pattern.name, pattern.pattern, pattern.enabled, stats))
+            if rules:
+                report[level] = rules
+
+        for (level, pattern), stats in remaining.items():
+            report.setdefault(level, []).append(self._rule_entry('', pattern, False, stats))
+
+        return report
+
+    @staticmethod
+    def _rule_entry(name: str, pattern: str, enabled: bool, stats: RuleStats) -> Dict:
+        return {
+            'name': name,
+            'pattern': pattern,
+            'enabled': enabled,
+            'attempts': stats.attempts,
+            'hits': stats.hits,
+            'hit_rate': round(stats.hit_rate, 4),
+            'total_ms': round(stats.total_ms, 3),
+            'average_us': round(stats.average_us, 3),
+        }
+
+    def export_json(self, path: str, snapshot: Optional[ConfigSnapshot] = None) -> Dict:
+        """
+        将统计报告导出为JSON文件
+
+        Args:
+            path: 输出文件路径
+            snapshot: 用于获取规则名称的配置快照
+
+        Returns:
+            报告字典
+        """
+        report = self.build_report(snapshot)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+
+# 全局规则性能统计器实例
+rule_profiler = RuleProfiler()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+规则校验模块 - 编译并校验正则表达式规则，按表达式缓存编译结果或错误
+
+设置页面编辑规则时在后台线程中校验，结果写入同一个缓存；处理文本时直接取用缓存，
+不会重复编译，也不会因为某条规则写错而中断整篇文档的处理（错误的规则被跳过）。
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+from ..utils.metrics import metrics
+
+
+# 缓存的规则数量
+RULE_CACHE_SIZE = 512
+
+# 特殊格式规则需要的捕获组数量：2组为 特殊部分+剩余文本，3组为 序号+标题+剩余文本
+SPECIAL_GROUP_COUNTS = frozenset({2, 3})
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRule:
+    """
+    编译后的规则
+
+    Attributes:
+        pattern: 正则表达式
+        regex: 编译结果（编译失败时为None）
+        error: 编译错误说明（编译成功时为None）
+    """
+    pattern: str
+    regex: Optional[re.Pattern]
+    error: Optional[str] = None
+
+    @property
+    def valid(self) -> bool:
+        """是否编译成功"""
+        return self.regex is not None
+
+
+def format_regex_error(error: re.error) -> str:
+    """将 re.error 转换为便于显示的错误说明"""
+    if error.pos is None:
+        return f"正则表达式错误：{error.msg}"
+    return f"正则表达式错误：{error.msg}（第{error.pos + 1}个字符）"
+
+
+@lru_cache(maxsize=RULE_CACHE_SIZE)
+def compile_rule(pattern: str) -> CompiledRule:
+    """
+    编译规则（按表达式缓存，编译失败的结果同样缓存）
+
+    Args:
+        pattern: 正则表达式
+
+    Returns:
+        编译后的规则
+    """
+    try:
+        return CompiledRule(pattern, re.compile(pattern))
+    except re.error as e:
+        return CompiledRule(pattern, None, format_regex_error(e))
+    except (RecursionError, OverflowError) as e:
+        return CompiledRule(pattern, None, f"正则表达式错误：{e}")
+
+
+metrics.register_cache('rule_compile', compile_rule.cache_info)
+
+
+def validate_rule(level: str, pattern: str) -> Optional[str]:
+    """
+    校验单条规则
+
+    Args:
+        level: 规则所属级别
+        pattern: 正则表达式
+
+    Returns:
+        错误说明；规则可用时返回None
+    """
+    pattern = pattern.strip()
+    if not pattern:
+        return None
+
+    rule = compile_rule(pattern)
+    if not rule.valid:
+        return rule.error
+
+    if level == 'special_format' and rule.regex.groups not in SPECIAL_GROUP_COUNTS:
+        return (
+            f"特殊格式规则需要2个或3个捕获组，当前为{rule.regex.groups}个，该规则不会生效"
+        )
+    return None
+
+
+def validate_rules(level: str, patterns: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    校验一组规则（供后台线程调用）
+
+    Args:
+        level: 规则所属级别
+        patterns: 正则表达式
+
+    Returns:
+        正则表达式 -> 错误说明（可用时为None）
+    """
+    return {pattern: validate_rule(level, pattern) for pattern in patterns}
@@ -4,9 +4,66 @@
 """
 
 import re
-from typing import Optional
+import time
+from typing import Iterable, Iterator, Optional
 
-from ..config import PUNCTUATION_MAP
+from ..config import CLEAN_STREAM_CHUNK_CHARS, PUNCTUATION_MAP
+from ..utils.memory_profiler import memory_profiler
+from ..utils.metrics import record_stage
+
+
+# 会被删除的项目符号和几何符号（与 _remove_special_symbols 中的规则一致）
+SPECIAL_SYMBOLS = frozenset('·•▪▫◦‣⁃▲▼◆◇■□●○')
+
+# 出现在行首或行尾时，清理结果可能与相邻行有关的字符
+BOUNDARY_UNSAFE_CHARS = SPECIAL_SYMBOLS | frozenset(PUNCTUATION_MAP)
+
+
+def strip_lines(lines: Iterable[str]) -> Iterator[str]:
+    """
+    逐行去除整段文本首尾的空白（不需要先拼接成完整文本）
+    
+    Args:
+        lines: 文本行（不含换行符）
+        
+    Returns:
+        文本行迭代器，以换行连接后与 '\n'.join(lines).strip() 相同
+    """
+    held = None     # 最后一个非空白行（是否为末行尚不确定）
+    blanks = []     # 其后的空白行
+    for line in lines:
+        if held is None:
+            line = line.lstrip()
+            if line:
+                held = line
+            continue
+        if not line.strip():
+            blanks.append(line)
+            continue
+        yield held
+        yield from blanks
+        blanks = []
+        held = line
+    if held is not None:
+        yield held.rstrip()
+
+
+def normalize_input(text: str) -> str:
+    """
+    统一换行符并去除整段文本首尾的空白
+    
+    编辑器中读取的文本（见 DocumentLines）已经去除了首尾空白，命令行和本地服务的输入先这样处理，
+    同一篇文本无论从哪里输入，处理结果和缓存键都相同。
+    
+    Args:
+        text: 原始输入文本
+        
+    Returns:
+        以 \n 换行、首尾没有空白的文本
+    """
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text.strip()
 
 
 class TextProcessor:
@@ -15,6 +72,8 @@ class TextProcessor:
     def __init__(self):
         """初始化文本处理器"""
         self.punctuation_map = PUNCTUATION_MAP
+        # 标点替换规则只依赖标点映射，创建时编译一次，处理每篇文档时不再拼接和查找表达式
+        self._punctuation_rules = self._compile_punctuation_rules()
     
     def clean_text(self, text: str) -> str:
         """
@@ -29,22 +88,62 @@ class TextProcessor:
         if not text.strip():
             return text
         
-        # 删除特殊符号
-        text = self._remove_special_symbols(text)
-        
-        # 替换英文标点为中文标点
-        text = self._replace_punctuation(text)
+        start = time.perf_counter()
+        length = len(text)
         
-        # 处理引号
-        text = self._process_quotes(text)
+        with memory_profiler.stage('clean'):
+            # 删除特殊符号
+            text = self._remove_special_symbols(text)
+            
+            # 替换英文标点为中文标点
+            text = self._replace_punctuation(text)
+            
+            # 处理引号
+            text = self._process_quotes(text)
+            
+            # 清理空白字符
+            text = self._clean_whitespace(text)
+            
+            # 清理段落格式
+            text = self._clean_paragraphs(text)
+            text = text.strip()
         
-        # 清理空白字符
-        text = self._clean_whitespace(text)
+        record_stage('clean', time.perf_counter() - start, length)
+        return text
+    
+    def clean_lines(self, lines: Iterable[str], chunk_chars: int = CLEAN_STREAM_CHUNK_CHARS) -> Iterator[str]:
+        """
+        流式清理：逐行读取输入，累积到约 chunk_chars 个字符后在可以安全拆分的行边界
+        （见 is_safe_boundary）处分片清理，读取到第一片即开始处理，不需要完整文本的副本
         
-        # 清理段落格式
-        text = self._clean_paragraphs(text)
+        Args:
+            lines: 文本行（不含换行符）
+            chunk_chars: 分片的目标字符数
+            
+        Returns:
+            各分片清理结果的迭代器（空分片不输出），以换行连接后与 clean_text('\n'.join(lines)) 相同
+            （只有空白的输入除外：clean_text 原样返回，这里不输出任何分片）
+        """
+        pending = []
+        pending_chars = 0
+        last_safe = 0   # 最后一个可以拆分的位置（之前的行数）
+        for line in lines:
+            if pending and self.is_safe_boundary(pending[-1], line):
+                last_safe = len(pending)
+            pending.append(line)
+            pending_chars += len(line) + 1
+            if pending_chars >= chunk_chars and last_safe:
+                cleaned = self.clean_text('\n'.join(pending[:last_safe]))
+                del pending[:last_safe]
+                pending_chars = sum(len(rest) + 1 for rest in pending)
+                last_safe = 0
+                if cleaned.strip():
+                    yield cleaned
         
-        return text.strip()
+        if pending:
+            cleaned = self.clean_text('\n'.join(pending))
+            if cleaned.strip():
+                yield cleaned
     
     def _remove_special_symbols(self, text: str) -> str:
         """删除各种特殊符号和项目符号"""
@@ -57,19 +156,30 @@ class TextProcessor:
         
         return text
     
-    def _replace_punctuation(self, text: str) -> str:
-        """智能替换英文标点为中文标点"""
+    def _compile_punctuation_rules(self) -> list[tuple[str, list[tuple[re.Pattern, str]]]]:
+        """按标点映射生成替换规则：(英文标点, [(正则表达式, 替换模板), ...])，顺序与逐个标点处理时相同"""
+        rules = []
         for en_punct, cn_punct in self.punctuation_map.items():
             # 检查标点前后是否有中文字符
             pattern = r'([\u4e00-\u9fff])\s*' + re.escape(en_punct) + r'\s*([\u4e00-\u9fff])'
-            text = re.sub(pattern, r'\1' + cn_punct + r'\2', text)
-            
             # 处理行首和行尾的标点
             pattern_start = r'^' + re.escape(en_punct) + r'\s*([\u4e00-\u9fff])'
-            text = re.sub(pattern_start, cn_punct + r'\1', text, flags=re.MULTILINE)
-            
             pattern_end = r'([\u4e00-\u9fff])\s*' + re.escape(en_punct) + r'$'
-            text = re.sub(pattern_end, r'\1' + cn_punct, text, flags=re.MULTILINE)
+            rules.append((en_punct, [
+                (re.compile(pattern), r'\1' + cn_punct + r'\2'),
+                (re.compile(pattern_start, re.MULTILINE), cn_punct + r'\1'),
+                (re.compile(pattern_end, re.MULTILINE), r'\1' + cn_punct),
+            ]))
+        return rules
+    
+    def _replace_punctuation(self, text: str) -> str:
+        """智能替换英文标点为中文标点"""
+        for en_punct, punct_rules in self._punctuation_rules:
+            # 三条规则都要求出现该标点，文本中没有时跳过
+            if en_punct not in text:
+                continue
+            for regex, replacement in punct_rules:
+                text = regex.sub(replacement, text)
         
         return text
     
@@ -103,6 +213,27 @@ class TextProcessor:
         
         return text
     
+    @staticmethod
+    def is_safe_boundary(prev_line: str, next_line: str) -> bool:
+        """
+        判断在两个相邻行之间拆分文本后分别清理，结果是否与整体清理一致
+        
+        标点替换和符号删除的规则会跨越换行匹配，因此要求两行都非空，且交界处的字符
+        既不是空白，也不是会被替换的标点或会被删除的符号。
+        
+        Args:
+            prev_line: 前一行（不含换行符）
+            next_line: 后一行（不含换行符）
+            
+        Returns:
+            是否可以在两行之间拆分
+        """
+        if not prev_line or not next_line:
+            return False
+        last, first = prev_line[-1], next_line[0]
+        return not (last.isspace() or first.isspace()
+                    or last in BOUNDARY_UNSAFE_CHARS or first in BOUNDARY_UNSAFE_CHARS)
+    
     def get_lines(self, text: str) -> list[str]:
         """
         将文本分割成行，并过滤空行
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+本地转换服务模块 - 以HTTP接口提供文本清理和格式转换，供没有界面的内部工具调用
+
+只监听本机回环地址。转换在预热过的工作进程池中执行：每个工作进程启动时载入同一份配置快照
+并完整处理一次样例文本，之后的请求不再重复编译规则。待处理任务数达到上限时立即返回503，
+由调用方稍后重试，避免请求在服务端无限堆积。
+
+接口：
+    POST /clean   清理后的纯文本
+    POST /html    HTML body
+    POST /wps     WPS兼容的完整HTML文档
+    GET  /health  服务状态
+    GET  /metrics 运行指标（Prometheus文本格式）
+
+请求体可以是纯文本（直接返回结果），也可以是JSON：
+    {"text": "...", "enable_h1": true, "is_html": false}     -> {"result": "..."}
+    {"texts": ["...", "..."]}                                -> {"results": ["...", "..."]}
+纯文本请求的选项通过查询参数传递，如 /html?enable_special=false&is_html=true
+"""
+
+import ipaddress
+import json
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .config import (
+    APP_VERSION, SERVER_BATCH_SIZE, SERVER_DEFAULT_HOST, SERVER_DEFAULT_PORT,
+    SERVER_MAX_BODY_BYTES, SERVER_REQUEST_TIMEOUT, ConfigSnapshot, user_config_manager
+)
+from .core.pipeline import OUTPUT_FORMATS, WARM_UP_SAMPLE, PolishPipeline
+from .utils.metrics import metrics
+
+
+# 请求路径 -> 输出格式
+ROUTES = {f'/{output_format}': output_format for output_format in OUTPUT_FORMATS}
+
+# 请求中可以设置的选项
+OPTION_NAMES = ('enable_h1', 'enable_h2', 'enable_h3', 'enable_special', 'is_html')
+
+# 纯文本请求时各输出格式的响应类型
+RAW_CONTENT_TYPES = {
+    'clean': 'text/plain; charset=utf-8',
+    'html': 'text/html; charset=utf-8',
+    'wps': 'text/html; charset=utf-8',
+}
+
+# 服务繁忙时建议调用方等待的秒数
+RETRY_AFTER_SECONDS = 1
+
+# Prometheus文本格式的响应类型
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 请求指标中使用的路径标签（其他路径统一记为 other，避免标签数量无限增长）
+METRIC_ROUTES = frozenset(ROUTES) | {'/health', '/metrics'}
+
+
+class ServiceBusy(Exception):
+    """待处理任务已达上限，或工作进程池正在重建（调用方稍后重试）"""
+
+
+# 工作进程中的处理流水线和配置快照（由 _init_worker 创建）
+_worker_pipeline: Optional[PolishPipeline] = None
+_worker_snapshot: Optional[ConfigSnapshot] = None
+# 是否把工作进程中记录的指标随任务结果返回（在服务进程内处理时直接记录在同一个注册表中）
+_worker_drain_metrics = False
+
+
+def _init_worker(snapshot: ConfigSnapshot, drain_metrics: bool = False) -> None:
+    """工作进程初始化：载入配置快照并预热流水线"""
+    global _worker_pipeline, _worker_snapshot, _worker_drain_metrics
+    _worker_snapshot = snapshot
+    _worker_drain_metrics = drain_metrics
+    _worker_pipeline = PolishPipeline()
+    _worker_pipeline.polish(WARM_UP_SAMPLE, snapshot=snapshot)
+    _worker_pipeline.is_warm = True
+    if drain_metrics:
+        # 预热产生的指标不计入服务统计
+        metrics.drain()
+
+
+def _ping() -> int:
+    """空任务，用于启动时让进程池创建工作进程"""
+    return os.getpid()
+
+
+def _convert_batch(output_format: str, texts: List[str], options: Dict[str, bool],
+                   submitted_at: float) -> Tuple[List[str], Optional[Dict]]:
+    """
+    在工作进程中处理一批文本
+
+    Returns:
+        (结果列表, 本批次记录的指标增量（在服务进程内处理时为None）)
+    """
+    start = time.time()
+    metrics.histogram('task_wait_seconds', '任务从提交到开始处理的排队时间（秒）').observe(
+        max(start - submitted_at, 0.0)
+    )
+    results = [
+        _worker_pipeline.convert(text, output_format, snapshot=_worker_snapshot, **options)
+        for text in texts
+    ]
+    metrics.histogram('task_duration_seconds', '单个任务的处理耗时（秒）').observe(
+        time.time() - start, format=output_format
+    )
+    return results, metrics.drain() if _worker_drain_metrics else None
+
+
+def is_loopback_host(host: str) -> bool:
+    """判断监听地址是否为本机回环地址"""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def parse_bool(value) -> bool:
+    """解析布尔选项（JSON布尔值或查询参数中的 1/0、true/false、yes/no）"""
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() not in ('0', 'false', 'no', 'off', '')
+
+
+class ConversionService:
+    """转换服务 - 管理预热的工作进程池、批量拆分和待处理任务上限"""
+
+    def __init__(self, workers: int, max_pending: Optional[int] = None,
+                 batch_size: int = SERVER_BATCH_SIZE, timeout: float = SERVER_REQUEST_TIMEOUT,
+                 snapshot: Optional[ConfigSnapshot] = None):
+        """
+        初始化转换服务
+
+        Args:
+            workers: 工作进程数（0表示在服务进程内用单个线程处理，便于调试）
+            max_pending: 同时排队和处理中的任务数上限（默认为工作进程数的4倍）
+            batch_size: 批量请求中每个任务包含的文本数
+            timeout: 单个请求等待结果的超时时间（秒）
+            snapshot: 配置快照（默认使用当前快照，服务运行期间不变）
+        """
+        self.workers = workers
+        self.max_pending = max_pending or max(workers, 1) * 4
+        self.batch_size = max(batch_size, 1)
+        self.timeout = timeout
+        self.snapshot = snapshot if snapshot is not None else user_config_manager.snapshot()
+        self.pending = 0
+        # 可重入：重建进程池时取消旧任务会在同一线程中回调 _release
+        self._lock = threading.RLock()
+        self._executor: Optional[Executor] = None
+
+        metrics.gauge('pending_tasks', '排队和处理中的任务数', lambda: self.pending)
+        metrics.gauge('max_pending_tasks', '待处理任务数上限', lambda: self.max_pending)
+        metrics.gauge('workers', '工作进程数', lambda: self.workers)
+
+    def start(self) -> None:
+        """创建并预热工作进程池"""
+        if self.workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(self.snapshot, True)
+            )
+            # 进程池按需创建进程，提前提交空任务使所有工作进程在第一个请求之前完成预热
+            for future in [self._executor.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, initializer=_init_worker, initargs=(self.snapshot,)
+            )
+            self._executor.submit(_ping).result()
+
+    def shutdown(self) -> None:
+        """关闭工作进程池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _reserve(self, count: int) -> None:
+        with self._lock:
+            # 空闲时总是接受，避免任务数超过上限的大批量请求永远无法执行
+            if self.pending and self.pending + count > self.max_pending:
+                metrics.counter('rejected_tasks_total', '因待处理任务已满而拒绝的任务数').inc(count)
+                raise ServiceBusy(f"待处理任务已满（{self.pending}/{self.max_pending}）")
+            self.pending += count
+
+    def _release(self, count: int) -> None:
+        with self._lock:
+            self.pending -= count
+
+    def convert(self, output_format: str, texts: List[str], options: Dict[str, bool]) -> List[str]:
+        """
+        处理一组文本
+
+        Args:
+            output_format: 输出格式
+            texts: 文本列表（按 batch_size 拆分为多个任务并行处理）
+            options: 处理选项
+
+        Returns:
+            与输入顺序一致的结果列表
+
+        Raises:
+            ServiceBusy: 待处理任务已达上限，或工作进程异常退出（进程池已重建）
+            TimeoutError: 等待结果超时
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"不支持的输出格式: {output_format}")
+        if not texts:
+            return []
+
+        chunks = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        self._reserve(len(chunks))
+        submitted_at = time.time()
+        executor = self._executor
+        futures = []
+        try:
+            for chunk in chunks:
+                future = executor.submit(_convert_batch, output_format, chunk, options, submitted_at)
+                # 任务真正结束（完成、失败或被取消）时才释放名额：超时后已在工作进程中运行的任务无法取消，仍占用名额
+                future.add_done_callback(self._release_done)
+                futures.append(future)
+        except BaseException as e:
+            self._release(len(chunks) - len(futures))
+            for future in futures:
+                future.cancel()
+            if isinstance(e, BrokenProcessPool):
+                self._restart(executor)
+                raise ServiceBusy("工作进程异常退出，进程池已重建，请稍后重试") from e
+            raise
+
+        deadline = time.monotonic() + self.timeout
+        results = []
+        try:
+            for future in futures:
+                chunk_results, worker_metrics = future.result(timeout=max(deadline - time.monotonic(), 0))
+                results.extend(chunk_results)
+                if worker_metrics:
+                    metrics.merge(worker_metrics)
+        except FutureTimeoutError:
+            for future in futures:
+                future.cancel()
+            raise TimeoutError(f"处理超时（{self.timeout}秒）")
+        except BrokenProcessPool as e:
+            # 工作进程被终止（如处理超大文本时内存不足），进程池中的所有任务都已失败
+            self._restart(executor)
+            raise ServiceBusy("工作进程异常退出，进程池已重建，请稍后重试") from e
+        metrics.counter('texts_total', '处理的文本数').inc(len(texts), format=output_format)
+        return results
+
+    def _release_done(self, future) -> None:
+        """任务结束时释放其名额"""
+        self._release(1)
+
+    def _restart(self, executor: Executor) -> None:
+        """
+        重建已损坏的工作进程池（多个请求同时发现时只重建一次）
+
+        Args:
+            executor: 发现损坏的进程池
+        """
+        with self._lock:
+            if self._executor is not executor:
+                return
+            print("工作进程异常退出，正在重建进程池")
+            metrics.counter('pool_restarts_total', '工作进程池重建次数').inc()
+            self.shutdown()
+            self.start()
+
+    def status(self) -> Dict:
+        """服务状态"""
+        return {
+            'status': 'ok',
+            'version': APP_VERSION,
+            'workers': self.workers,
+            'pending': self.pending,
+            'max_pending': self.max_pending,
+            'config_version': self.snapshot.version,
+        }
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """HTTP请求处理器"""
+
+    server_version = f"TextPolish/{APP_VERSION}"
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._begin_request()
+        path = urlsplit(self.path).path
+        if path == '/health':
+            self._send_json(200, self.server.service.status())
+        elif path == '/metrics':
+            self._send(200, metrics.render_prometheus().encode('utf-8'), METRICS_CONTENT_TYPE)
+        else:
+            self._send_json(404, {'error': f"未知路径: {self.path}"})
+
+    def do_POST(self):
+        self._begin_request()
+        url = urlsplit(self.path)
+        output_format = ROUTES.get(url.path)
+        if output_format is None:
+            self._send_json(404, {'error': f"未知路径: {url.path}"})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > self.server.max_body_bytes:
+            # 不读取请求体，直接关闭连接
+            self.close_connection = True
+            self._send_json(413, {'error': f"请求体过大（上限 {self.server.max_body_bytes} 字节）"})
+            return
+
+        body = self.rfile.read(length)
+        try:
+            texts, options, is_json, is_batch = self._parse_request(body, url.query)
+        except (UnicodeDecodeError, ValueError) as e:
+            self._send_json(400, {'error': f"请求格式错误: {e}"})
+            return
+
+        try:
+            results = self.server.service.convert(output_format, texts, options)
+        except ServiceBusy as e:
+            self._send_json(503, {'error': str(e)}, {'Retry-After': str(RETRY_AFTER_SECONDS)})
+            return
+        except TimeoutError as e:
+            self._send_json(504, {'error': str(e)})
+            return
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {'error': f"处理失败: {e}"})
+            return
+
+        if is_batch:
+            self._send_json(200, {'results': results})
+        elif is_json:
+            self._send_json(200, {'result': results[0]})
+        else:
+            self._send(200, results[0].encode('utf-8'), RAW_CONTENT_TYPES[output_format])
+
+    def _parse_request(self, body: bytes, query: str):
+        """
+        解析请求
+
+        Returns:
+            (文本列表, 处理选项, 是否为JSON请求, 是否为批量请求)
+        """
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type == 'application/json':
+            payload = json.loads(body.decode('utf-8'))
+            if not isinstance(payload, dict):
+                raise ValueError("JSON请求体必须是对象")
+            options = {name: parse_bool(payload[name]) for name in OPTION_NAMES if name in payload}
+            if 'texts' in payload:
+                texts = payload['texts']
+                if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                    raise ValueError("texts 必须是字符串数组")
+                return texts, options, True, True
+            if not isinstance(payload.get('text'), str):
+                raise ValueError("缺少 text 或 texts 字段")
+            return [payload['text']], options, True, False
+
+        params = parse_qs(query)
+        options = {name: parse_bool(params[name][-1]) for name in OPTION_NAMES if name in params}
+        return [body.decode('utf-8')], options, False, False
+
+    def _begin_request(self):
+        """记录请求开始时间和用于指标的路径标签"""
+        self._started = time.perf_counter()
+        path = urlsplit(self.path).path
+        self._route = path if path in METRIC_ROUTES else 'other'
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self._send(status, body, 'application/json; charset=utf-8', headers)
+
+    def _send(self, status: int, body: bytes, content_type: str,
+              headers: Optional[Dict[str, str]] = None):
+        metrics.counter('http_requests_total', 'HTTP请求数').inc(route=self._route, status=status)
+        metrics.histogram('http_request_duration_seconds', 'HTTP请求处理耗时（秒）').observe(
+            time.perf_counter() - self._started, route=self._route
+        )
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # 调用方已断开连接
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class ConversionServer(ThreadingHTTPServer):
+    """转换服务HTTP服务器（每个连接一个线程，实际处理交给转换服务的工作进程池）"""
+
+    daemon_threads = True
+
+    def __init__(self, address, service: ConversionService,
+                 max_body_bytes: int = SERVER_MAX_BODY_BYTES, quiet: bool = False):
+        super().__init__(address, ConversionRequestHandler)
+        self.service = service
+        self.max_body_bytes = max_body_bytes
+        self.quiet = quiet
+
+
+def run_server(host: str = SERVER_DEFAULT_HOST, port: int = SERVER_DEFAULT_PORT,
+               workers: int = 2, max_pending: Optional[int] = None,
+               batch_size: int = SERVER_BATCH_SIZE, timeout: float = SERVER_REQUEST_TIMEOUT,
+               max_body_bytes: int = SERVER_MAX_BODY_BYTES, quiet: bool = False) -> int:
+    """
+    启动本地转换服务并一直运行到按下Ctrl+C
+
+    Args:
+        host: 监听地址（必须是本机回环地址）
+        port: 监听端口
+        workers: 工作进程数（0表示在服务进程内处理）
+        max_pending: 待处理任务数上限
+        batch_size: 批量请求中每个任务包含的文本数
+        timeout: 单个请求等待结果的超时时间（秒）
+        max_body_bytes: 请求体大小上限（字节）
+        quiet: 是否不输出访问日志
+
+    Returns:
+        退出代码
+    """
+    if not is_loopback_host(host):
+        print(f"拒绝监听非本机地址: {host}（转换服务只允许本机访问）")
+        return 2
+
+    service = ConversionService(workers, max_pending, batch_size, timeout)
+    print(f"正在启动 {max(workers, 1)} 个工作{'进程' if workers > 0 else '线程'}...")
+    service.start()
+
+    try:
+        server = ConversionServer((host, port), service, max_body_bytes, quiet)
+    except OSError as e:
+        service.shutdown()
+        print(f"无法监听 {host}:{port}: {e}")
+        return 1
+
+    print(f"TextPolish 转换服务已启动: http://{host}:{server.server_address[1]}"
+          f"（待处理任务上限 {service.max_pending}，按 Ctrl+C 停止）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n正在停止转换服务...")
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
@@ -5,6 +5,13 @@ UI模块 - 包含所有用户界面组件
 
 from .main_window import TextPolishWindow
 from .main_interface import TextPolishInterface
-from .config_interface import ConfigInterface
 
 __all__ = ['TextPolishWindow', 'TextPolishInterface', 'ConfigInterface']
+
+
+def __getattr__(name):
+    # 配置界面首次打开时才创建（见 LazyConfigInterface），导入包时不加载
+    if name == 'ConfigInterface':
+        from .config_interface import ConfigInterface
+        return ConfigInterface
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+后台任务模块 - 在QThreadPool中执行的任务及其信号
+
+任务完成后通过信号把结果交回界面线程处理，界面线程不等待任务执行。
+"""
+
+from typing import Optional, Sequence
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from ..core.blocks import LevelHint, TextBlock
+from ..core.history_store import history_store
+
+
+class TaskSignals(QObject):
+    """后台任务的信号（QRunnable不是QObject，需要单独的信号对象）"""
+
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class HistorySaveTask(QRunnable):
+    """保存处理历史任务 - 长文档写入数据库和全文索引需要数百毫秒，不在界面线程中执行"""
+
+    def __init__(self, cleaned_text: str, blocks: Sequence[TextBlock],
+                 level_hints: Optional[Sequence[Optional[LevelHint]]] = None):
+        super().__init__()
+        self.cleaned_text = cleaned_text
+        self.blocks = blocks
+        self.level_hints = level_hints
+        self.signals = TaskSignals()
+
+    def run(self):
+        # 结果：记录编号（未保存时为None）
+        self.signals.finished.emit(history_store.add(self.cleaned_text, self.blocks, self.level_hints))
@@ -7,7 +7,7 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QFormLayout, 
     QGroupBox, QFrame, QLabel, QSizePolicy, QSpacerItem
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QRunnable, QThreadPool
 from PyQt6.QtGui import QFont
 from qfluentwidgets import (
     ScrollArea, PrimaryPushButton, PushButton, TransparentPushButton,
@@ -15,10 +15,51 @@ from qfluentwidgets import (
     CardWidget, CheckBox, TextEdit, FluentIcon as FIF, InfoBar, 
     InfoBarPosition, MessageBox, SubtitleLabel, CaptionLabel,
     Pivot, qconfig, setTheme, Theme, isDarkTheme, ExpandLayout,
-    setCustomStyleSheet, HeaderCardWidget, IconWidget
+    setCustomStyleSheet, HeaderCardWidget, IconWidget, SwitchButton
 )
 
-from ..config import user_config_manager, StyleConfig, RegexPattern
+from ..config import (
+    user_config_manager, StyleConfig, RegexPattern, RULE_VALIDATION_DELAY_MS,
+    RULE_BENCH_DEFAULT_SAMPLE, THEME_COLORS
+)
+from ..core.history_store import history_store
+from ..core.result_cache import result_cache
+from ..core.rule_optimizer import rule_optimizer
+from ..core.rule_profiler import rule_profiler
+from ..core.rule_bench import RuleBenchReport, load_sample, run_rule_bench, save_sample
+from ..core.rule_validator import validate_rules
+from ..utils.memory_profiler import memory_profiler
+from .background_tasks import TaskSignals
+from .style_registry import StyleSheetRegistry
+
+
+class RuleValidationTask(QRunnable):
+    """规则校验任务 - 在线程池中编译并校验正则表达式，编译结果写入规则缓存"""
+    
+    def __init__(self, level: str, patterns):
+        super().__init__()
+        self.level = level
+        self.patterns = list(patterns)
+        self.signals = TaskSignals()
+    
+    def run(self):
+        # 结果：正则表达式 -> 错误说明
+        self.signals.finished.emit(validate_rules(self.level, self.patterns))
+
+
+class RuleBenchTask(QRunnable):
+    """规则测试任务 - 在线程池中用样本文本测试当前规则"""
+    
+    def __init__(self, sample: str):
+        super().__init__()
+        self.sample = sample
+        self.signals = TaskSignals()
+    
+    def run(self):
+        try:
+            self.signals.finished.emit(run_rule_bench(self.sample))
+        except Exception as e:
+            self.signals.failed.emit(str(e))
 
 
 class TitleLevelCard(CardWidget):
@@ -32,6 +73,14 @@ class TitleLevelCard(CardWidget):
         self.title = title
         self.config = user_config_manager.get_config(level)
         self.rule_widgets = []
+        self.rules_loaded = False  # 规则组件在卡片首次显示后才创建
+        
+        # 停止编辑后再校验规则，避免每输入一个字符就提交一次任务
+        self.validation_timer = QTimer(self)
+        self.validation_timer.setSingleShot(True)
+        self.validation_timer.setInterval(RULE_VALIDATION_DELAY_MS)
+        self.validation_timer.timeout.connect(self.start_rule_validation)
+        self.validation_task = None
         
         self.setup_ui()
         self.load_config()
@@ -168,6 +217,11 @@ class TitleLevelCard(CardWidget):
         self.rules_layout = QVBoxLayout(self.rules_container)
         self.rules_layout.setContentsMargins(0, 12, 0, 0)
         self.rules_layout.setSpacing(12)  # 增加规则之间的间距
+        StyleSheetRegistry.apply(self.rules_container, 'rule_list')
+        
+        # 规则组件创建前的占位提示
+        self.rules_placeholder = CaptionLabel("正在加载规则...")
+        self.rules_layout.addWidget(self.rules_placeholder)
         
         group.viewLayout.addWidget(self.rules_container)
         
@@ -203,12 +257,23 @@ class TitleLevelCard(CardWidget):
         
         top_layout.addStretch()
         
+        # 规则校验错误（规则有误时显示）
+        error_label = CaptionLabel("")
+        error_label.setStyleSheet("color: #d13438;")
+        error_label.hide()
+        top_layout.addWidget(error_label)
+        
+        # 规则性能统计（开启统计后显示）
+        stats_label = CaptionLabel("")
+        stats_label.setStyleSheet("color: #888888;")
+        top_layout.addWidget(stats_label)
+        
         # 删除按钮
         remove_button = TransparentPushButton("删除")
         remove_button.setIcon(FIF.DELETE)
         remove_button.setFixedSize(80, 28)  # 增加宽度以适应中文文字
         remove_button.setToolTip("删除规则")
-        self.update_remove_button_style(remove_button)
+        remove_button.setObjectName("removeRuleButton")  # 样式由规则容器统一设置
         top_layout.addWidget(remove_button)
         
         layout.addWidget(top_row)
@@ -219,8 +284,8 @@ class TitleLevelCard(CardWidget):
         pattern_edit.setPlaceholderText("输入正则表达式，如：^第[一二三四五六七八九十]+章")
         layout.addWidget(pattern_edit)
         
-        # 为规则组件添加样式
-        self.apply_rule_widget_style(rule_widget)
+        # 样式由规则容器统一设置（见create_rules_section），不再逐个设置
+        rule_widget.setObjectName("ruleWidget")
         
         # 保存组件引用和数据
         rule_widget.pattern = pattern
@@ -228,180 +293,75 @@ class TitleLevelCard(CardWidget):
         rule_widget.name_edit = name_edit
         rule_widget.pattern_edit = pattern_edit
         rule_widget.remove_button = remove_button
+        rule_widget.stats_label = stats_label
+        rule_widget.error_label = error_label
+        self.update_rule_stats(rule_widget)
         
         # 连接信号
         enabled_checkbox.stateChanged.connect(self.on_rule_changed)
         name_edit.textChanged.connect(self.on_rule_changed)
         pattern_edit.textChanged.connect(self.on_rule_changed)
+        pattern_edit.textChanged.connect(self.validation_timer.start)
         remove_button.clicked.connect(lambda: self.remove_rule(rule_widget))
         
         return rule_widget
     
-    def update_remove_button_style(self, button):
-        """更新删除按钮样式以适应当前主题"""
-        # 浅色主题样式 - 更明显的红色按钮
-        light_qss = """
-            PushButton {
-                color: #ffffff;
-                background-color: #e74c3c;
-                border: 1px solid #c0392b;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            PushButton:hover {
-                background-color: #c0392b;
-                border-color: #a93226;
-            }
-            PushButton:pressed {
-                background-color: #a93226;
-                border-color: #922b21;
-            }
-        """
-        
-        # 深色主题样式 - 更明显的红色按钮
-        dark_qss = """
-            PushButton {
-                color: #ffffff;
-                background-color: #ff6b6b;
-                border: 1px solid #ff5252;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            PushButton:hover {
-                background-color: #ff5252;
-                border-color: #ff3333;
-            }
-            PushButton:pressed {
-                background-color: #ff3333;
-                border-color: #ff1111;
-            }
-        """
+    def update_rule_stats(self, rule_widget):
+        """更新单个规则组件上显示的命中次数和耗时"""
+        stats = rule_profiler.get_stats(self.level, rule_widget.pattern.pattern.strip())
+        if stats is None:
+            rule_widget.stats_label.setText("尚未匹配" if rule_profiler.enabled else "")
+            return
+        rule_widget.stats_label.setText(
+            f"尝试 {stats.attempts} · 命中 {stats.hits}（{stats.hit_rate:.1%}）· "
+            f"{stats.total_ms:.2f}ms"
+        )
+    
+    def refresh_rule_stats(self):
+        """刷新所有规则组件的统计信息"""
+        for widget in self.rule_widgets:
+            self.update_rule_stats(widget)
+    
+    def start_rule_validation(self):
+        """在后台线程中校验当前所有规则"""
+        patterns = {widget.pattern_edit.text().strip() for widget in self.rule_widgets}
+        if not patterns:
+            return
         
-        # 使用 QFluentWidgets 推荐的方式设置主题自适应样式
-        setCustomStyleSheet(button, light_qss, dark_qss)
-    
-    def apply_rule_widget_style(self, widget):
-        """为规则组件应用样式"""
-        # 浅色主题样式
-        light_qss = """
-            QWidget {
-                background-color: #f8f9fa;
-                border: 1px solid #e9ecef;
-                border-radius: 6px;
-            }
-            QWidget:hover {
-                border-color: #ced4da;
-                background-color: #f1f3f4;
-            }
+        self.validation_task = RuleValidationTask(self.level, patterns)
+        self.validation_task.signals.finished.connect(self.apply_rule_validation)
+        QThreadPool.globalInstance().start(self.validation_task)
+    
+    def apply_rule_validation(self, results: dict):
         """
+        在规则组件上显示校验结果
         
-        # 深色主题样式
-        dark_qss = """
-            QWidget {
-                background-color: #3c4043;
-                border: 1px solid #5f6368;
-                border-radius: 6px;
-            }
-            QWidget:hover {
-                border-color: #8ab4f8;
-                background-color: #484a4d;
-            }
+        Args:
+            results: 正则表达式 -> 错误说明（可用时为None）
         """
-        
-        setCustomStyleSheet(widget, light_qss, dark_qss)
+        for widget in self.rule_widgets:
+            pattern = widget.pattern_edit.text().strip()
+            if pattern not in results:
+                # 校验期间规则又被修改，等待下一次校验结果
+                continue
+            error = results[pattern]
+            widget.pattern_edit.setError(error is not None)
+            widget.pattern_edit.setToolTip(error or "")
+            widget.error_label.setText(f"⚠ {error}" if error else "")
+            widget.error_label.setToolTip(error or "")
+            widget.error_label.setVisible(error is not None)
     
     def update_group_box_style(self, group_box):
         """更新群组框样式以适应当前主题"""
-        # 浅色主题样式
-        light_qss = """
-            QGroupBox {
-                font-weight: bold;
-                border: 1px solid rgba(128, 128, 128, 0.3);
-                border-radius: 6px;
-                margin-top: 6px;
-                padding-top: 6px;
-                color: #333333;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 4px 0 4px;
-                color: #333333;
-            }
-        """
-        
-        # 深色主题样式
-        dark_qss = """
-            QGroupBox {
-                font-weight: bold;
-                border: 1px solid rgba(200, 200, 200, 0.3);
-                border-radius: 6px;
-                margin-top: 6px;
-                padding-top: 6px;
-                color: #ffffff;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 4px 0 4px;
-                color: #ffffff;
-            }
-        """
-        
-        # 使用 QFluentWidgets 推荐的方式设置主题自适应样式
-        setCustomStyleSheet(group_box, light_qss, dark_qss)
+        StyleSheetRegistry.apply(group_box, 'group_box')
     
     def apply_card_style(self):
         """为卡片应用美化样式"""
-        light_qss = """
-            TitleLevelCard {
-                border: 1px solid rgba(0, 0, 0, 0.08);
-                border-radius: 12px;
-                background-color: #ffffff;
-                box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
-            }
-            TitleLevelCard:hover {
-                border-color: rgba(0, 120, 215, 0.3);
-                box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15);
-            }
-        """
-        
-        dark_qss = """
-            TitleLevelCard {
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 12px;
-                background-color: #2d3748;
-                box-shadow: 0 2px 8px rgba(0, 0, 0, 0.3);
-            }
-            TitleLevelCard:hover {
-                border-color: rgba(100, 200, 255, 0.4);
-                box-shadow: 0 4px 12px rgba(0, 0, 0, 0.4);
-            }
-        """
-        
-        setCustomStyleSheet(self, light_qss, dark_qss)
+        StyleSheetRegistry.apply(self, 'title_level_card')
     
     def apply_title_label_style(self, label):
         """为标题标签应用样式"""
-        light_qss = """
-            SubtitleLabel {
-                font-size: 18px;
-                font-weight: bold;
-                color: #2c3e50;
-                padding: 5px 0px;
-            }
-        """
-        
-        dark_qss = """
-            SubtitleLabel {
-                font-size: 18px;
-                font-weight: bold;
-                color: #ecf0f1;
-                padding: 5px 0px;
-            }
-        """
-        
-        setCustomStyleSheet(label, light_qss, dark_qss)
+        StyleSheetRegistry.apply(label, 'title_label')
     
     def load_config(self):
         """加载配置"""
@@ -427,8 +387,29 @@ class TitleLevelCard(CardWidget):
         if self.level == 'normal' and hasattr(self, 'text_indent_edit'):
             self.text_indent_edit.setText(style.text_indent)
         
-        # 加载匹配规则
-        if self.level in ['h1', 'h2', 'h3', 'special_format']:
+        # 加载匹配规则（尚未创建规则组件时推迟到卡片显示后）
+        if self.level in ['h1', 'h2', 'h3', 'special_format'] and self.rules_loaded:
+            self.load_rules()
+    
+    def showEvent(self, e):
+        """首次显示后在下一轮事件循环中创建规则组件"""
+        super().showEvent(e)
+        if not self.rules_loaded:
+            QTimer.singleShot(0, self.ensure_rules_loaded)
+    
+    def ensure_rules_loaded(self):
+        """确保规则组件已创建（保存、添加规则前都需要调用）"""
+        if self.rules_loaded:
+            return
+        self.rules_loaded = True
+        
+        if self.level not in ['h1', 'h2', 'h3', 'special_format']:
+            return
+        
+        self.rules_layout.removeWidget(self.rules_placeholder)
+        self.rules_placeholder.deleteLater()
+        
+        if self.config:
             self.load_rules()
     
     def load_rules(self):
@@ -442,6 +423,8 @@ class TitleLevelCard(CardWidget):
             self.rule_widgets.append(rule_widget)
             self.rules_layout.addWidget(rule_widget)
         
+        # 校验已保存的规则（配置文件可能被手动修改过）
+        self.validation_timer.start()
     
     def clear_rules(self):
         """清除所有规则组件"""
@@ -451,6 +434,8 @@ class TitleLevelCard(CardWidget):
     
     def add_rule(self):
         """添加新规则"""
+        self.ensure_rules_loaded()
+        
         new_pattern = RegexPattern(
             pattern="",
             name=f"新规则{len(self.rule_widgets) + 1}",
@@ -490,6 +475,9 @@ class TitleLevelCard(CardWidget):
     
     def save_config_silent(self):
         """静默保存配置（不显示提示）"""
+        # 规则组件未创建时先创建，避免把尚未显示的规则保存为空
+        self.ensure_rules_loaded()
+        
         try:
             # 保存样式配置
             style = StyleConfig(
@@ -572,6 +560,10 @@ class ConfigInterface(QWidget):
         self.special_card = self.create_title_settings_section("special_format", "特殊格式", FIF.PALETTE)
         scroll_layout.addWidget(self.special_card)
         
+        # 7. 规则测试台
+        self.bench_card = self.create_rule_bench_section()
+        scroll_layout.addWidget(self.bench_card)
+        
         # 保存配置引用以便后续操作
         self.config_cards = {
             'h1': self.h1_card,
@@ -598,27 +590,7 @@ class ConfigInterface(QWidget):
         
     def apply_page_title_style(self, label):
         """为页面标题应用样式"""
-        light_qss = """
-            TitleLabel {
-                font-size: 28px;
-                font-weight: bold;
-                color: #1f2937;
-                padding: 16px 0px;
-                margin: 0px;
-            }
-        """
-        
-        dark_qss = """
-            TitleLabel {
-                font-size: 28px;
-                font-weight: bold;
-                color: #f9fafb;
-                padding: 16px 0px;
-                margin: 0px;
-            }
-        """
-        
-        setCustomStyleSheet(label, light_qss, dark_qss)
+        StyleSheetRegistry.apply(label, 'page_title')
     
     def create_app_settings_section(self):
         """创建应用设置区域"""
@@ -702,140 +674,335 @@ class ConfigInterface(QWidget):
         ui_group.viewLayout.addWidget(theme_container)
         layout.addWidget(ui_group)
         
+        # 规则性能统计
+        profiler_group = HeaderCardWidget()
+        profiler_group.setTitle("规则性能统计")
+        
+        profiler_container = QWidget()
+        profiler_layout = QHBoxLayout(profiler_container)
+        profiler_layout.setContentsMargins(0, 0, 0, 0)
+        profiler_layout.setSpacing(12)
+        
+        profiler_layout.addWidget(BodyLabel("记录每条规则的命中次数和耗时:"))
+        self.profiler_switch = SwitchButton()
+        self.profiler_switch.setOnText("开")
+        self.profiler_switch.setOffText("关")
+        self.profiler_switch.setChecked(rule_profiler.enabled)
+        self.profiler_switch.checkedChanged.connect(self.on_rule_profiler_toggled)
+        profiler_layout.addWidget(self.profiler_switch)
+        profiler_layout.addStretch()
+        
+        reset_stats_button = PushButton("清空统计")
+        reset_stats_button.setIcon(FIF.DELETE)
+        reset_stats_button.clicked.connect(self.reset_rule_stats)
+        profiler_layout.addWidget(reset_stats_button)
+        
+        export_stats_button = PushButton("导出统计")
+        export_stats_button.setIcon(FIF.UP)
+        export_stats_button.clicked.connect(self.export_rule_stats)
+        profiler_layout.addWidget(export_stats_button)
+        
+        profiler_group.viewLayout.addWidget(profiler_container)
+        
+        optimizer_container = QWidget()
+        optimizer_layout = QHBoxLayout(optimizer_container)
+        optimizer_layout.setContentsMargins(0, 0, 0, 0)
+        optimizer_layout.setSpacing(12)
+        
+        optimizer_layout.addWidget(BodyLabel("按命中频率调整规则匹配顺序:"))
+        self.optimizer_switch = SwitchButton()
+        self.optimizer_switch.setOnText("开")
+        self.optimizer_switch.setOffText("关")
+        self.optimizer_switch.setChecked(rule_optimizer.enabled)
+        self.optimizer_switch.checkedChanged.connect(self.on_rule_optimizer_toggled)
+        optimizer_layout.addWidget(self.optimizer_switch)
+        optimizer_layout.addStretch()
+        
+        profiler_group.viewLayout.addWidget(optimizer_container)
+        layout.addWidget(profiler_group)
+        
+        # 内存分析
+        memory_group = HeaderCardWidget()
+        memory_group.setTitle("内存分析")
+        
+        memory_container = QWidget()
+        memory_layout = QHBoxLayout(memory_container)
+        memory_layout.setContentsMargins(0, 0, 0, 0)
+        memory_layout.setSpacing(12)
+        
+        memory_layout.addWidget(BodyLabel("记录各处理阶段的内存峰值（开启后处理明显变慢）:"))
+        self.memory_switch = SwitchButton()
+        self.memory_switch.setOnText("开")
+        self.memory_switch.setOffText("关")
+        self.memory_switch.setChecked(memory_profiler.enabled)
+        self.memory_switch.checkedChanged.connect(self.on_memory_profiler_toggled)
+        memory_layout.addWidget(self.memory_switch)
+        
+        self.memory_stats_label = CaptionLabel()
+        memory_layout.addWidget(self.memory_stats_label)
+        memory_layout.addStretch()
+        
+        reset_memory_button = PushButton("清空记录")
+        reset_memory_button.setIcon(FIF.DELETE)
+        reset_memory_button.clicked.connect(self.reset_memory_stats)
+        memory_layout.addWidget(reset_memory_button)
+        
+        export_memory_button = PushButton("导出报告")
+        export_memory_button.setIcon(FIF.UP)
+        export_memory_button.clicked.connect(self.export_memory_report)
+        memory_layout.addWidget(export_memory_button)
+        
+        memory_group.viewLayout.addWidget(memory_container)
+        layout.addWidget(memory_group)
+        
+        # 处理结果缓存
+        cache_group = HeaderCardWidget()
+        cache_group.setTitle("处理结果缓存")
+        
+        cache_container = QWidget()
+        cache_layout = QHBoxLayout(cache_container)
+        cache_layout.setContentsMargins(0, 0, 0, 0)
+        cache_layout.setSpacing(12)
+        
+        cache_layout.addWidget(BodyLabel("再次处理相同文档时直接读取上次结果:"))
+        self.cache_switch = SwitchButton()
+        self.cache_switch.setOnText("开")
+        self.cache_switch.setOffText("关")
+        self.cache_switch.setChecked(result_cache.enabled)
+        self.cache_switch.checkedChanged.connect(self.on_result_cache_toggled)
+        cache_layout.addWidget(self.cache_switch)
+        
+        self.cache_stats_label = CaptionLabel()
+        cache_layout.addWidget(self.cache_stats_label)
+        cache_layout.addStretch()
+        
+        clear_cache_button = PushButton("清空缓存")
+        clear_cache_button.setIcon(FIF.DELETE)
+        clear_cache_button.clicked.connect(self.clear_result_cache)
+        cache_layout.addWidget(clear_cache_button)
+        
+        cache_group.viewLayout.addWidget(cache_container)
+        layout.addWidget(cache_group)
+        
+        # 处理历史
+        history_group = HeaderCardWidget()
+        history_group.setTitle("处理历史")
+        
+        history_container = QWidget()
+        history_layout = QHBoxLayout(history_container)
+        history_layout.setContentsMargins(0, 0, 0, 0)
+        history_layout.setSpacing(12)
+        
+        history_layout.addWidget(BodyLabel("保存处理结果，可在主界面的历史记录中搜索并重新复制:"))
+        self.history_switch = SwitchButton()
+        self.history_switch.setOnText("开")
+        self.history_switch.setOffText("关")
+        self.history_switch.setChecked(history_store.enabled)
+        self.history_switch.checkedChanged.connect(self.on_history_toggled)
+        history_layout.addWidget(self.history_switch)
+        
+        self.history_stats_label = CaptionLabel()
+        history_layout.addWidget(self.history_stats_label)
+        history_layout.addStretch()
+        
+        clear_history_button = PushButton("清空历史")
+        clear_history_button.setIcon(FIF.DELETE)
+        clear_history_button.clicked.connect(self.clear_history)
+        history_layout.addWidget(clear_history_button)
+        
+        history_group.viewLayout.addWidget(history_container)
+        layout.addWidget(history_group)
+        
         return card
     
-    def update_group_box_style(self, group_box):
-        """更新群组框样式以适应当前主题"""
-        # 浅色主题样式
-        light_qss = """
-            QGroupBox {
-                font-weight: bold;
-                border: 1px solid rgba(128, 128, 128, 0.3);
-                border-radius: 6px;
-                margin-top: 6px;
-                padding-top: 6px;
-                color: #333333;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 4px 0 4px;
-                color: #333333;
-            }
-        """
+    def create_rule_bench_section(self):
+        """创建规则测试台区域"""
+        card = CardWidget()
+        card.setBorderRadius(12)
+        layout = QVBoxLayout(card)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(20)
         
-        # 深色主题样式
-        dark_qss = """
-            QGroupBox {
-                font-weight: bold;
-                border: 1px solid rgba(200, 200, 200, 0.3);
-                border-radius: 6px;
-                margin-top: 6px;
-                padding-top: 6px;
-                color: #ffffff;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 4px 0 4px;
-                color: #ffffff;
-            }
-        """
+        bench_group = HeaderCardWidget()
+        bench_group.setTitle("🧪 规则测试台")
+        
+        desc_label = CaptionLabel("用样本文本测试当前保存的规则：查看每行由哪条规则识别、每条规则的匹配耗时，"
+                                  "并检测耗时随行长超线性增长的规则")
+        desc_label.setWordWrap(True)
+        desc_label.setStyleSheet("color: #666666;")
+        bench_group.viewLayout.addWidget(desc_label)
+        
+        self.bench_sample_edit = TextEdit()
+        self.bench_sample_edit.setPlaceholderText("输入样本文本，每行一个段落")
+        self.bench_sample_edit.setPlainText(load_sample())
+        self.bench_sample_edit.setFixedHeight(160)
+        bench_group.viewLayout.addWidget(self.bench_sample_edit)
+        
+        button_container = QWidget()
+        button_layout = QHBoxLayout(button_container)
+        button_layout.setContentsMargins(0, 0, 0, 0)
+        button_layout.setSpacing(12)
+        
+        self.bench_run_button = PrimaryPushButton("运行测试")
+        self.bench_run_button.setIcon(FIF.PLAY)
+        self.bench_run_button.clicked.connect(self.run_rule_bench)
+        button_layout.addWidget(self.bench_run_button)
+        
+        reset_sample_button = PushButton("恢复默认样本")
+        reset_sample_button.setIcon(FIF.SYNC)
+        reset_sample_button.clicked.connect(
+            lambda: self.bench_sample_edit.setPlainText(RULE_BENCH_DEFAULT_SAMPLE)
+        )
+        button_layout.addWidget(reset_sample_button)
+        
+        self.bench_status_label = CaptionLabel("")
+        button_layout.addWidget(self.bench_status_label)
+        button_layout.addStretch()
         
-        # 使用 QFluentWidgets 推荐的方式设置主题自适应样式
-        setCustomStyleSheet(group_box, light_qss, dark_qss)
+        bench_group.viewLayout.addWidget(button_container)
+        
+        self.bench_result_view = TextEdit()
+        self.bench_result_view.setReadOnly(True)
+        self.bench_result_view.setMinimumHeight(260)
+        self.bench_result_view.setPlaceholderText("测试结果将显示在这里")
+        bench_group.viewLayout.addWidget(self.bench_result_view)
+        
+        layout.addWidget(bench_group)
+        self.bench_task = None
+        
+        return card
     
-    def apply_theme_background(self):
-        """为配置界面应用主题背景"""
-        # 主界面背景样式 - 使用渐变背景
-        main_light_qss = """
-            ConfigInterface {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #f8fafc, stop:1 #f1f5f9);
-                color: #1e293b;
-            }
-        """
+    def run_rule_bench(self):
+        """保存样本文本并在后台线程中运行规则测试"""
+        sample = self.bench_sample_edit.toPlainText()
+        if not sample.strip():
+            InfoBar.warning(
+                title="提示",
+                content="请先输入样本文本",
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP_RIGHT,
+                duration=2000,
+                parent=self
+            )
+            return
         
-        main_dark_qss = """
-            ConfigInterface {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #0f172a, stop:1 #1e293b);
-                color: #f8fafc;
-            }
-        """
+        try:
+            save_sample(sample)
+        except OSError as e:
+            print(f"保存规则测试样本失败: {e}")
+        
+        self.bench_run_button.setEnabled(False)
+        self.bench_status_label.setText("正在测试...")
         
-        # 应用主界面样式
-        setCustomStyleSheet(self, main_light_qss, main_dark_qss)
+        self.bench_task = RuleBenchTask(sample)
+        self.bench_task.signals.finished.connect(self.show_rule_bench_report)
+        self.bench_task.signals.failed.connect(self.on_rule_bench_failed)
+        QThreadPool.globalInstance().start(self.bench_task)
     
+    def on_rule_bench_failed(self, error: str):
+        """规则测试失败"""
+        self.bench_run_button.setEnabled(True)
+        self.bench_status_label.setText("")
+        InfoBar.error(
+            title="测试失败",
+            content=error,
+            orient=Qt.Orientation.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP_RIGHT,
+            duration=3000,
+            parent=self
+        )
     
-    def apply_title_label_style(self, label):
-        """为标题标签应用样式"""
-        light_qss = """
-            SubtitleLabel {
-                font-size: 18px;
-                font-weight: bold;
-                color: #2c3e50;
-                padding: 5px 0px;
-            }
+    def show_rule_bench_report(self, report: RuleBenchReport):
+        """显示规则测试结果：规则汇总 + 逐行识别结果"""
+        self.bench_run_button.setEnabled(True)
+        slow_count = sum(1 for rule in report.rules if rule.superlinear)
+        self.bench_status_label.setText(
+            f"共 {len(report.lines)} 行、{len(report.rules)} 条规则，耗时 {report.elapsed_ms:.0f}ms"
+            + (f"，{slow_count} 条规则耗时超线性增长" if slow_count else "")
+        )
+        self.bench_result_view.setHtml(self.build_rule_bench_html(report))
+    
+    def build_rule_bench_html(self, report: RuleBenchReport) -> str:
         """
+        生成规则测试结果HTML
         
-        dark_qss = """
-            SubtitleLabel {
-                font-size: 18px;
-                font-weight: bold;
-                color: #ecf0f1;
-                padding: 5px 0px;
-            }
+        Args:
+            report: 测试报告
+            
+        Returns:
+            HTML文本
         """
+        from html import escape
+        
+        colors = THEME_COLORS["dark" if isDarkTheme() else "light"]
+        level_colors = {
+            'h1': colors['h1'],
+            'h2': colors['h2'],
+            'h3': colors['h3'],
+            'special_format': colors['special'],
+            'normal': colors['normal'],
+        }
+        level_names = {
+            'h1': '一级标题',
+            'h2': '二级标题',
+            'h3': '三级标题',
+            'special_format': '特殊格式',
+            'normal': '正文',
+        }
         
-        setCustomStyleSheet(label, light_qss, dark_qss)
+        parts = ['<h4>规则</h4>']
+        for rule in report.rules:
+            color = level_colors[rule.level]
+            line = (
+                f'<span style="color:{color};"><b>[{level_names[rule.level]}] {escape(rule.name)}</b></span>'
+                f'：命中 {len(rule.matched_lines)} 行 · {rule.total_ms:.3f}ms'
+            )
+            if rule.growth_exponent is not None:
+                line += f' · 增长指数 {rule.growth_exponent:.2f}'
+            if rule.superlinear:
+                line += ' <span style="color:#d13438;">⚠ 耗时随行长超线性增长</span>'
+            if rule.error:
+                line += f' <span style="color:#d13438;">⚠ {escape(rule.error)}</span>'
+            parts.append(f'<div>{line}</div>')
+        
+        parts.append('<h4>逐行结果</h4>')
+        matched_sets = [set(rule.matched_lines) for rule in report.rules]
+        for index, (text, level, rule_index) in enumerate(
+                zip(report.lines, report.line_levels, report.line_rules), 1):
+            color = level_colors[level]
+            label = level_names[level]
+            if rule_index is not None:
+                label += f' · {escape(report.rules[rule_index].name)}'
+            # 同时命中的其他规则（被前面的级别或规则覆盖）
+            shadowed = [
+                escape(rule.name) for i, rule in enumerate(report.rules)
+                if i != rule_index and index - 1 in matched_sets[i]
+            ]
+            extra = f' <span style="color:#888888;">（也匹配：{"、".join(shadowed)}）</span>' if shadowed else ''
+            parts.append(
+                f'<div><span style="color:#888888;">{index}.</span> '
+                f'<span style="color:{color};"><b>[{label}]</b> {escape(text)}</span>{extra}</div>'
+            )
+        return ''.join(parts)
+    
+    def update_group_box_style(self, group_box):
+        """更新群组框样式以适应当前主题"""
+        StyleSheetRegistry.apply(group_box, 'group_box')
+    
+    def apply_theme_background(self):
+        """为配置界面应用主题背景"""
+        StyleSheetRegistry.apply(self, 'config_background')
+    
+    
+    def apply_title_label_style(self, label):
+        """为标题标签应用样式"""
+        StyleSheetRegistry.apply(label, 'title_label')
     
     def apply_scroll_area_style(self):
         """为滚动区域应用特殊样式"""
-        # 美化滚动区域样式
-        light_qss = """
-            QScrollArea {
-                background: transparent;
-                border: none;
-                border-radius: 8px;
-            }
-            QScrollBar:vertical {
-                background-color: rgba(0, 0, 0, 0.05);
-                width: 8px;
-                border-radius: 4px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: rgba(0, 0, 0, 0.2);
-                border-radius: 4px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: rgba(0, 0, 0, 0.3);
-            }
-        """
-        
-        dark_qss = """
-            QScrollArea {
-                background: transparent;
-                border: none;
-                border-radius: 8px;
-            }
-            QScrollBar:vertical {
-                background-color: rgba(255, 255, 255, 0.05);
-                width: 8px;
-                border-radius: 4px;
-            }
-            QScrollBar::handle:vertical {
-                background-color: rgba(255, 255, 255, 0.2);
-                border-radius: 4px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background-color: rgba(255, 255, 255, 0.3);
-            }
-        """
-        
-        setCustomStyleSheet(self.scroll, light_qss, dark_qss)
+        StyleSheetRegistry.apply(self.scroll, 'scroll_area')
         # 内容区域保持透明背景
         self.scroll_content.setStyleSheet("QWidget{background: transparent}")
     
@@ -898,45 +1065,7 @@ class ConfigInterface(QWidget):
     
     def apply_save_button_style(self, button):
         """为保存按钮应用特殊样式"""
-        light_qss = """
-            PrimaryPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #0078d4, stop:1 #106ebe);
-                border: 1px solid #005a9e;
-                border-radius: 6px;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            PrimaryPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #106ebe, stop:1 #005a9e);
-            }
-            PrimaryPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #005a9e, stop:1 #004578);
-            }
-        """
-        
-        dark_qss = """
-            PrimaryPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #0066cc, stop:1 #004499);
-                border: 1px solid #003366;
-                border-radius: 6px;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            PrimaryPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #0080ff, stop:1 #0066cc);
-            }
-            PrimaryPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #004499, stop:1 #003366);
-            }
-        """
-        
-        setCustomStyleSheet(button, light_qss, dark_qss)
+        StyleSheetRegistry.apply(button, 'save_button')
     
     def on_config_changed(self, level):
         """配置改变时的处理"""
@@ -946,12 +1075,13 @@ class ConfigInterface(QWidget):
         """主题改变时的处理"""
         from qfluentwidgets import setTheme, Theme
         
+        # lazy=True：当前不可见的组件在下次显示时再更新样式，避免一次性重设所有规则组件
         if theme_text == "浅色":
-            setTheme(Theme.LIGHT)
+            setTheme(Theme.LIGHT, lazy=True)
         elif theme_text == "深色":
-            setTheme(Theme.DARK)
+            setTheme(Theme.DARK, lazy=True)
         else:  # 自动
-            setTheme(Theme.AUTO)
+            setTheme(Theme.AUTO, lazy=True)
             
         InfoBar.success(
             title="主题已切换",
@@ -963,6 +1093,173 @@ class ConfigInterface(QWidget):
             parent=self
         )
     
+    def showEvent(self, e):
+        """切换到设置页面时刷新规则统计、缓存统计、历史统计和内存峰值"""
+        super().showEvent(e)
+        self.refresh_rule_stats()
+        self.refresh_result_cache_stats()
+        self.refresh_history_stats()
+        self.refresh_memory_stats()
+    
+    def refresh_rule_stats(self):
+        """刷新所有卡片中的规则统计"""
+        for card in self.config_cards.values():
+            card.refresh_rule_stats()
+    
+    def on_rule_profiler_toggled(self, checked: bool):
+        """开启或关闭规则性能统计"""
+        rule_profiler.set_enabled(checked)
+        self.refresh_rule_stats()
+    
+    def on_result_cache_toggled(self, checked: bool):
+        """开启或关闭处理结果缓存（与命令行共用该设置）"""
+        result_cache.set_enabled(checked)
+        user_config_manager.save_result_cache_enabled(checked)
+    
+    def refresh_result_cache_stats(self):
+        """刷新处理结果缓存的条目数和大小"""
+        stats = result_cache.stats()
+        self.cache_stats_label.setText(
+            f"{stats['entries']} 条，{stats['bytes'] / (1024 * 1024):.1f} MB"
+        )
+    
+    def clear_result_cache(self):
+        """清空处理结果缓存"""
+        result_cache.clear()
+        self.refresh_result_cache_stats()
+        InfoBar.success(
+            title="已清空",
+            content="处理结果缓存已清空",
+            orient=Qt.Orientation.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP_RIGHT,
+            duration=2000,
+            parent=self
+        )
+    
+    def on_history_toggled(self, checked: bool):
+        """开启或关闭保存处理历史（已有记录保留）"""
+        history_store.set_enabled(checked)
+        user_config_manager.save_history_enabled(checked)
+    
+    def refresh_history_stats(self):
+        """刷新处理历史的记录数和大小"""
+        stats = history_store.stats()
+        self.history_stats_label.setText(
+            f"{stats['entries']} 条，{stats['bytes'] / (1024 * 1024):.1f} MB"
+        )
+    
+    def clear_history(self):
+        """清空处理历史"""
+        history_store.clear()
+        self.refresh_history_stats()
+        InfoBar.success(
+            title="已清空",
+            content="处理历史已清空",
+            orient=Qt.Orientation.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP_RIGHT,
+            duration=2000,
+            parent=self
+        )
+    
+    def on_rule_optimizer_toggled(self, checked: bool):
+        """开启或关闭规则顺序优化（识别结果不变，只调整匹配顺序）"""
+        rule_optimizer.set_enabled(checked)
+    
+    def reset_rule_stats(self):
+        """清空规则统计数据（同时清空规则顺序优化的命中统计）"""
+        rule_profiler.reset()
+        rule_optimizer.reset()
+        self.refresh_rule_stats()
+    
+    def export_rule_stats(self):
+        """导出规则统计数据为JSON"""
+        from PyQt6.QtWidgets import QFileDialog
+        
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "导出规则统计",
+            "textpolish_rule_stats.json",
+            "JSON文件 (*.json)"
+        )
+        if not file_path:
+            return
+        
+        try:
+            rule_profiler.export_json(file_path)
+            InfoBar.success(
+                title="导出成功",
+                content=f"规则统计已导出到: {file_path}",
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP_RIGHT,
+                duration=3000,
+                parent=self
+            )
+        except Exception as e:
+            InfoBar.error(
+                title="导出失败",
+                content=f"导出规则统计时出错: {str(e)}",
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP_RIGHT,
+                duration=3000,
+                parent=self
+            )
+    
+    def on_memory_profiler_toggled(self, checked: bool):
+        """开启或关闭内存分析（关闭时保留已记录的数据）"""
+        memory_profiler.set_enabled(checked)
+        self.refresh_memory_stats()
+    
+    def refresh_memory_stats(self):
+        """刷新已记录的内存峰值"""
+        if not memory_profiler.stages:
+            self.memory_stats_label.setText("暂无记录")
+            return
+        self.memory_stats_label.setText(f"峰值 {memory_profiler.peak_bytes / (1024 * 1024):.1f} MB")
+    
+    def reset_memory_stats(self):
+        """清空内存分析记录"""
+        memory_profiler.reset()
+        self.refresh_memory_stats()
+    
+    def export_memory_report(self):
+        """导出内存分析报告（文本或JSON）"""
+        from PyQt6.QtWidgets import QFileDialog
+        
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "导出内存分析报告",
+            "textpolish_memory_profile.txt",
+            "文本文件 (*.txt);;JSON文件 (*.json)"
+        )
+        if not file_path:
+            return
+        
+        try:
+            memory_profiler.write_report(file_path)
+            InfoBar.success(
+                title="导出成功",
+                content=f"内存分析报告已导出到: {file_path}",
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP_RIGHT,
+                duration=3000,
+                parent=self
+            )
+        except Exception as e:
+            InfoBar.error(
+                title="导出失败",
+                content=f"导出内存分析报告时出错: {str(e)}",
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP_RIGHT,
+                duration=3000,
+                parent=self
+            )
+    
     def get_title_matching_settings(self):
         """获取标题匹配设置"""
         return {
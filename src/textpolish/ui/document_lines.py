@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+文档行模块 - 按段落遍历编辑器中的QTextDocument，作为处理流水线的行输入
+
+toPlainText() 每次都会把整篇文档复制成一个新字符串，粘贴整本书时再加上 strip() 的副本，
+会在界面线程上产生两份完整文本。这里逐个读取QTextBlock的文本，一次只持有一行。
+"""
+
+from typing import Iterator
+
+from PyQt6.QtGui import QTextDocument
+
+from ..core.text_processor import strip_lines
+
+
+# toPlainText() 会把不换行空格替换为普通空格、把段内换行（Shift+Enter）替换为换行符，逐段读取时同样处理
+_NBSP = '\u00a0'
+_LINE_SEPARATOR = '\u2028'
+
+
+class DocumentLines:
+    """编辑器文档的文本行（可以重复遍历，每次遍历都从文档中逐段读取）"""
+
+    def __init__(self, document: QTextDocument, strip: bool = True):
+        """
+        初始化文档行
+
+        Args:
+            document: 编辑器文档
+            strip: 是否去除整篇文本首尾的空白（与 toPlainText().strip() 一致）
+        """
+        self.document = document
+        self.strip = strip
+
+    def __iter__(self) -> Iterator[str]:
+        lines = self._iter_blocks()
+        return strip_lines(lines) if self.strip else lines
+
+    def _iter_blocks(self) -> Iterator[str]:
+        """逐段读取文本（结果以换行连接后与 toPlainText() 相同）"""
+        block = self.document.begin()
+        while block.isValid():
+            text = block.text()
+            if _NBSP in text or _LINE_SEPARATOR in text:
+                yield from text.replace(_NBSP, ' ').split(_LINE_SEPARATOR)
+            else:
+                yield text
+            block = block.next()
+
+    def is_blank(self) -> bool:
+        """文档是否只有空白（遇到第一个非空白行即停止）"""
+        return not any(line.strip() for line in self._iter_blocks())
+
+    def char_count(self) -> int:
+        """文档字符数（与 len(toPlainText()) 相同，不需要生成文本）"""
+        return self.document.characterCount() - 1
@@ -3,22 +3,36 @@
 主界面组件 - 包含文本处理的主要UI组件
 """
 
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QApplication
-from PyQt6.QtCore import Qt, pyqtSignal
+import time
+from typing import Optional
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QApplication, QFileDialog, QListWidgetItem
+)
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QThreadPool
 from PyQt6.QtGui import QFont
 from qfluentwidgets import (
     BodyLabel, PlainTextEdit, PrimaryPushButton, PushButton, 
     TransparentPushButton, InfoBar, InfoBarPosition, Theme, setTheme, 
-    CardWidget, setFont, FluentIcon as FIF, isDarkTheme, CheckBox, TextBrowser
+    CardWidget, setFont, FluentIcon as FIF, isDarkTheme, CheckBox, TextBrowser,
+    SearchLineEdit, ListWidget
 )
 
-from ..core.text_processor import TextProcessor
-from ..core.html_generator import HTMLGenerator
+from ..core.pipeline import PolishPipeline
+from ..core.history_store import history_store
+from ..core.result_cache import result_cache
+from ..core.docx_writer import DocxWriter
 from ..utils.clipboard import ClipboardManager
+from ..utils.memory_profiler import memory_profiler
+from .background_tasks import HistorySaveTask
+from .document_lines import DocumentLines
+from .preview_loader import ProgressivePreview
 from ..config import (
     WINDOW_WIDTH, WINDOW_HEIGHT, BUTTON_WIDTH, BUTTON_HEIGHT, 
     PRIMARY_BUTTON_HEIGHT, SPLITTER_SIZES, SPLITTER_HANDLE_WIDTH,
-    FONTS, MESSAGES
+    FONTS, MESSAGES, DOCX_DEFAULT_FILENAME, HISTORY_PANEL_WIDTH, HISTORY_SEARCH_DELAY_MS,
+    CLIPBOARD_FILE_FALLBACK_CHARS,
+    user_config_manager
 )
 
 
@@ -32,14 +46,21 @@ class TextPolishInterface(QWidget):
         super().__init__(parent)
         self.setObjectName("TextPolishInterface")
         
-        # 初始化核心组件
-        self.text_processor = TextProcessor()
-        self.html_generator = HTMLGenerator()
+        # 初始化核心组件（处理器由流水线持有，快速格式化与常规处理共用同一组实例）
+        result_cache.set_enabled(user_config_manager.load_result_cache_enabled())
+        history_store.set_enabled(user_config_manager.load_history_enabled())
+        self.pipeline = PolishPipeline(result_cache)
+        self.text_processor = self.pipeline.text_processor
+        self.html_generator = self.pipeline.html_generator
         self.clipboard_manager = ClipboardManager()
         
         # 状态变量
         self.processed_text = ""
+        # 富文本导入时各段落的级别提示（与processed_text的非空行对应）
+        self.level_hints = None
         self.config_interface = None  # 配置界面引用
+        # 正在后台保存的处理历史任务
+        self.history_tasks = set()
         
         # 初始化UI
         self.initUI()
@@ -61,13 +82,16 @@ class TextPolishInterface(QWidget):
         input_card = self.create_input_card()
         button_widget = self.create_button_widget()
         output_card = self.create_output_card()
+        self.history_card = self.create_history_card()
         
         splitter.addWidget(input_card)
         splitter.addWidget(button_widget)
         splitter.addWidget(output_card)
+        splitter.addWidget(self.history_card)
         
-        # 设置分割器比例
-        splitter.setSizes(SPLITTER_SIZES)
+        # 设置分割器比例（历史面板默认隐藏）
+        splitter.setSizes(SPLITTER_SIZES + [HISTORY_PANEL_WIDTH])
+        self.history_card.hide()
         splitter.setChildrenCollapsible(False)
         
         # 保存分割器引用
@@ -142,6 +166,56 @@ class TextPolishInterface(QWidget):
         
         layout.addWidget(self.html_preview, 1)
         
+        # 长文档分批填充预览
+        self.preview_loader = ProgressivePreview(self.html_preview, self)
+        
+        return card
+    
+    def create_history_card(self):
+        """创建处理历史面板"""
+        card = CardWidget()
+        layout = QVBoxLayout(card)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(5)
+        
+        # 标题
+        title = BodyLabel("处理历史")
+        setFont(title, FONTS['ui_label']['size'])
+        layout.addWidget(title)
+        
+        # 搜索框（停止输入片刻后搜索，连续输入时不逐字查询）
+        self.history_search = SearchLineEdit()
+        self.history_search.setPlaceholderText("搜索处理过的内容...")
+        self.history_search_timer = QTimer(self)
+        self.history_search_timer.setSingleShot(True)
+        self.history_search_timer.setInterval(HISTORY_SEARCH_DELAY_MS)
+        self.history_search_timer.timeout.connect(self.refresh_history_list)
+        self.history_search.textChanged.connect(self.history_search_timer.start)
+        layout.addWidget(self.history_search)
+        
+        # 记录列表（双击重新格式复制）
+        self.history_list = ListWidget()
+        self.history_list.setWordWrap(True)
+        self.history_list.itemDoubleClicked.connect(lambda item: self.copy_history_entry())
+        layout.addWidget(self.history_list, 1)
+        
+        button_layout = QHBoxLayout()
+        button_layout.setSpacing(5)
+        
+        copy_button = PushButton(FIF.COPY, "格式复制")
+        copy_button.clicked.connect(self.copy_history_entry)
+        button_layout.addWidget(copy_button)
+        
+        load_button = PushButton(FIF.DOCUMENT, "载入")
+        load_button.clicked.connect(self.load_history_entry)
+        button_layout.addWidget(load_button)
+        
+        delete_button = TransparentPushButton(FIF.DELETE, "删除")
+        delete_button.clicked.connect(self.delete_history_entry)
+        button_layout.addWidget(delete_button)
+        
+        layout.addLayout(button_layout)
+        
         return card
     
     def create_button_widget(self):
@@ -161,6 +235,12 @@ class TextPolishInterface(QWidget):
         self.process_btn.clicked.connect(self.process_text)
         layout.addWidget(self.process_btn, 0, Qt.AlignmentFlag.AlignCenter)
         
+        # 富文本粘贴按钮
+        self.paste_rich_btn = PushButton(FIF.PASTE, "富文本粘贴")
+        self.paste_rich_btn.setFixedSize(BUTTON_WIDTH, BUTTON_HEIGHT)
+        self.paste_rich_btn.clicked.connect(self.paste_rich_text)
+        layout.addWidget(self.paste_rich_btn, 0, Qt.AlignmentFlag.AlignCenter)
+        
         # 清空按钮
         self.clear_btn = TransparentPushButton(FIF.DELETE, "清空所有")
         self.clear_btn.setFixedSize(BUTTON_WIDTH, BUTTON_HEIGHT)
@@ -179,6 +259,18 @@ class TextPolishInterface(QWidget):
         self.copy_formatted_btn.clicked.connect(self.copy_formatted_result)
         layout.addWidget(self.copy_formatted_btn, 0, Qt.AlignmentFlag.AlignCenter)
         
+        # 导出DOCX按钮
+        self.export_docx_btn = PushButton(FIF.SAVE_AS, "导出DOCX")
+        self.export_docx_btn.setFixedSize(BUTTON_WIDTH, BUTTON_HEIGHT)
+        self.export_docx_btn.clicked.connect(self.export_docx)
+        layout.addWidget(self.export_docx_btn, 0, Qt.AlignmentFlag.AlignCenter)
+        
+        # 处理历史按钮
+        self.history_btn = TransparentPushButton(FIF.HISTORY, "历史记录")
+        self.history_btn.setFixedSize(BUTTON_WIDTH, BUTTON_HEIGHT)
+        self.history_btn.clicked.connect(self.toggle_history_panel)
+        layout.addWidget(self.history_btn, 0, Qt.AlignmentFlag.AlignCenter)
+        
         
         # 添加底部弹簧
         layout.addStretch(1)
@@ -189,13 +281,255 @@ class TextPolishInterface(QWidget):
         """设置配置界面引用"""
         self.config_interface = config_interface
     
+    def load_input_text(self, text: str):
+        """
+        载入文本到输入框并立即处理
+        
+        Args:
+            text: 要处理的文本
+        """
+        self.input_text.setPlainText(text)
+        self.process_text()
+    
+    def load_input_file(self, file_path: str):
+        """
+        从文件载入文本并处理
+        
+        Args:
+            file_path: 文本文件路径
+        """
+        try:
+            try:
+                with open(file_path, 'r', encoding='utf-8-sig') as f:
+                    text = f.read()
+            except UnicodeDecodeError:
+                # 兼容中文Windows下常见的GBK编码文件
+                with open(file_path, 'r', encoding='gbk') as f:
+                    text = f.read()
+        except Exception as e:
+            InfoBar.error(
+                title=MESSAGES['error']['file_load_failed'],
+                content=str(e),
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP,
+                duration=2000,
+                parent=self
+            )
+            return
+        
+        self.load_input_text(text)
+    
+    def load_input_from_clipboard(self):
+        """从剪贴板载入文本并处理"""
+        try:
+            text = self.clipboard_manager.get_plain_text()
+        except Exception as e:
+            InfoBar.error(
+                title=MESSAGES['error']['clipboard_read_failed'],
+                content=str(e),
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP,
+                duration=2000,
+                parent=self
+            )
+            return
+        
+        if not text.strip():
+            InfoBar.warning(
+                title="提示",
+                content=MESSAGES['warning']['empty_clipboard'],
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP,
+                duration=1000,
+                parent=self
+            )
+            return
+        
+        self.load_input_text(text)
+    
+    def paste_rich_text(self):
+        """
+        从剪贴板读取富文本（HTML）并处理
+        
+        HTML中的标题和段首加粗直接决定段落级别；剪贴板中没有HTML时按纯文本处理。
+        """
+        html = self.clipboard_manager.get_html_text()
+        if not html:
+            self.load_input_from_clipboard()
+            return
+        
+        try:
+            result = self.pipeline.polish_html(html, **self.get_enabled_levels())
+            if not result.cleaned_text.strip():
+                InfoBar.warning(
+                    title="提示",
+                    content=MESSAGES['warning']['empty_clipboard'],
+                    orient=Qt.Orientation.Horizontal,
+                    isClosable=True,
+                    position=InfoBarPosition.TOP,
+                    duration=1000,
+                    parent=self
+                )
+                return
+            
+            self.input_text.setPlainText(result.cleaned_text)
+            self.processed_text = result.cleaned_text
+            self.level_hints = result.level_hints
+            self.show_preview(result.blocks)
+            self.record_history(result)
+            
+            known = sum(1 for hint in result.level_hints or () if hint is not None)
+            InfoBar.success(
+                title=MESSAGES['success']['process_complete'],
+                content=f"已从富文本导入 {len(result.cleaned_text)} 字符，其中 {known} 个段落按原格式识别",
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP,
+                duration=1000,
+                parent=self
+            )
+            
+        except Exception as e:
+            InfoBar.error(
+                title=MESSAGES['error']['process_failed'],
+                content=str(e),
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP,
+                duration=1000,
+                parent=self
+            )
+    
+    def get_enabled_levels(self) -> dict:
+        """
+        获取当前启用的标题级别
+        
+        Returns:
+            包含enable_h1、enable_h2、enable_h3、enable_special的字典
+        """
+        if self.config_interface:
+            return self.config_interface.get_title_matching_settings()
+        # 默认全部启用
+        return {'enable_h1': True, 'enable_h2': True, 'enable_h3': True, 'enable_special': True}
+    
+    def quick_polish(self) -> bool:
+        """
+        快速格式化：读取剪贴板 → 清理 → 生成WPS格式 → 写回剪贴板，一步完成
+        
+        界面同步（输入框、预览）放在剪贴板写入之后进行，不计入处理耗时。
+        
+        Returns:
+            是否处理成功
+        """
+        try:
+            # 优先使用富文本：HTML中的标题、加粗结构可以直接确定段落级别
+            html = self.clipboard_manager.get_html_text()
+            if html:
+                result = self.pipeline.polish_html(html, **self.get_enabled_levels())
+                text = result.cleaned_text
+            else:
+                text = self.clipboard_manager.get_plain_text()
+                result = None
+            
+            if not text.strip():
+                InfoBar.warning(
+                    title="提示",
+                    content=MESSAGES['warning']['empty_clipboard'],
+                    orient=Qt.Orientation.Horizontal,
+                    isClosable=True,
+                    position=InfoBarPosition.TOP,
+                    duration=1000,
+                    parent=self
+                )
+                return False
+            
+            if result is None:
+                result = self.pipeline.polish(text, **self.get_enabled_levels())
+            # 已有清理后的纯文本，无需再从HTML中提取
+            file_path = self.copy_formatted_content(result.blocks, result.cleaned_text, result.snapshot)
+            
+        except Exception as e:
+            InfoBar.error(
+                title=MESSAGES['error']['formatted_copy_failed'],
+                content=str(e),
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP,
+                duration=1000,
+                parent=self
+            )
+            return False
+        
+        QTimer.singleShot(0, lambda: self.show_quick_polish_result(text, result, file_path))
+        return True
+    
+    def copy_formatted_content(self, blocks, cleaned_text: str, snapshot=None) -> Optional[str]:
+        """
+        按内容大小选择复制方式
+        
+        WPS兼容HTML在上限以内时直接写入剪贴板；超过上限时停止生成HTML，改为由同一组段落块
+        导出DOCX临时文件并复制文件链接，避免写入剪贴板和WPS/Word粘贴时解析HTML的卡顿。
+        
+        Args:
+            blocks: 已识别的段落块
+            cleaned_text: 清理后的纯文本
+            snapshot: 识别时使用的配置快照（默认使用当前快照）
+            
+        Returns:
+            使用临时文件时返回文件路径，否则返回None
+        """
+        with memory_profiler.stage('clipboard'):
+            if snapshot is None:
+                snapshot = user_config_manager.snapshot()
+            html_content = self.html_generator.render_wps_html(blocks, CLIPBOARD_FILE_FALLBACK_CHARS, snapshot)
+            if html_content is not None:
+                self.clipboard_manager.copy_rich_text(html_content, cleaned_text)
+                return None
+            
+            file_path = self.clipboard_manager.create_temp_file('.docx')
+            DocxWriter(snapshot).write(blocks, file_path)
+            self.clipboard_manager.copy_file(file_path)
+            return file_path
+    
+    def show_quick_polish_result(self, text: str, result, file_path: Optional[str] = None):
+        """
+        将快速格式化的结果同步到界面
+        
+        Args:
+            text: 原始剪贴板文本
+            result: 流水线处理结果
+            file_path: 内容过大改为复制临时文件时的文件路径
+        """
+        self.input_text.setPlainText(text)
+        self.processed_text = result.cleaned_text
+        self.level_hints = result.level_hints
+        self.show_preview(result.blocks)
+        self.record_history(result)
+        
+        if file_path:
+            content = MESSAGES['info']['clipboard_file_notice'].format(path=file_path)
+        else:
+            content = "格式化结果已写回剪贴板，可直接粘贴到WPS/Word"
+        InfoBar.success(
+            title=MESSAGES['success']['quick_polish_complete'],
+            content=content,
+            orient=Qt.Orientation.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP,
+            duration=1000,
+            parent=self
+        )
+    
     def process_text(self):
         """处理文本"""
         try:
-            # 获取输入文本
-            input_content = self.input_text.toPlainText().strip()
+            # 逐段读取输入文本（不生成整篇文本的副本）
+            input_lines = DocumentLines(self.input_text.document())
             
-            if not input_content:
+            if input_lines.is_blank():
                 InfoBar.warning(
                     title="提示",
                     content=MESSAGES['warning']['no_input'],
@@ -210,34 +544,22 @@ class TextPolishInterface(QWidget):
             self.status_updated.emit(MESSAGES['info']['processing'])
             QApplication.processEvents()
             
-            # 处理文本
-            cleaned_text = self.text_processor.clean_text(input_content)
+            # 处理文本（相同文档和配置的结果直接从缓存读取）
+            result = self.pipeline.polish_lines(input_lines, **self.get_enabled_levels())
+            cleaned_text = result.cleaned_text
             
-            # 获取标题匹配设置
-            if self.config_interface:
-                settings = self.config_interface.get_title_matching_settings()
-                enable_h1 = settings['enable_h1']
-                enable_h2 = settings['enable_h2']
-                enable_h3 = settings['enable_h3']
-                enable_special = settings['enable_special']
-            else:
-                # 默认全部启用
-                enable_h1 = enable_h2 = enable_h3 = enable_special = True
-            
-            # 生成HTML并显示预览
-            body_content = self.html_generator.convert_to_html(cleaned_text, enable_h1, enable_h2, enable_h3, enable_special)
-            preview_html = self.html_generator.generate_preview_html(
-                body_content, isDarkTheme()
-            )
-            self.html_preview.setHtml(preview_html)
+            # 显示预览（长文档先显示第一屏，其余段落分批追加）
+            self.show_preview(result.blocks)
             
-            # 保存处理后的纯文本
+            # 保存处理后的纯文本（来自输入框的文本没有级别提示）
             self.processed_text = cleaned_text
+            self.level_hints = None
+            self.record_history(result)
             
             # 显示成功提示
             InfoBar.success(
                 title=MESSAGES['success']['process_complete'],
-                content=f"原始: {len(input_content)} 字符 → 处理后: {len(cleaned_text)} 字符",
+                content=f"原始: {input_lines.char_count()} 字符 → 处理后: {len(cleaned_text)} 字符",
                 orient=Qt.Orientation.Horizontal,
                 isClosable=True,
                 position=InfoBarPosition.TOP,
@@ -262,11 +584,13 @@ class TextPolishInterface(QWidget):
     def clear_all(self):
         """清空所有文本"""
         self.input_text.clear()
+        self.preview_loader.cancel()
         self.html_preview.setMarkdown(
             "## 📄 格式预览\n\n处理后的格式化文本将在这里预览...\n\n"
             "*支持标题层级、字体样式、段落格式等*"
         )
         self.processed_text = ""
+        self.level_hints = None
         
         InfoBar.info(
             title=MESSAGES['info']['cleared'],
@@ -343,14 +667,15 @@ class TextPolishInterface(QWidget):
                 # 默认全部启用
                 enable_h1 = enable_h2 = enable_h3 = enable_special = True
             
-            # 转换为WPS格式HTML
-            body_content = self.html_generator.convert_to_html(
-                self.processed_text, enable_h1, enable_h2, enable_h3, enable_special
+            # 按当前级别设置识别一次，WPS格式HTML和DOCX都由这组段落块生成
+            snapshot = user_config_manager.snapshot()
+            blocks = self.html_generator.classify(
+                self.processed_text, enable_h1, enable_h2, enable_h3, enable_special,
+                snapshot, self.level_hints
             )
-            html_content = self.html_generator.generate_wps_html(body_content)
             
-            # 复制到剪贴板
-            self.clipboard_manager.copy_rich_text(html_content)
+            # 复制到剪贴板（内容过大时改为复制临时文件）
+            file_path = self.copy_formatted_content(blocks, self.processed_text, snapshot)
             
             # 生成提示信息
             selected_levels = []
@@ -364,10 +689,65 @@ class TextPolishInterface(QWidget):
                 selected_levels.append("特殊格式")
             
             levels_text = "、".join(selected_levels) if selected_levels else "无格式"
+            content = f"已应用{levels_text}格式，可直接粘贴到WPS/Word等软件"
+            if file_path:
+                content = MESSAGES['info']['clipboard_file_notice'].format(path=file_path)
             
             InfoBar.success(
                 title=MESSAGES['success']['copy_success'],
-                content=f"已应用{levels_text}格式，可直接粘贴到WPS/Word等软件",
+                content=content,
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP,
+                duration=2000,
+                parent=self
+            )
+            
+        except Exception as e:
+            InfoBar.error(
+                title=MESSAGES['error']['formatted_copy_failed'],
+                content=str(e),
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP,
+                duration=1000,
+                parent=self
+            )
+    
+    def export_docx(self):
+        """将处理结果直接导出为Word文档（不经过剪贴板和HTML导入）"""
+        if not self.processed_text:
+            InfoBar.warning(
+                title="提示",
+                content=MESSAGES['warning']['no_content'],
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP,
+                duration=1000,
+                parent=self
+            )
+            return
+        
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出DOCX", DOCX_DEFAULT_FILENAME, "Word 文档 (*.docx)"
+        )
+        if not file_path:
+            return
+        if not file_path.lower().endswith('.docx'):
+            file_path += '.docx'
+        
+        try:
+            # 识别和写入使用同一份配置快照
+            snapshot = user_config_manager.snapshot()
+            blocks = self.html_generator.parse_blocks(
+                self.processed_text, **self.get_enabled_levels(), snapshot=snapshot,
+                level_hints=self.level_hints
+            )
+            count = DocxWriter(snapshot).write(blocks, file_path)
+            
+            InfoBar.success(
+                title=MESSAGES['success']['docx_export_success'],
+                content=f"已导出 {count} 个段落到 {file_path}",
                 orient=Qt.Orientation.Horizontal,
                 isClosable=True,
                 position=InfoBarPosition.TOP,
@@ -375,6 +755,128 @@ class TextPolishInterface(QWidget):
                 parent=self
             )
             
+        except Exception as e:
+            InfoBar.error(
+                title=MESSAGES['error']['docx_export_failed'],
+                content=str(e),
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP,
+                duration=2000,
+                parent=self
+            )
+    
+    def show_preview(self, blocks):
+        """
+        显示格式预览（取消上一次尚未完成的分批填充）
+        
+        预览使用精简的class样式HTML，WPS格式只在格式复制时生成。
+        
+        Args:
+            blocks: 识别级别后的段落块
+        """
+        with memory_profiler.stage('preview'):
+            self.preview_loader.show(
+                self.html_generator.render_preview_blocks(blocks),
+                self.html_generator.generate_preview_stylesheet(isDarkTheme())
+            )
+    
+    def record_history(self, result):
+        """
+        在后台线程中把处理结果保存到处理历史（保存后历史面板打开时刷新列表）
+        
+        Args:
+            result: 流水线处理结果
+        """
+        if not history_store.enabled:
+            return
+        task = HistorySaveTask(result.cleaned_text, result.blocks, result.level_hints)
+        task.signals.finished.connect(lambda entry_id: self.apply_history_saved(task, entry_id))
+        # 保存完成前保留任务，信号对象才不会被提前回收
+        self.history_tasks.add(task)
+        QThreadPool.globalInstance().start(task)
+    
+    def apply_history_saved(self, task, entry_id):
+        """
+        历史保存完成
+        
+        Args:
+            task: 保存任务
+            entry_id: 记录编号（未保存时为None）
+        """
+        self.history_tasks.discard(task)
+        if entry_id is not None and self.history_card.isVisible():
+            self.refresh_history_list()
+    
+    def toggle_history_panel(self):
+        """显示或隐藏处理历史面板"""
+        visible = not self.history_card.isVisible()
+        self.history_card.setVisible(visible)
+        if visible:
+            self.refresh_history_list()
+            self.history_search.setFocus()
+    
+    def showEvent(self, e):
+        """回到主界面时刷新历史列表（设置页面中可能清空了历史）"""
+        super().showEvent(e)
+        if self.history_card.isVisible():
+            self.refresh_history_list()
+    
+    def refresh_history_list(self):
+        """按搜索框内容刷新历史列表（为空时列出最近的记录）"""
+        entries = history_store.search(self.history_search.text())
+        self.history_list.clear()
+        for entry in entries:
+            created = time.strftime('%m-%d %H:%M', time.localtime(entry.created))
+            text = f"{entry.title or '（无标题）'}\n{created} · {entry.char_count} 字"
+            if entry.snippet:
+                text += f"\n{entry.snippet}"
+            item = QListWidgetItem(text)
+            item.setData(Qt.ItemDataRole.UserRole, entry.id)
+            self.history_list.addItem(item)
+    
+    def get_selected_history_record(self):
+        """
+        读取历史列表中选中的记录
+        
+        Returns:
+            完整记录；未选中或读取失败时提示并返回None
+        """
+        item = self.history_list.currentItem()
+        if item is None:
+            InfoBar.warning(
+                title="提示",
+                content="请先在历史列表中选择一条记录",
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP,
+                duration=1000,
+                parent=self
+            )
+            return None
+        
+        record = history_store.load(item.data(Qt.ItemDataRole.UserRole))
+        if record is None:
+            InfoBar.error(
+                title=MESSAGES['error']['history_failed'],
+                content="记录不存在或已损坏",
+                orient=Qt.Orientation.Horizontal,
+                isClosable=True,
+                position=InfoBarPosition.TOP,
+                duration=2000,
+                parent=self
+            )
+            self.refresh_history_list()
+        return record
+    
+    def copy_history_entry(self):
+        """把选中的历史记录重新带格式复制到剪贴板（由保存的段落块直接生成，不重新处理）"""
+        record = self.get_selected_history_record()
+        if record is None:
+            return
+        
+        try:
+            file_path = self.copy_formatted_content(record.blocks, record.cleaned_text)
         except Exception as e:
             InfoBar.error(
                 title=MESSAGES['error']['formatted_copy_failed'],
@@ -385,6 +887,40 @@ class TextPolishInterface(QWidget):
                 duration=1000,
                 parent=self
             )
+            return
+        
+        if file_path:
+            content = MESSAGES['info']['clipboard_file_notice'].format(path=file_path)
+        else:
+            content = f"已复制历史记录（{len(record.cleaned_text)} 字符），可直接粘贴到WPS/Word"
+        InfoBar.success(
+            title=MESSAGES['success']['copy_success'],
+            content=content,
+            orient=Qt.Orientation.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP,
+            duration=2000,
+            parent=self
+        )
+    
+    def load_history_entry(self):
+        """把选中的历史记录载入输入框和预览"""
+        record = self.get_selected_history_record()
+        if record is None:
+            return
+        
+        self.input_text.setPlainText(record.cleaned_text)
+        self.processed_text = record.cleaned_text
+        self.level_hints = record.level_hints
+        self.show_preview(record.blocks)
+    
+    def delete_history_entry(self):
+        """删除选中的历史记录"""
+        item = self.history_list.currentItem()
+        if item is None:
+            return
+        history_store.delete(item.data(Qt.ItemDataRole.UserRole))
+        self.refresh_history_list()
     
     def update_preview_theme(self):
         """主题切换时更新预览"""
@@ -401,10 +937,8 @@ class TextPolishInterface(QWidget):
                 enable_h1 = enable_h2 = enable_h3 = enable_special = True
             
             # 重新生成预览HTML
-            body_content = self.html_generator.convert_to_html(
-                self.processed_text, enable_h1, enable_h2, enable_h3, enable_special
-            )
-            preview_html = self.html_generator.generate_preview_html(
-                body_content, isDarkTheme()
+            blocks = self.html_generator.classify(
+                self.processed_text, enable_h1, enable_h2, enable_h3, enable_special,
+                level_hints=self.level_hints
             )
-            self.html_preview.setHtml(preview_html)
+            self.show_preview(blocks)
@@ -3,13 +3,64 @@
 主窗口模块 - 应用程序的主窗口组件
 """
 
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout
 from PyQt6.QtCore import Qt, QTimer
-from qfluentwidgets import FluentWindow, NavigationItemPosition, FluentIcon as FIF, qconfig, SystemThemeListener, isDarkTheme
+from PyQt6.QtGui import QKeySequence, QShortcut
+from qfluentwidgets import FluentWindow, NavigationItemPosition, FluentIcon as FIF, qconfig, SystemThemeListener, isDarkTheme, BodyLabel
 
 from .main_interface import TextPolishInterface
 from ..utils.icon import IconManager
-from ..config import APP_TITLE, WINDOW_WIDTH, WINDOW_HEIGHT
+from ..config import APP_TITLE, WINDOW_WIDTH, WINDOW_HEIGHT, QUICK_POLISH_SHORTCUT
+
+
+class LazyConfigInterface(QWidget):
+    """配置界面占位组件 - 首次切换到配置页时才创建真正的ConfigInterface"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("ConfigInterface")
+        self.interface = None
+        
+        self.main_layout = QVBoxLayout(self)
+        self.main_layout.setContentsMargins(0, 0, 0, 0)
+        
+        # 创建完成前显示的占位提示
+        self.placeholder = BodyLabel("正在加载配置界面...", self)
+        self.placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.main_layout.addWidget(self.placeholder)
+    
+    def showEvent(self, e):
+        """首次显示时在下一轮事件循环中创建配置界面，让占位提示先绘制出来"""
+        super().showEvent(e)
+        if self.interface is None:
+            QTimer.singleShot(0, self.ensure_loaded)
+    
+    def ensure_loaded(self):
+        """
+        确保配置界面已创建
+        
+        Returns:
+            ConfigInterface实例
+        """
+        if self.interface is None:
+            from .config_interface import ConfigInterface
+            self.interface = ConfigInterface(self)
+            
+            self.main_layout.removeWidget(self.placeholder)
+            self.placeholder.deleteLater()
+            self.main_layout.addWidget(self.interface)
+        
+        return self.interface
+    
+    def get_title_matching_settings(self):
+        """获取标题匹配设置（配置界面尚未创建时直接读取已保存的界面设置）"""
+        if self.interface is not None:
+            return self.interface.get_title_matching_settings()
+        
+        from ..config import user_config_manager
+        settings = {'enable_h1': True, 'enable_h2': True, 'enable_h3': True, 'enable_special': True}
+        settings.update(user_config_manager.load_ui_settings())
+        return settings
 
 
 class TextPolishWindow(FluentWindow):
@@ -17,8 +68,11 @@ class TextPolishWindow(FluentWindow):
     
     def __init__(self):
         super().__init__()
+        self.tray_icon = None
+        self.is_quitting = False
         self.initWindow()
         self.initThemeListener()
+        self.initQuickPolish()
     
     def initWindow(self):
         """初始化窗口"""
@@ -75,6 +129,74 @@ class TextPolishWindow(FluentWindow):
         else:
             self.setWindowTitle(self.base_title)
     
+    def initQuickPolish(self):
+        """初始化快速格式化：注册应用内快捷键并在事件循环空闲时预热处理流水线"""
+        self.quickPolishShortcut = QShortcut(QKeySequence(QUICK_POLISH_SHORTCUT), self)
+        self.quickPolishShortcut.setContext(Qt.ShortcutContext.ApplicationShortcut)
+        self.quickPolishShortcut.activated.connect(self.homeInterface.quick_polish)
+        
+        QTimer.singleShot(0, self.homeInterface.pipeline.warm_up)
+    
+    def enable_tray_mode(self) -> bool:
+        """
+        启用托盘常驻模式：关闭窗口时隐藏到托盘而不是退出
+        
+        Returns:
+            系统是否支持托盘
+        """
+        from PyQt6.QtWidgets import QSystemTrayIcon
+        from .tray_icon import TextPolishTrayIcon
+        
+        if not QSystemTrayIcon.isSystemTrayAvailable():
+            print("系统托盘不可用，忽略托盘模式")
+            return False
+        
+        self.tray_icon = TextPolishTrayIcon(self)
+        self.tray_icon.show()
+        QApplication.setQuitOnLastWindowClosed(False)
+        return True
+    
+    def show_from_tray(self):
+        """从托盘恢复并激活主窗口"""
+        if self.isMinimized():
+            self.showNormal()
+        else:
+            self.show()
+        self.raise_()
+        self.activateWindow()
+    
+    def quit_application(self):
+        """真正退出程序（托盘模式下关闭窗口只会隐藏）"""
+        self.is_quitting = True
+        self.close()
+        QApplication.quit()
+    
+    def handle_instance_request(self, request: dict):
+        """
+        处理启动参数或其他实例转发的请求
+        
+        Args:
+            request: 请求字典，可包含file（文件路径）、from_clipboard（是否读取剪贴板）
+                     和quick_polish（是否直接格式化剪贴板）
+        """
+        # 快速格式化不打扰用户当前的窗口布局
+        if request.get('quick_polish'):
+            if self.tray_icon:
+                self.tray_icon.quick_polish()
+            else:
+                self.homeInterface.quick_polish()
+            return
+        
+        # 将窗口带到前台
+        self.show_from_tray()
+        
+        self.switchTo(self.homeInterface)
+        
+        if request.get('file'):
+            self.homeInterface.load_input_file(request['file'])
+        elif request.get('from_clipboard'):
+            self.homeInterface.load_input_from_clipboard()
+    
     def on_theme_changed(self, theme):
         """
         主题切换时的处理
@@ -94,6 +216,15 @@ class TextPolishWindow(FluentWindow):
     
     def closeEvent(self, e):
         """窗口关闭事件处理"""
+        # 托盘模式下关闭窗口只隐藏到托盘
+        if self.tray_icon and not self.is_quitting:
+            e.ignore()
+            self.hide()
+            return
+        
+        if self.tray_icon:
+            self.tray_icon.hide()
+        
         # 停止主题监听器线程
         if hasattr(self, 'themeListener'):
             self.themeListener.terminate()
@@ -110,9 +241,8 @@ class TextPolishWindow(FluentWindow):
     
     def add_config_interface(self):
         """添加配置界面"""
-        # 创建配置界面
-        from .config_interface import ConfigInterface
-        self.configInterface = ConfigInterface(self)
+        # 创建配置界面占位组件，真正的配置界面在首次导航时创建
+        self.configInterface = LazyConfigInterface(self)
         
         # 添加到导航
         self.addSubInterface(
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+分批预览模块 - 把长文档的预览分批填充到TextBrowser中
+
+一次 setHtml 整篇文档时，Qt要排版完全部内容才显示第一屏。这里先显示第一屏的段落，
+其余段落由事件循环分批通过 QTextCursor 追加，期间滚动和其他操作不受影响；
+开始新的预览（或清空预览）时，尚未追加的段落直接丢弃。
+"""
+
+from typing import List
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtGui import QTextCursor, QTextDocument
+
+from ..config import PREVIEW_BATCH_BLOCKS, PREVIEW_FIRST_SCREEN_BLOCKS
+
+
+class ProgressivePreview(QObject):
+    """分批填充预览内容"""
+
+    def __init__(self, browser, parent=None):
+        """
+        初始化分批预览
+
+        Args:
+            browser: 显示预览的TextBrowser
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.browser = browser
+        self._pending: List[str] = []
+        self._stylesheet = ""
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._append_batch)
+
+    def show(self, body_content: str, stylesheet: str) -> None:
+        """
+        显示预览（取消上一次尚未完成的填充）
+
+        Args:
+            body_content: HTML body内容（每个段落一行）
+            stylesheet: 预览样式表
+        """
+        self.cancel()
+        parts = body_content.split('\n') if body_content else []
+        self._stylesheet = stylesheet
+        document = self.browser.document()
+        # 样式表设置为文档默认样式表，之后追加的段落同样适用
+        document.setDefaultStyleSheet(stylesheet)
+        self.browser.setHtml(f"<html><body>{''.join(parts[:PREVIEW_FIRST_SCREEN_BLOCKS])}</body></html>")
+        self._pending = parts[PREVIEW_FIRST_SCREEN_BLOCKS:]
+        if self._pending:
+            self._timer.start()
+
+    def cancel(self) -> None:
+        """停止填充并恢复默认样式表（已显示的内容保留）"""
+        self._timer.stop()
+        self._pending = []
+        self.browser.document().setDefaultStyleSheet("")
+
+    @property
+    def is_loading(self) -> bool:
+        """是否还有段落等待追加"""
+        return bool(self._pending)
+
+    def _append_batch(self) -> None:
+        """追加下一批段落"""
+        batch = self._pending[:PREVIEW_BATCH_BLOCKS]
+        self._pending = self._pending[PREVIEW_BATCH_BLOCKS:]
+        document = self.browser.document()
+
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertBlock()
+        start = cursor.position()
+        cursor.insertHtml(''.join(batch))
+        # 插入到新建的空段落时，第一个段落会沿用上一段的段落格式，需要改回它自己的格式
+        cursor.setPosition(start)
+        cursor.setBlockFormat(self._block_format(batch[0]))
+        cursor.endEditBlock()
+
+        if not self._pending:
+            self._timer.stop()
+
+    def _block_format(self, html: str):
+        """解析单个段落的段落格式"""
+        document = QTextDocument()
+        document.setDefaultStyleSheet(self._stylesheet)
+        document.setHtml(html)
+        return document.begin().blockFormat()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+样式表注册模块 - 集中管理配置界面的主题样式表
+
+每种样式在每个主题下只生成一次并被所有组件共享；规则列表这类数量较多的组件
+由父容器统一设置样式，切换主题时无需逐个重新设置。
+"""
+
+import textwrap
+from typing import Dict, Tuple
+
+from qfluentwidgets import setCustomStyleSheet
+
+
+# 样式名称 -> (浅色主题QSS, 深色主题QSS)
+STYLE_SHEETS: Dict[str, Tuple[str, str]] = {
+    # 规则列表：在规则容器上设置一次，作用于其中所有规则组件和删除按钮
+    'rule_list': (
+        """
+        QWidget#ruleWidget,
+        QWidget#ruleWidget QWidget {
+            background-color: #f8f9fa;
+            border: 1px solid #e9ecef;
+            border-radius: 6px;
+        }
+        QWidget#ruleWidget:hover,
+        QWidget#ruleWidget QWidget:hover {
+            border-color: #ced4da;
+            background-color: #f1f3f4;
+        }
+        QWidget#ruleWidget PushButton#removeRuleButton {
+            color: #ffffff;
+            background-color: #e74c3c;
+            border: 1px solid #c0392b;
+            border-radius: 4px;
+            font-weight: bold;
+        }
+        QWidget#ruleWidget PushButton#removeRuleButton:hover {
+            background-color: #c0392b;
+            border-color: #a93226;
+        }
+        QWidget#ruleWidget PushButton#removeRuleButton:pressed {
+            background-color: #a93226;
+            border-color: #922b21;
+        }
+        """,
+        """
+        QWidget#ruleWidget,
+        QWidget#ruleWidget QWidget {
+            background-color: #3c4043;
+            border: 1px solid #5f6368;
+            border-radius: 6px;
+        }
+        QWidget#ruleWidget:hover,
+        QWidget#ruleWidget QWidget:hover {
+            border-color: #8ab4f8;
+            background-color: #484a4d;
+        }
+        QWidget#ruleWidget PushButton#removeRuleButton {
+            color: #ffffff;
+            background-color: #ff6b6b;
+            border: 1px solid #ff5252;
+            border-radius: 4px;
+            font-weight: bold;
+        }
+        QWidget#ruleWidget PushButton#removeRuleButton:hover {
+            background-color: #ff5252;
+            border-color: #ff3333;
+        }
+        QWidget#ruleWidget PushButton#removeRuleButton:pressed {
+            background-color: #ff3333;
+            border-color: #ff1111;
+        }
+        """,
+    ),
+    'group_box': (
+        """
+        QGroupBox {
+            font-weight: bold;
+            border: 1px solid rgba(128, 128, 128, 0.3);
+            border-radius: 6px;
+            margin-top: 6px;
+            padding-top: 6px;
+            color: #333333;
+        }
+        QGroupBox::title {
+            subcontrol-origin: margin;
+            left: 10px;
+            padding: 0 4px 0 4px;
+            color: #333333;
+        }
+        """,
+        """
+        QGroupBox {
+            font-weight: bold;
+            border: 1px solid rgba(200, 200, 200, 0.3);
+            border-radius: 6px;
+            margin-top: 6px;
+            padding-top: 6px;
+            color: #ffffff;
+        }
+        QGroupBox::title {
+            subcontrol-origin: margin;
+            left: 10px;
+            padding: 0 4px 0 4px;
+            color: #ffffff;
+        }
+        """,
+    ),
+    'title_level_card': (
+        """
+        TitleLevelCard {
+            border: 1px solid rgba(0, 0, 0, 0.08);
+            border-radius: 12px;
+            background-color: #ffffff;
+            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
+        }
+        TitleLevelCard:hover {
+            border-color: rgba(0, 120, 215, 0.3);
+            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15);
+        }
+        """,
+        """
+        TitleLevelCard {
+            border: 1px solid rgba(255, 255, 255, 0.1);
+            border-radius: 12px;
+            background-color: #2d3748;
+            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.3);
+        }
+        TitleLevelCard:hover {
+            border-color: rgba(100, 200, 255, 0.4);
+            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.4);
+        }
+        """,
+    ),
+    'title_label': (
+        """
+        SubtitleLabel {
+            font-size: 18px;
+            font-weight: bold;
+            color: #2c3e50;
+            padding: 5px 0px;
+        }
+        """,
+        """
+        SubtitleLabel {
+            font-size: 18px;
+            font-weight: bold;
+            color: #ecf0f1;
+            padding: 5px 0px;
+        }
+        """,
+    ),
+    'page_title': (
+        """
+        TitleLabel {
+            font-size: 28px;
+            font-weight: bold;
+            color: #1f2937;
+            padding: 16px 0px;
+            margin: 0px;
+        }
+        """,
+        """
+        TitleLabel {
+            font-size: 28px;
+            font-weight: bold;
+            color: #f9fafb;
+            padding: 16px 0px;
+            margin: 0px;
+        }
+        """,
+    ),
+    'config_background': (
+        """
+        ConfigInterface {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #f8fafc, stop:1 #f1f5f9);
+            color: #1e293b;
+        }
+        """,
+        """
+        ConfigInterface {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #0f172a, stop:1 #1e293b);
+            color: #f8fafc;
+        }
+        """,
+    ),
+    'scroll_area': (
+        """
+        QScrollArea {
+            background: transparent;
+            border: none;
+            border-radius: 8px;
+        }
+        QScrollBar:vertical {
+            background-color: rgba(0, 0, 0, 0.05);
+            width: 8px;
+            border-radius: 4px;
+        }
+        QScrollBar::handle:vertical {
+            background-color: rgba(0, 0, 0, 0.2);
+            border-radius: 4px;
+            min-height: 20px;
+        }
+        QScrollBar::handle:vertical:hover {
+            background-color: rgba(0, 0, 0, 0.3);
+        }
+        """,
+        """
+        QScrollArea {
+            background: transparent;
+            border: none;
+            border-radius: 8px;
+        }
+        QScrollBar:vertical {
+            background-color: rgba(255, 255, 255, 0.05);
+            width: 8px;
+            border-radius: 4px;
+        }
+        QScrollBar::handle:vertical {
+            background-color: rgba(255, 255, 255, 0.2);
+            border-radius: 4px;
+            min-height: 20px;
+        }
+        QScrollBar::handle:vertical:hover {
+            background-color: rgba(255, 255, 255, 0.3);
+        }
+        """,
+    ),
+    'save_button': (
+        """
+        PrimaryPushButton {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #0078d4, stop:1 #106ebe);
+            border: 1px solid #005a9e;
+            border-radius: 6px;
+            font-weight: bold;
+            font-size: 14px;
+        }
+        PrimaryPushButton:hover {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #106ebe, stop:1 #005a9e);
+        }
+        PrimaryPushButton:pressed {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #005a9e, stop:1 #004578);
+        }
+        """,
+        """
+        PrimaryPushButton {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #0066cc, stop:1 #004499);
+            border: 1px solid #003366;
+            border-radius: 6px;
+            font-weight: bold;
+            font-size: 14px;
+        }
+        PrimaryPushButton:hover {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #0080ff, stop:1 #0066cc);
+        }
+        PrimaryPushButton:pressed {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #004499, stop:1 #003366);
+        }
+        """,
+    ),
+}
+
+
+class StyleSheetRegistry:
+    """样式表注册表 - 按（样式名称, 主题）缓存生成好的样式表字符串"""
+
+    _rendered: Dict[Tuple[str, str], str] = {}
+
+    @classmethod
+    def get(cls, name: str, theme: str) -> str:
+        """
+        获取指定主题下的样式表
+
+        Args:
+            name: 样式名称（STYLE_SHEETS中的键）
+            theme: 主题 ('light' 或 'dark')
+
+        Returns:
+            样式表字符串（同一样式同一主题始终返回同一个对象）
+        """
+        key = (name, theme)
+        qss = cls._rendered.get(key)
+        if qss is None:
+            light_qss, dark_qss = STYLE_SHEETS[name]
+            qss = textwrap.dedent(dark_qss if theme == 'dark' else light_qss).strip()
+            cls._rendered[key] = qss
+        return qss
+
+    @classmethod
+    def apply(cls, widget, name: str) -> None:
+        """
+        为组件设置主题自适应样式
+
+        Args:
+            widget: 目标组件
+            name: 样式名称
+        """
+        setCustomStyleSheet(widget, cls.get(name, 'light'), cls.get(name, 'dark'))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+系统托盘模块 - 提供常驻托盘图标和快速格式化入口
+"""
+
+from PyQt6.QtWidgets import QSystemTrayIcon
+from qfluentwidgets import SystemTrayMenu, Action, FluentIcon as FIF
+
+from ..utils.icon import IconManager
+from ..config import APP_TITLE, MESSAGES, QUICK_POLISH_SHORTCUT
+
+
+class TextPolishTrayIcon(QSystemTrayIcon):
+    """系统托盘图标 - 窗口隐藏后仍可一键格式化剪贴板"""
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.window = window
+
+        icon = IconManager.load_icon()
+        self.setIcon(icon if icon else window.windowIcon())
+        self.setToolTip(APP_TITLE)
+
+        # 托盘菜单
+        self.menu = SystemTrayMenu(parent=window)
+        self.menu.addActions([
+            Action(FIF.EDIT, f"快速格式化剪贴板 ({QUICK_POLISH_SHORTCUT})", triggered=self.quick_polish),
+            Action(FIF.HOME, "显示主窗口", triggered=self.window.show_from_tray),
+        ])
+        self.menu.addSeparator()
+        self.menu.addAction(Action(FIF.CLOSE, "退出", triggered=self.window.quit_application))
+        self.setContextMenu(self.menu)
+
+        self.activated.connect(self.on_activated)
+
+    def on_activated(self, reason):
+        """
+        托盘图标被点击时的处理
+
+        Args:
+            reason: 激活原因
+        """
+        if reason == QSystemTrayIcon.ActivationReason.Trigger:
+            self.window.show_from_tray()
+        elif reason == QSystemTrayIcon.ActivationReason.MiddleClick:
+            self.quick_polish()
+
+    def quick_polish(self):
+        """格式化剪贴板内容，窗口隐藏时通过托盘气泡提示结果"""
+        if self.window.homeInterface.quick_polish() and not self.window.isVisible():
+            self.showMessage(
+                MESSAGES['success']['quick_polish_complete'],
+                "剪贴板内容已格式化，可直接粘贴到WPS/Word",
+                QSystemTrayIcon.MessageIcon.Information,
+                1500
+            )
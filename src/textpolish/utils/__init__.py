@@ -3,7 +3,22 @@
 工具模块 - 包含通用工具函数
 """
 
-from .clipboard import ClipboardManager
-from .icon import IconManager
+# 按需导入：单实例检测等轻量工具不应触发剪贴板、图标等模块的加载
+_LAZY_EXPORTS = {
+    'ClipboardManager': '.clipboard',
+    'IconManager': '.icon',
+    'SingleInstanceGuard': '.single_instance',
+}
 
-__all__ = ['ClipboardManager', 'IconManager']
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = ['ClipboardManager', 'IconManager', 'SingleInstanceGuard']
@@ -3,11 +3,20 @@
 剪贴板管理模块 - 负责处理剪贴板操作
 """
 
+import os
+import tempfile
+import time
+from typing import Optional
+
 import pyperclip
 from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import QMimeData
+from PyQt6.QtCore import QMimeData, QUrl
 from bs4 import BeautifulSoup
 
+from ..config import (
+    APP_NAME, MESSAGES, CLIPBOARD_FILE_FALLBACK_CHARS, CLIPBOARD_TEMP_MAX_AGE
+)
+
 
 class ClipboardManager:
     """剪贴板管理器 - 负责处理各种剪贴板操作"""
@@ -23,23 +32,40 @@ class ClipboardManager:
         pyperclip.copy(text)
     
     @staticmethod
-    def copy_rich_text(html_content: str) -> None:
+    def copy_rich_text(html_content: str, plain_text: Optional[str] = None,
+                       allow_file_fallback: bool = True) -> Optional[str]:
         """
         复制富文本（HTML）到剪贴板
         
+        HTML超过 CLIPBOARD_FILE_FALLBACK_CHARS 时，写入剪贴板和目标程序粘贴都会明显卡顿，
+        此时改为保存到临时HTML文件，剪贴板中放入文件链接和提示文字。
+        
         Args:
             html_content: HTML内容
+            plain_text: 对应的纯文本；为None时从HTML中提取（较慢）
+            allow_file_fallback: 内容过大时是否改为复制临时文件
+            
+        Returns:
+            使用临时文件时返回文件路径，否则返回None
         """
         app = QApplication.instance()
         if not app:
             raise RuntimeError("QApplication instance not found")
         
+        if allow_file_fallback and ClipboardManager.needs_file_fallback(html_content):
+            file_path = ClipboardManager.create_temp_file('.html')
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(html_content)
+            ClipboardManager.copy_file(file_path)
+            return file_path
+        
         clipboard = app.clipboard()
         
         # 从HTML中提取纯文本，作为备用格式
-        plain_text = BeautifulSoup(html_content, 'html.parser').get_text(
-            separator='\n', strip=True
-        )
+        if plain_text is None:
+            plain_text = BeautifulSoup(html_content, 'html.parser').get_text(
+                separator='\n', strip=True
+            )
         
         mime_data = QMimeData()
         # 关键：同时设置HTML格式和纯文本格式
@@ -47,6 +73,88 @@ class ClipboardManager:
         mime_data.setText(plain_text)
         
         clipboard.setMimeData(mime_data)
+        return None
+    
+    @staticmethod
+    def needs_file_fallback(html_content: str) -> bool:
+        """判断HTML是否过大，需要改为通过临时文件复制"""
+        return len(html_content) > CLIPBOARD_FILE_FALLBACK_CHARS
+    
+    @staticmethod
+    def copy_file(file_path: str, notice: Optional[str] = None) -> None:
+        """
+        复制文件链接到剪贴板，同时放入一段简短的纯文本提示
+        
+        Args:
+            file_path: 文件路径
+            notice: 纯文本提示；为None时使用默认提示
+        """
+        app = QApplication.instance()
+        if not app:
+            raise RuntimeError("QApplication instance not found")
+        
+        if notice is None:
+            notice = MESSAGES['info']['clipboard_file_notice'].format(path=file_path)
+        
+        mime_data = QMimeData()
+        mime_data.setUrls([QUrl.fromLocalFile(file_path)])
+        mime_data.setText(notice)
+        
+        app.clipboard().setMimeData(mime_data)
+    
+    @staticmethod
+    def get_temp_dir() -> str:
+        """获取剪贴板临时文件目录"""
+        return os.path.join(tempfile.gettempdir(), f"{APP_NAME}-clipboard")
+    
+    @staticmethod
+    def create_temp_file(suffix: str) -> str:
+        """
+        创建剪贴板临时文件（同时清理过期的旧文件）
+        
+        文件需要在粘贴之后仍然存在，因此不会在复制后立即删除。
+        
+        Args:
+            suffix: 文件扩展名，如 '.html'、'.docx'
+            
+        Returns:
+            临时文件路径
+        """
+        temp_dir = ClipboardManager.get_temp_dir()
+        os.makedirs(temp_dir, exist_ok=True)
+        ClipboardManager.cleanup_temp_files()
+        
+        prefix = time.strftime("格式化结果_%Y%m%d_%H%M%S_")
+        fd, file_path = tempfile.mkstemp(suffix=suffix, prefix=prefix, dir=temp_dir)
+        os.close(fd)
+        return file_path
+    
+    @staticmethod
+    def cleanup_temp_files(max_age: float = CLIPBOARD_TEMP_MAX_AGE) -> int:
+        """
+        清理过期的剪贴板临时文件
+        
+        Args:
+            max_age: 保留时间（秒）
+            
+        Returns:
+            删除的文件数
+        """
+        temp_dir = ClipboardManager.get_temp_dir()
+        if not os.path.isdir(temp_dir):
+            return 0
+        
+        removed = 0
+        expire_time = time.time() - max_age
+        for entry in os.scandir(temp_dir):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < expire_time:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                # 文件可能正被WPS/Word打开，下次再清理
+                continue
+        return removed
     
     @staticmethod
     def get_plain_text() -> str:
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+内存分析模块 - 用tracemalloc记录处理各阶段的内存峰值和分配位置
+
+仅依赖标准库，默认关闭，关闭时每个阶段只多一次布尔判断。开启后记录清理（clean）、
+段落识别（classify）、HTML渲染（html）、WPS格式（wps）、预览（preview）和剪贴板（clipboard）
+各阶段的内存峰值，并对比阶段前后的快照，列出各阶段新增内存最多的代码位置。
+
+tracemalloc 会让处理变慢数倍、内存占用增加约一倍，只用于排查粘贴整本书时的内存问题。
+只记录调用 start() 的线程中的阶段：tracemalloc 的峰值是全进程共享的，多个线程同时
+处理时无法区分各自的峰值。
+"""
+
+import json
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+# 每个分配位置保留的调用栈层数（1层即分配内存的那一行代码）
+TRACE_FRAMES = 1
+
+# 报告中每个阶段和整体列出的分配位置数
+TOP_SITES = 10
+
+# 报告中忽略的分配位置（分析器自身和模块导入）
+_IGNORED_FILES = frozenset((tracemalloc.__file__, __file__, '<frozen importlib._bootstrap>',
+                            '<frozen importlib._bootstrap_external>', '<unknown>'))
+
+
+@dataclass(slots=True)
+class StageMemory:
+    """单个阶段的内存统计"""
+    calls: int = 0
+    peak_bytes: int = 0         # 单次调用中超出调用前已用内存的最大值
+    retained_bytes: int = 0     # 各次调用结束时比调用前多占用的内存之和
+    sites: Dict[str, int] = field(default_factory=dict)  # 分配位置 -> 新增字节数
+
+
+def _sites(statistics) -> Dict[str, int]:
+    """按分配位置汇总快照统计中的新增内存（忽略分析器自身）"""
+    sites = {}
+    for stat in statistics:
+        frame = stat.traceback[0]
+        size = getattr(stat, 'size_diff', stat.size)
+        if size > 0 and frame.filename not in _IGNORED_FILES:
+            sites[f"{frame.filename}:{frame.lineno}"] = size
+    return sites
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if abs(size) < 1024:
+            return f"{size:.0f}{unit}" if unit == 'B' else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+class MemoryProfiler:
+    """内存分析器 - 未启用时所有记录操作均为空操作"""
+
+    def __init__(self):
+        self.enabled = False
+        self.stages: Dict[str, StageMemory] = {}
+        self.peak_bytes = 0
+        self._thread_id: Optional[int] = None
+        # 正在执行的阶段：[名称, 开始时已用内存, 目前为止的峰值, 开始时的快照]
+        self._stack: List[list] = []
+        # 最外层阶段开始时的快照本身占用的内存（不计入整体峰值）
+        self._snapshot_bytes = 0
+        self._started_tracing = False
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """开始记录（在当前线程中执行的阶段才会被记录）"""
+        if self.enabled:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._started_tracing = True
+        self._thread_id = threading.get_ident()
+        tracemalloc.reset_peak()
+        self.enabled = True
+
+    def stop(self) -> None:
+        """停止记录（保留已有数据）"""
+        if not self.enabled:
+            return
+        self._update_peak()
+        self.enabled = False
+        self._stack.clear()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def set_enabled(self, enabled: bool) -> None:
+        """开启或关闭记录"""
+        if enabled:
+            self.start()
+        else:
+            self.stop()
+
+    def reset(self) -> None:
+        """清空统计数据（记录中时，之前分配的内存不再计入）"""
+        with self._lock:
+            self.stages.clear()
+            self.peak_bytes = 0
+        if self.enabled and not self._stack:
+            tracemalloc.clear_traces()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        记录一个处理阶段的内存峰值和新增内存
+
+        阶段可以嵌套（如复制时生成WPS格式），外层阶段的峰值包含内层阶段。
+
+        Args:
+            name: 阶段名称
+        """
+        if not self.enabled or threading.get_ident() != self._thread_id:
+            yield
+            return
+
+        self._update_peak()
+        snapshot = None
+        if not self._stack:
+            # 只在最外层阶段对比快照：内层阶段（如按分片清理）可能调用很多次，每次快照都要遍历全部已分配内存
+            before = tracemalloc.get_traced_memory()[0]
+            snapshot = tracemalloc.take_snapshot()
+            self._snapshot_bytes = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.reset_peak()
+        frame = [name, tracemalloc.get_traced_memory()[0], 0, snapshot]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._exit_stage(frame)
+
+    def _exit_stage(self, frame: list) -> None:
+        if not self.enabled:
+            # 阶段执行期间已停止记录
+            return
+        self._update_peak()
+        self._stack.pop()
+        name, start_bytes, peak, snapshot = frame
+        current = tracemalloc.get_traced_memory()[0]
+
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageMemory()
+            stats.calls += 1
+            stats.peak_bytes = max(stats.peak_bytes, peak - start_bytes)
+            stats.retained_bytes += current - start_bytes
+            if snapshot is not None:
+                for site, size in _sites(tracemalloc.take_snapshot().compare_to(snapshot, 'lineno')).items():
+                    stats.sites[site] = stats.sites.get(site, 0) + size
+        if snapshot is not None:
+            frame[3] = snapshot = None
+            self._snapshot_bytes = 0
+            tracemalloc.reset_peak()
+
+    def _update_peak(self) -> None:
+        """把tracemalloc当前的峰值计入所有正在执行的阶段和整体峰值（之后可以重置峰值）"""
+        if not tracemalloc.is_tracing():
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        for frame in self._stack:
+            frame[2] = max(frame[2], peak)
+        self.peak_bytes = max(self.peak_bytes, peak - self._snapshot_bytes)
+
+    def build_report(self, input_bytes: Optional[int] = None) -> Dict:
+        """
+        生成分析报告
+
+        Args:
+            input_bytes: 输入文本的大小（UTF-8字节数，提供时计算每MB输入的内存峰值）
+
+        Returns:
+            报告字典（整体峰值、各阶段统计、当前占用内存最多的分配位置）
+        """
+        self._update_peak()
+        with self._lock:
+            stages = {
+                name: {
+                    'calls': stats.calls,
+                    'peak_bytes': stats.peak_bytes,
+                    'retained_bytes': stats.retained_bytes,
+                    'top_sites': self._top_sites(stats.sites),
+                }
+                for name, stats in self.stages.items()
+            }
+
+        report = {'peak_bytes': self.peak_bytes, 'stages': stages, 'live_sites': []}
+        if input_bytes:
+            report['input_bytes'] = input_bytes
+            report['peak_bytes_per_mb'] = int(self.peak_bytes / (input_bytes / 1024 / 1024))
+        if self.enabled:
+            # 只统计开始记录以来分配、至今未释放的内存（如处理结果、预览文档）
+            report['live_sites'] = self._top_sites(_sites(tracemalloc.take_snapshot().statistics('lineno')))
+        return report
+
+    @staticmethod
+    def _top_sites(sites: Dict[str, int]) -> List[Dict]:
+        top = sorted(sites.items(), key=lambda item: item[1], reverse=True)[:TOP_SITES]
+        return [{'site': site, 'bytes': size} for site, size in top]
+
+    def format_report(self, report: Optional[Dict] = None) -> str:
+        """
+        把分析报告格式化为文本
+
+        Args:
+            report: build_report() 的结果（默认重新生成）
+
+        Returns:
+            报告文本
+        """
+        if report is None:
+            report = self.build_report()
+        lines = [f"内存峰值: {_format_bytes(report['peak_bytes'])}"]
+        if 'peak_bytes_per_mb' in report:
+            lines.append(f"输入: {_format_bytes(report['input_bytes'])}，"
+                         f"每MB输入的内存峰值: {_format_bytes(report['peak_bytes_per_mb'])}")
+
+        lines.append("")
+        lines.append(f"{'阶段':<10} {'次数':>6} {'峰值':>10} {'新增':>10}")
+        for name, stats in report['stages'].items():
+            lines.append(f"{name:<10} {stats['calls']:>6} {_format_bytes(stats['peak_bytes']):>10} "
+                         f"{_format_bytes(stats['retained_bytes']):>10}")
+
+        for name, stats in report['stages'].items():
+            if stats['top_sites']:
+                lines.append("")
+                lines.append(f"[{name}] 新增内存最多的位置:")
+                lines.extend(f"  {_format_bytes(item['bytes']):>10}  {item['site']}" for item in stats['top_sites'])
+
+        if report['live_sites']:
+            lines.append("")
+            lines.append("当前占用内存最多的位置（开始记录以来分配）:")
+            lines.extend(f"  {_format_bytes(item['bytes']):>10}  {item['site']}" for item in report['live_sites'])
+        return '\n'.join(lines)
+
+    def write_report(self, path: str, input_bytes: Optional[int] = None) -> Dict:
+        """
+        写入分析报告
+
+        扩展名为 .json 时写入JSON报告，否则写入文本报告。
+
+        Args:
+            path: 报告文件路径
+            input_bytes: 输入文本的大小（UTF-8字节数）
+
+        Returns:
+            报告字典
+        """
+        report = self.build_report(input_bytes)
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.lower().endswith('.json'):
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            else:
+                f.write(self.format_report(report))
+        return report
+
+
+# 全局内存分析器实例
+memory_profiler = MemoryProfiler()
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+运行指标模块 - 进程内的计数器、仪表和直方图
+
+仅依赖标准库，记录一次指标只需一次加锁和一次二分查找，界面模式下也一直开启。
+本地转换服务通过 /metrics 以Prometheus文本格式输出；命令行模式在结束时输出JSON汇总。
+
+工作进程中记录的指标通过 drain() 取出增量、随任务结果返回，再由服务进程 merge() 合并，
+因此 /metrics 能看到所有工作进程的处理耗时和缓存命中情况。
+"""
+
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# 直方图默认分桶（秒）
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# JSON汇总中输出的分位数
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in labels) + '}'
+
+
+def _summary_key(labels: Labels) -> str:
+    return ','.join(f'{name}={value}' for name, value in labels) or 'total'
+
+
+def _summary_value(value: float):
+    return int(value) if float(value).is_integer() else round(value, 6)
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """计数器 - 只增不减"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """增加计数"""
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        """读取计数"""
+        return self._values.get(_labels(labels), 0.0)
+
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        with self._lock:
+            return [(self.name, labels, value) for labels, value in self._values.items()]
+
+    def drain(self) -> Dict:
+        with self._lock:
+            values, self._values = self._values, {}
+        return {'values': list(values.items())}
+
+    def merge(self, state: Dict) -> None:
+        with self._lock:
+            for labels, value in state['values']:
+                labels = tuple(map(tuple, labels))
+                self._values[labels] = self._values.get(labels, 0.0) + value
+
+
+class Gauge:
+    """仪表 - 可增可减的当前值，也可以在读取时通过回调获取"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, help_text: str, callback: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.help = help_text
+        self.callback = callback
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels) -> None:
+        """设置当前值"""
+        with self._lock:
+            self._values[_labels(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """增加当前值"""
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        """减少当前值"""
+        self.inc(-amount, **labels)
+
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        if self.callback is not None:
+            return [(self.name, (), float(self.callback()))]
+        with self._lock:
+            return [(self.name, labels, value) for labels, value in self._values.items()]
+
+    def drain(self) -> Dict:
+        # 仪表表示各进程自己的当前状态，不跨进程合并
+        return {'values': []}
+
+    def merge(self, state: Dict) -> None:
+        pass
+
+
+class Histogram:
+    """直方图 - 按分桶统计观测值的分布"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        # 标签 -> [各分桶计数（最后一个为+Inf）, 总和, 次数]
+        self._values: Dict[Labels, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        """记录一次观测值"""
+        key = _labels(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """记录代码块的耗时（秒）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        result = []
+        with self._lock:
+            items = [(labels, list(entry[0]), entry[1], entry[2]) for labels, entry in self._values.items()]
+        for labels, counts, total, count in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                result.append((f'{self.name}_bucket', labels + (('le', _format_value(bound)),), cumulative))
+            result.append((f'{self.name}_sum', labels, total))
+            result.append((f'{self.name}_count', labels, count))
+        return result
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """
+        按分桶估算分位数（与Prometheus的histogram_quantile相同，在分桶内线性插值）
+
+        Args:
+            q: 分位数（0~1）
+
+        Returns:
+            估算值；没有观测值时返回None
+        """
+        entry = self._values.get(_labels(labels))
+        return self._quantile(entry, q) if entry else None
+
+    def _quantile(self, entry: list, q: float) -> Optional[float]:
+        counts, _total, count = entry
+        if not count:
+            return None
+        rank = q * count
+        cumulative = 0
+        lower = 0.0
+        for bound, bucket_count in zip(self.buckets, counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                return lower + (bound - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+            lower = bound
+        # 落在+Inf分桶中，只能给出最大的有限边界
+        return self.buckets[-1]
+
+    def summary(self) -> Dict[str, Dict]:
+        with self._lock:
+            items = [(labels, [list(entry[0]), entry[1], entry[2]]) for labels, entry in self._values.items()]
+        result = {}
+        for labels, entry in items:
+            stats = {'count': entry[2], 'sum': round(entry[1], 6)}
+            for q in SUMMARY_QUANTILES:
+                value = self._quantile(entry, q)
+                stats[f'p{int(q * 100)}'] = round(value, 6) if value is not None else None
+            result[_summary_key(labels)] = stats
+        return result
+
+    def drain(self) -> Dict:
+        with self._lock:
+            values, self._values = self._values, {}
+        return {'values': list(values.items())}
+
+    def merge(self, state: Dict) -> None:
+        with self._lock:
+            for labels, (counts, total, count) in state['values']:
+                labels = tuple(map(tuple, labels))
+                entry = self._values.get(labels)
+                if entry is None:
+                    entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                entry[0] = [a + b for a, b in zip(entry[0], counts)]
+                entry[1] += total
+                entry[2] += count
+
+
+class MetricsRegistry:
+    """指标注册表 - 按名称创建和查找指标，并输出Prometheus文本格式或JSON汇总"""
+
+    def __init__(self, prefix: str = 'textpolish'):
+        self.prefix = prefix
+        self._metrics: Dict[str, object] = {}
+        self._caches: Dict[str, Callable] = {}
+        self._cache_seen: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help_text: str, **kwargs):
+        full_name = f'{self.prefix}_{name}'
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = self._metrics[full_name] = cls(full_name, help_text, **kwargs)
+            return metric
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        """获取或创建计数器"""
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str, callback: Optional[Callable[[], float]] = None) -> Gauge:
+        """获取或创建仪表（callback不为空时每次读取都调用它获取当前值）"""
+        gauge = self._get_or_create(Gauge, name, help_text)
+        if callback is not None:
+            gauge.callback = callback
+        return gauge
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        """获取或创建直方图"""
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def register_cache(self, name: str, cache_info: Callable) -> None:
+        """
+        登记一个 functools.lru_cache 缓存，读取指标时把命中/未命中次数的增量计入计数器
+
+        Args:
+            name: 缓存名称（作为 cache 标签）
+            cache_info: 缓存函数的 cache_info 方法
+        """
+        self._caches[name] = cache_info
+
+    def _sync_caches(self) -> None:
+        if not self._caches:
+            return
+        hits = self.counter('cache_hits_total', '缓存命中次数')
+        misses = self.counter('cache_misses_total', '缓存未命中次数')
+        for name, cache_info in list(self._caches.items()):
+            info = cache_info()
+            seen_hits, seen_misses = self._cache_seen.get(name, (0, 0))
+            if info.hits > seen_hits:
+                hits.inc(info.hits - seen_hits, cache=name)
+            if info.misses > seen_misses:
+                misses.inc(info.misses - seen_misses, cache=name)
+            self._cache_seen[name] = (info.hits, info.misses)
+
+    def render_prometheus(self) -> str:
+        """输出Prometheus文本格式"""
+        self._sync_caches()
+        lines = []
+        for metric in list(self._metrics.values()):
+            samples = metric.samples()
+            if not samples:
+                continue
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in samples:
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def summary(self) -> Dict:
+        """输出JSON汇总（直方图给出次数、总和和分位数估算）"""
+        self._sync_caches()
+        result = {'counters': {}, 'gauges': {}, 'histograms': {}}
+        for metric in list(self._metrics.values()):
+            if isinstance(metric, Histogram):
+                stats = metric.summary()
+                if stats:
+                    result['histograms'][metric.name] = stats
+                continue
+            samples = {
+                _summary_key(labels): _summary_value(value) for _name, labels, value in metric.samples()
+            }
+            if samples:
+                result['counters' if isinstance(metric, Counter) else 'gauges'][metric.name] = samples
+        return result
+
+    def summary_json(self) -> str:
+        """输出JSON汇总文本"""
+        return json.dumps(self.summary(), ensure_ascii=False, indent=2)
+
+    def drain(self) -> Dict:
+        """
+        取出并清空所有计数器和直方图的数据（工作进程随任务结果返回给服务进程）
+
+        Returns:
+            指标名称 -> 数据
+        """
+        self._sync_caches()
+        return {
+            name: (metric.kind, getattr(metric, 'buckets', None), metric.help, metric.drain())
+            for name, metric in list(self._metrics.items())
+            if not isinstance(metric, Gauge)
+        }
+
+    def merge(self, state: Dict) -> None:
+        """合并其他进程 drain() 取出的数据"""
+        for full_name, (kind, buckets, help_text, data) in state.items():
+            name = full_name[len(self.prefix) + 1:]
+            if kind == 'histogram':
+                metric = self.histogram(name, help_text, tuple(buckets))
+            else:
+                metric = self.counter(name, help_text)
+            metric.merge(data)
+
+
+# 全局指标注册表
+metrics = MetricsRegistry()
+
+
+def record_stage(stage: str, elapsed: float, chars: int) -> None:
+    """
+    记录一次处理阶段的耗时和处理的字符数
+
+    Args:
+        stage: 阶段名称（clean、html等）
+        elapsed: 耗时（秒）
+        chars: 输入字符数
+    """
+    metrics.histogram('stage_duration_seconds', '各处理阶段单次调用耗时（秒）').observe(elapsed, stage=stage)
+    metrics.counter('stage_chars_total', '各处理阶段处理的字符数').inc(chars, stage=stage)
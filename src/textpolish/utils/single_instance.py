@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+单实例模块 - 负责检测已运行的实例并转发启动请求
+
+第二次启动程序时只加载本模块（PyQt6.QtNetwork），不会创建QApplication，
+也不会加载界面组件和用户配置，因此可以在几十毫秒内把请求交给已运行的窗口后退出。
+"""
+
+import getpass
+import json
+import os
+from typing import Optional
+
+from PyQt6.QtCore import QLockFile, QObject, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+from ..config import (
+    SINGLE_INSTANCE_PROBE_TIMEOUT_MS, SINGLE_INSTANCE_SERVER_NAME, SINGLE_INSTANCE_TIMEOUT_MS,
+    get_cache_dir
+)
+
+
+class SingleInstanceGuard(QObject):
+    """单实例守护 - 监听本地通道并接收其他实例转发的请求"""
+
+    # 收到转发请求时发出，参数为请求字典
+    request_received = pyqtSignal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.server: Optional[QLocalServer] = None
+        self.lock_file: Optional[QLockFile] = None
+
+    @staticmethod
+    def get_server_name() -> str:
+        """
+        获取本地通道名称（按用户区分，避免多用户环境互相干扰）
+
+        Returns:
+            本地通道名称
+        """
+        try:
+            user = getpass.getuser()
+        except Exception:
+            user = "default"
+        return f"{SINGLE_INSTANCE_SERVER_NAME}-{user}"
+
+    @staticmethod
+    def forward_request(request: dict, timeout_ms: int = SINGLE_INSTANCE_TIMEOUT_MS) -> bool:
+        """
+        尝试把请求转发给已运行的实例
+
+        Args:
+            request: 请求字典（file、from_clipboard等）
+            timeout_ms: 连接和发送的超时时间（毫秒）
+
+        Returns:
+            是否已成功转发（True表示当前进程可以直接退出）
+        """
+        socket = QLocalSocket()
+        socket.connectToServer(SingleInstanceGuard.get_server_name())
+        if not socket.waitForConnected(timeout_ms):
+            return False
+
+        payload = json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n'
+        socket.write(payload)
+        sent = socket.waitForBytesWritten(timeout_ms)
+        socket.disconnectFromServer()
+        if socket.state() != QLocalSocket.LocalSocketState.UnconnectedState:
+            socket.waitForDisconnected(timeout_ms)
+        return sent
+
+    def listen(self) -> bool:
+        """
+        开始监听本地通道
+
+        Returns:
+            是否监听成功
+        """
+        name = self.get_server_name()
+        has_lock = self._acquire_lock(name)
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self._on_new_connection)
+
+        if self.server.listen(name):
+            return True
+
+        # 通道已被占用：只有持有锁文件（其他实例都已退出）且再次连接失败时，
+        # 才是上次异常退出遗留的通道文件，清理后重试；否则另一个实例仍在运行，不能删除它的通道
+        if not has_lock or self._is_server_alive(name):
+            print("另一个实例正在运行，本实例不接收转发的请求")
+            return False
+
+        QLocalServer.removeServer(name)
+        if self.server.listen(name):
+            return True
+
+        print(f"单实例通道监听失败: {self.server.errorString()}")
+        return False
+
+    def _acquire_lock(self, name: str) -> bool:
+        """
+        获取单实例锁文件（位于本地缓存目录，程序退出前一直持有）
+
+        Args:
+            name: 本地通道名称
+
+        Returns:
+            是否获取成功（失败表示另一个实例正在运行）
+        """
+        try:
+            os.makedirs(get_cache_dir(), exist_ok=True)
+        except OSError as e:
+            print(f"创建缓存目录失败: {e}")
+            return False
+        self.lock_file = QLockFile(os.path.join(get_cache_dir(), f"{name}.lock"))
+        # 只按持有进程是否存在判断锁是否失效，长时间运行的实例不会被当作失效
+        self.lock_file.setStaleLockTime(0)
+        return self.lock_file.tryLock(0)
+
+    @staticmethod
+    def _is_server_alive(name: str) -> bool:
+        """以较长的超时再次连接本地通道，确认是否有实例在监听"""
+        socket = QLocalSocket()
+        socket.connectToServer(name)
+        alive = socket.waitForConnected(SINGLE_INSTANCE_PROBE_TIMEOUT_MS)
+        if alive:
+            socket.disconnectFromServer()
+        return alive
+
+    def _on_new_connection(self):
+        """处理新的连接"""
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.buffer = b''
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(lambda s=socket: self._on_disconnected(s))
+
+    def _on_ready_read(self, socket):
+        """读取请求数据，按行分隔每条请求"""
+        socket.buffer += bytes(socket.readAll())
+        while b'\n' in socket.buffer:
+            line, socket.buffer = socket.buffer.split(b'\n', 1)
+            self._dispatch(line)
+
+    def _on_disconnected(self, socket):
+        """连接断开时处理剩余数据并释放连接"""
+        socket.buffer += bytes(socket.readAll())
+        if socket.buffer.strip():
+            self._dispatch(socket.buffer)
+        socket.buffer = b''
+        socket.deleteLater()
+
+    def _dispatch(self, data: bytes):
+        """解析并分发单条请求"""
+        try:
+            request = json.loads(data.decode('utf-8'))
+        except Exception as e:
+            print(f"无法解析转发的请求: {e}")
+            return
+
+        if isinstance(request, dict):
+            self.request_received.emit(request)
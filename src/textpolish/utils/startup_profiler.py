@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+启动性能分析模块 - 记录模块导入耗时和启动各阶段耗时
+
+仅依赖标准库，可以在导入PyQt6等依赖之前启用。模块导入耗时通过导入钩子统计，
+输出格式与 ``python -X importtime`` 一致（打包后的exe无法使用 -X 参数）。
+"""
+
+import importlib.abc
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+class _TimedLoader:
+    """计时加载器 - 包装原始加载器，记录从create_module到exec_module结束的耗时"""
+
+    def __init__(self, loader, profiler: 'StartupProfiler'):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        # get_resource_reader、is_package等其他接口转发给原始加载器
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        # 扩展模块（如PyQt6的.pyd）主要耗时在create_module中，因此从这里开始计时
+        self._profiler._enter_import(spec.name)
+        try:
+            create_module = getattr(self._loader, 'create_module', None)
+            return create_module(spec) if create_module else None
+        except BaseException:
+            self._profiler._exit_import(spec.name)
+            raise
+
+    def exec_module(self, module):
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit_import(module.__name__)
+            # 导入完成后恢复原始加载器，避免影响模块后续对加载器的使用
+            module.__loader__ = self._loader
+            if getattr(module, '__spec__', None) is not None:
+                module.__spec__.loader = self._loader
+
+
+class _ImportTimingFinder(importlib.abc.MetaPathFinder):
+    """导入计时查找器 - 委托其他查找器定位模块，并为结果换上计时加载器"""
+
+    def __init__(self, profiler: 'StartupProfiler'):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                spec.loader = _TimedLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    """启动性能分析器 - 未启用时所有记录操作均为空操作"""
+
+    def __init__(self):
+        self.enabled = False
+        self.start_time = 0.0
+        self.phases: List[Dict] = []
+        self.imports: List[Dict] = []
+        self._import_stack: List[list] = []
+        self._finder: Optional[_ImportTimingFinder] = None
+
+    def start(self) -> None:
+        """开始记录（应尽早调用，之后导入的模块才会被统计）"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.start_time = time.perf_counter()
+        self._finder = _ImportTimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def stop(self) -> None:
+        """停止统计模块导入"""
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    def elapsed_ms(self) -> float:
+        """自开始记录以来经过的毫秒数"""
+        return (time.perf_counter() - self.start_time) * 1000
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        记录一个启动阶段的耗时
+
+        Args:
+            name: 阶段名称
+        """
+        if not self.enabled:
+            yield
+            return
+        start = self.elapsed_ms()
+        try:
+            yield
+        finally:
+            self.add_phase(name, start, self.elapsed_ms() - start)
+
+    def add_phase(self, name: str, start_ms: float, duration_ms: float) -> None:
+        """
+        直接添加一个阶段记录（用于无法用with包裹的阶段，如首次绘制）
+
+        Args:
+            name: 阶段名称
+            start_ms: 开始时间（相对于开始记录，毫秒）
+            duration_ms: 耗时（毫秒）
+        """
+        if self.enabled:
+            self.phases.append({
+                'name': name,
+                'start_ms': round(start_ms, 3),
+                'duration_ms': round(duration_ms, 3),
+            })
+
+    def _enter_import(self, name: str) -> None:
+        # [模块名, 开始时间, 子模块累计耗时]
+        self._import_stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit_import(self, name: str) -> None:
+        _, start, children = self._import_stack.pop()
+        cumulative = time.perf_counter() - start
+        if self._import_stack:
+            self._import_stack[-1][2] += cumulative
+        self.imports.append({
+            'module': name,
+            'depth': len(self._import_stack),
+            'self_us': int((cumulative - children) * 1_000_000),
+            'cumulative_us': int(cumulative * 1_000_000),
+        })
+
+    def build_report(self) -> Dict:
+        """
+        生成分析报告
+
+        Returns:
+            报告字典（总耗时、各阶段耗时、模块导入耗时）
+        """
+        top_level = [item for item in self.imports if item['depth'] == 0]
+        return {
+            'total_ms': round(self.elapsed_ms(), 3),
+            'import_total_ms': round(sum(item['cumulative_us'] for item in top_level) / 1000, 3),
+            'phases': self.phases,
+            'slowest_imports': sorted(self.imports, key=lambda item: item['self_us'], reverse=True)[:30],
+            'imports': self.imports,
+        }
+
+    def format_importtime(self) -> str:
+        """按 -X importtime 的格式输出模块导入耗时"""
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for item in self.imports:
+            lines.append(
+                f"import time: {item['self_us']:>9} | {item['cumulative_us']:>10} | "
+                f"{'  ' * item['depth']}{item['module']}"
+            )
+        return '\n'.join(lines)
+
+    def write_report(self, path: str) -> Dict:
+        """
+        写入分析报告
+
+        在指定路径写入JSON报告，并在同名 .importtime.txt 文件中写入导入耗时明细。
+
+        Args:
+            path: JSON报告文件路径
+
+        Returns:
+            报告字典
+        """
+        self.stop()
+        report = self.build_report()
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        with open(f"{path}.importtime.txt", 'w', encoding='utf-8') as f:
+            f.write(self.format_importtime())
+
+        print(f"启动分析报告已写入: {path}")
+        print(f"总耗时: {report['total_ms']:.1f}ms，模块导入: {report['import_total_ms']:.1f}ms")
+        for phase in self.phases:
+            print(f"  {phase['name']}: {phase['duration_ms']:.1f}ms")
+        return report
+
+
+# 全局启动分析器实例
+startup_profiler = StartupProfiler()
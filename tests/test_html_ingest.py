@@ -0,0 +1,26 @@
+"""富文本（HTML）导入测试"""
+
+from textpolish.core.html_ingest import ingest_html
+from textpolish.core.pipeline import PolishPipeline
+
+
+def test_ordered_list_keeps_numbering():
+    """有序列表项带上编号，起始编号取自start属性"""
+    text, levels = ingest_html('<ol start="3"><li>第一条</li><li><p>第二条</p></li></ol>')
+    assert text == '3. 第一条\n4. 第二条'
+    assert levels == (None, None)
+
+
+def test_table_row_is_one_paragraph():
+    """表格每行一段，单元格以制表符分隔"""
+    text, _ = ingest_html('<table><tr><th>名称</th><th>数量</th></tr><tr><td>苹果</td><td>3</td></tr></table>')
+    assert text == '名称\t数量\n苹果\t3'
+
+
+def test_rich_paste_matches_plain_paste_for_ordered_list():
+    """有序列表的富文本粘贴与纯文本粘贴结果相同"""
+    pipeline = PolishPipeline()
+    rich = pipeline.polish_html('<ol><li>第一条内容</li><li>第二条内容</li></ol>')
+    plain = pipeline.polish('1. 第一条内容\n2. 第二条内容')
+    assert rich.cleaned_text == plain.cleaned_text
+    assert rich.blocks == plain.blocks
@@ -0,0 +1,84 @@
+"""同级别规则合并匹配测试"""
+
+import re
+
+from textpolish.core.html_generator import HTMLGenerator
+from textpolish.core.blocks import TextBlock
+from textpolish.core.rule_matcher import RuleMatcher, can_combine
+from textpolish.core.rule_validator import SPECIAL_GROUP_COUNTS
+
+
+def match_one_by_one(patterns, line, group_counts=None):
+    """按顺序逐条 re.match（跳过无法编译和捕获组数量不符的规则）"""
+    for pattern in patterns:
+        try:
+            compiled = re.compile(pattern)
+        except re.error:
+            continue
+        if group_counts is not None and compiled.groups not in group_counts:
+            continue
+        match = compiled.match(line)
+        if match:
+            return pattern, match.groups()
+    return None
+
+
+def assert_same_as_sequential(patterns, lines, group_counts=None):
+    matcher = RuleMatcher(tuple(patterns), group_counts)
+    for line in lines:
+        assert matcher.match(line) == match_one_by_one(patterns, line, group_counts), line
+
+
+def test_named_groups_and_backreferences():
+    """含命名分组、反向引用和条件分组的规则单独匹配，前后的规则照常合并"""
+    patterns = [
+        r'^第([一二三])章',
+        r'^(?P<number>\d+)\.(?P<title>.+)',
+        r'^(\w)\1+',
+        r'^(<)?条款(?(1)>)',
+        r'^(\d+)、(.+)',
+        r'^第(.)节',
+    ]
+    assert not can_combine(patterns[1], re.compile(patterns[1]))
+    assert not can_combine(patterns[2], re.compile(patterns[2]))
+    assert not can_combine(patterns[3], re.compile(patterns[3]))
+    lines = ['第一章 总则', '12.标题', 'aa 重复', 'ab', '<条款>', '<条款', '条款', '3、内容', '第二节', '其他']
+    assert_same_as_sequential(patterns, lines)
+
+
+def test_inline_flags():
+    """全局内联标志的规则单独匹配；局部标志的规则可以合并"""
+    patterns = [r'(?i)^chapter \d+', r'^(?i:part) [a-z]+', r'^CHAPTER', r'(?s)^附.件', r'^Section']
+    assert not can_combine(patterns[0], re.compile(patterns[0]))
+    assert can_combine(patterns[1], re.compile(patterns[1]))
+    lines = ['Chapter 1', 'CHAPTER one', 'PART abc', 'part ABC', '附\n件', '附件', 'section', 'Section 2']
+    assert_same_as_sequential(patterns, lines)
+
+
+def test_patterns_differing_only_in_anchors():
+    """只有锚点不同的规则、含顶层分支的规则合并后仍按各自的范围匹配"""
+    patterns = [r'第一章$', r'^第一章', r'第一章', r'总则|^附则$', r'^\d+$']
+    lines = ['第一章', '第一章 总则', '总则', '附则', '附则说明', '前言 第一章', '123', '123a']
+    assert_same_as_sequential(patterns, lines)
+
+
+def test_special_rules_extract_lead_and_tail():
+    """特殊格式规则按2组或3组捕获提取加粗部分和正文，其他组数的规则跳过"""
+    patterns = [
+        r'^([^：]{2,8})$',
+        r'^（(\d+)）([^。]+。)(.*)$',
+        r'^([一二三四]是[^。]+。)(.*)$',
+        r'^([^：]{2,10}：)(.*)$',
+    ]
+    lines = ['（1）加强管理。落实责任。', '一是扩大规模。产业增长。', '重点：说明文字', '技术创新', '普通正文']
+    assert_same_as_sequential(patterns, lines, SPECIAL_GROUP_COUNTS)
+
+    matcher = RuleMatcher(tuple(patterns), SPECIAL_GROUP_COUNTS)
+    generator = HTMLGenerator()
+    blocks = [generator._special_block(matcher.match(line)[1]) for line in lines[:3]]
+    assert blocks == [
+        TextBlock('special_format', '（1）加强管理。', '落实责任。'),
+        TextBlock('special_format', '一是扩大规模。', '产业增长。'),
+        TextBlock('special_format', '重点：', '说明文字'),
+    ]
+    assert matcher.match('技术创新') is None
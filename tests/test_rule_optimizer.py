@@ -0,0 +1,95 @@
+"""规则顺序优化测试"""
+
+from textpolish.config import ConfigSnapshot, RegexPattern, StyleConfig, TitleConfig
+from textpolish.core.html_generator import HTMLGenerator
+from textpolish.core.rule_optimizer import (
+    REORDER_INTERVAL, RuleOrderOptimizer, first_char_ranges, rule_optimizer, rules_independent
+)
+
+
+# 特殊格式规则：第3、5条与前面的规则首字符不相交，可以前移；
+# 第4条可能以任意字符开头，第6条与第3条首字符相同，都不能越过前面的规则
+SPECIAL_PATTERNS = (
+    r'^（([一二三\d]+)）([^。]+。)(.*)',
+    r'^([一二三\d]+[是的][^。]*。)(.*)',
+    r'^(重点[^。]*。)(.*)',
+    r'^([^：]*：)(.*)',
+    r'^(注[^。]*。)(.*)',
+    r'^(重要[^：]*：)(.*)',
+)
+
+CORPUS_LINES = (
+    '第一章 总则', '第二节 范围', '一、基本情况', '（一）政策支持', '（1）加强管理。落实责任。',
+    '一是扩大规模。产业增长。', '重点：说明文字。其余内容', '重点工作。继续推进。', '注意事项。按时完成。',
+    '重要事项：另行通知', '注：仅供参考', '注意：事项。完成', '说明：无', '普通正文段落。', '123的数据。统计口径',
+)
+
+
+def test_first_char_ranges_unknown():
+    """忽略大小写、\\w、\\s、取反集合和可能匹配空串的规则无法确定首字符"""
+    for pattern in (r'(?i)^abc', r'^(?i:abc)', r'\w+', r'^\s*第', r'[^，]+：', r'a*', r'(?:第)?', r'^a?\w'):
+        assert first_char_ranges(pattern) is None, pattern
+
+
+def test_first_char_ranges_known():
+    """可选前缀之后的字符计入首字符集合，锚点不影响结果"""
+    assert first_char_ranges(r'^第[一二]章') == ((ord('第'), ord('第')),)
+    assert first_char_ranges(r'^a?b') == ((ord('a'), ord('b')),)
+    assert first_char_ranges(r'^(?:前言|附录)$') == ((ord('前'), ord('前')), (ord('附'), ord('附')))
+
+
+def test_overlapping_rules_are_never_swapped():
+    """命中次数再多，也不会越过可能匹配同一行的靠前规则"""
+    optimizer = RuleOrderOptimizer()
+    for pattern in SPECIAL_PATTERNS[3:]:
+        for _ in range(100):
+            optimizer.record_hit('special_format', pattern)
+    ordered = optimizer._order_patterns('special_format', SPECIAL_PATTERNS)
+
+    assert not rules_independent(SPECIAL_PATTERNS[2], SPECIAL_PATTERNS[5])
+    for i, earlier in enumerate(SPECIAL_PATTERNS):
+        for later in SPECIAL_PATTERNS[i + 1:]:
+            if not rules_independent(earlier, later):
+                assert ordered.index(earlier) < ordered.index(later), (earlier, later)
+    # 第4条无法确定首字符，其后的规则都留在它后面
+    assert ordered[:3] == SPECIAL_PATTERNS[:3]
+
+
+def test_independent_rules_move_forward():
+    """首字符不相交的规则按命中次数前移"""
+    optimizer = RuleOrderOptimizer()
+    for _ in range(10):
+        optimizer.record_hit('special_format', SPECIAL_PATTERNS[2])
+    ordered = optimizer._order_patterns('special_format', SPECIAL_PATTERNS[:3])
+    assert ordered == (SPECIAL_PATTERNS[2], SPECIAL_PATTERNS[0], SPECIAL_PATTERNS[1])
+
+
+def test_classification_matches_fixed_order():
+    """开启优化并重新排序后，识别结果与按配置顺序匹配完全相同"""
+    config = {
+        'h1': TitleConfig(StyleConfig(), [RegexPattern(r'^第[一二三\d]+章', 'h1')]),
+        'h2': TitleConfig(StyleConfig(), [RegexPattern(r'^第[一二三\d]+节', 'h2'),
+                                          RegexPattern(r'^[一二三]+、', 'h2')]),
+        'h3': TitleConfig(StyleConfig(), [RegexPattern(r'^（[一二三\d]+）', 'h3')]),
+        'special_format': TitleConfig(
+            StyleConfig(), [RegexPattern(pattern, f'special{i}') for i, pattern in enumerate(SPECIAL_PATTERNS)]
+        ),
+    }
+    snapshot = ConfigSnapshot.build(1_000_001, config)
+    # 让靠后的规则积累足够多的命中，触发重新排序
+    text = '\n'.join(CORPUS_LINES + ('注意事项。按时完成。', '重点工作。继续推进。') * REORDER_INTERVAL)
+
+    fixed = HTMLGenerator().classify(text, snapshot=snapshot)
+    rule_optimizer.reset()
+    rule_optimizer.set_enabled(True)
+    try:
+        generator = HTMLGenerator()
+        for _ in range(3):
+            assert generator.classify(text, snapshot=snapshot) == fixed
+        reordered = rule_optimizer.get_plan(snapshot, 'special_format').patterns
+    finally:
+        rule_optimizer.set_enabled(False)
+        rule_optimizer.reset()
+
+    assert reordered != SPECIAL_PATTERNS
+    assert {block.level for block in fixed} == {'h1', 'h2', 'h3', 'special_format', 'normal'}